@@ -1,65 +1,58 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, status
 
-from ...db import get_db
 from ...services.room_service import RoomService
-from ...schemas.room import RoomCreate, RoomResponse, RoomUpdate
+from ...schemas.room import RoomCreate, RoomListResponse, RoomResponse, RoomUpdate
+from ...websockets import manager
 
 router = APIRouter()
 
+def _room_response(room) -> dict:
+    """DB 레코드를 응답 형식으로 변환 (참여자 수는 DB 컬럼 대신 현재 WebSocket 연결 수)"""
+    return {
+        "id": room["id"],
+        "name": room["name"],
+        "description": room["description"],
+        "createdAt": room["created_at"].isoformat(),
+        "participants": manager.listener_count(room["id"])
+    }
+
 @router.post("/", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
-def create_room(room_data: RoomCreate, db: Session = Depends(get_db)):
+async def create_room(room_data: RoomCreate):
     """새로운 방을 생성합니다."""
-    db_room = RoomService.create_room(db, room_data)
+    db_room = await RoomService.create_room(room_data)
+    return _room_response(db_room)
+
+@router.get("/", response_model=RoomListResponse)
+async def get_rooms(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=100, description="방 이름 접두사 검색"),
+    active: bool = Query(False, description="청취자가 있는 방만 조회")
+):
+    """방 목록을 최신순으로 조회합니다. 다음 페이지는 nextCursor를 cursor로 넘겨서 조회합니다."""
+    room_ids = None
+    if active:
+        room_ids = [room_id for room_id, count in manager.listener_counts().items() if count > 0]
+    rooms, next_cursor = await RoomService.list_rooms(limit, cursor, q, room_ids)
     return {
-        "id": db_room.id,
-        "name": db_room.name,
-        "description": db_room.description,
-        "createdAt": db_room.created_at.isoformat(),
-        "participants": db_room.participants
+        "rooms": [_room_response(room) for room in rooms],
+        "nextCursor": next_cursor
     }
 
-@router.get("/", response_model=List[RoomResponse])
-def get_rooms(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """모든 방 목록을 조회합니다."""
-    rooms = RoomService.get_all_rooms(db, skip, limit)
-    return [
-        {
-            "id": room.id,
-            "name": room.name,
-            "description": room.description,
-            "createdAt": room.created_at.isoformat(),
-            "participants": room.participants
-        } 
-        for room in rooms
-    ]
-
 @router.get("/{room_id}", response_model=RoomResponse)
-def get_room(room_id: str, db: Session = Depends(get_db)):
+async def get_room(room_id: str):
     """특정 ID의 방을 조회합니다."""
-    room = RoomService.get_room_by_id(db, room_id)
-    return {
-        "id": room.id,
-        "name": room.name,
-        "description": room.description,
-        "createdAt": room.created_at.isoformat(),
-        "participants": room.participants
-    }
+    room = await RoomService.get_room_by_id(room_id)
+    return _room_response(room)
 
 @router.put("/{room_id}", response_model=RoomResponse)
-def update_room(room_id: str, room_data: RoomUpdate, db: Session = Depends(get_db)):
+async def update_room(room_id: str, room_data: RoomUpdate):
     """특정 ID의 방 정보를 업데이트합니다."""
-    room = RoomService.update_room(db, room_id, room_data)
-    return {
-        "id": room.id,
-        "name": room.name,
-        "description": room.description,
-        "createdAt": room.created_at.isoformat(),
-        "participants": room.participants
-    }
+    room = await RoomService.update_room(room_id, room_data)
+    return _room_response(room)
 
 @router.delete("/{room_id}")
-def delete_room(room_id: str, db: Session = Depends(get_db)):
+async def delete_room(room_id: str):
     """특정 ID의 방을 삭제합니다."""
-    return RoomService.delete_room(db, room_id) 
\ No newline at end of file
+    return await RoomService.delete_room(room_id)
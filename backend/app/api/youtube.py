@@ -4,18 +4,25 @@ from typing import List, Dict, Any
 from . import router
 from ..services.youtube import youtube_service
 
+# /videos 한 번에 조회할 수 있는 최대 ID 수
+MAX_BATCH_VIDEO_IDS = 200
+
 @router.get("/search", response_model=List[Dict[str, Any]])
-async def search_videos(q: str = Query(..., description="검색어")):
+async def search_videos(
+    q: str = Query(..., description="검색어"),
+    details: bool = Query(False, description="재생 시간 등 상세 정보 포함 여부")
+):
     """
     YouTube 동영상 검색 API
     
     Args:
         q: 검색어
+        details: True면 재생 시간(duration)을 포함
         
     Returns:
         List[Dict]: 검색 결과 목록
     """
-    videos = await youtube_service.search_videos(q)
+    videos = await youtube_service.search_videos(q, with_details=details)
     return videos
 
 @router.get("/video/{video_id}", response_model=Dict[str, Any])
@@ -32,4 +39,30 @@ async def get_video_details(video_id: str):
     video = await youtube_service.get_video_details(video_id)
     if not video:
         raise HTTPException(status_code=404, detail="동영상을 찾을 수 없습니다")
-    return video 
\ No newline at end of file
+    return video
+
+@router.get("/videos", response_model=List[Dict[str, Any]])
+async def get_videos_details(ids: str = Query(..., description="쉼표로 구분한 YouTube 동영상 ID 목록")):
+    """
+    여러 YouTube 동영상 상세 정보 일괄 조회 API
+    
+    Args:
+        ids: 쉼표로 구분한 YouTube 동영상 ID 목록
+        
+    Returns:
+        List[Dict]: 요청한 순서대로 정렬된 동영상 상세 정보 (찾지 못한 ID는 제외)
+    """
+    video_ids = [video_id.strip() for video_id in ids.split(",") if video_id.strip()]
+    if len(video_ids) > MAX_BATCH_VIDEO_IDS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_VIDEO_IDS}개까지 조회할 수 있습니다")
+    return await youtube_service.get_videos_details(video_ids)
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """
+    YouTube 결과 캐시 통계 조회 API
+    
+    Returns:
+        Dict: 검색/동영상 캐시의 적중, 실패, 병합, 제거 횟수
+    """
+    return youtube_service.get_cache_stats()
\ No newline at end of file
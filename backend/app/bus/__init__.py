@@ -0,0 +1,16 @@
+from backend.config import settings
+from .base import RoomBus
+from .memory import InMemoryRoomBus
+from .local_broker import LocalBrokerRoomBus, RoomBusBroker
+
+__all__ = ["RoomBus", "InMemoryRoomBus", "LocalBrokerRoomBus", "RoomBusBroker", "create_room_bus"]
+
+
+def create_room_bus() -> RoomBus:
+    """설정(ROOM_BUS_BACKEND)에 맞는 룸 버스 생성"""
+    backend = settings.ROOM_BUS_BACKEND.lower()
+    if backend == "memory":
+        return InMemoryRoomBus()
+    if backend == "local":
+        return LocalBrokerRoomBus(settings.ROOM_BUS_SOCKET)
+    raise ValueError(f"알 수 없는 룸 버스 백엔드: {settings.ROOM_BUS_BACKEND}")
@@ -0,0 +1,100 @@
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# on_frame(room_id, payload, coalesce_key, connection_id): 이 워커의 소켓들에 프레임 전달
+FrameHandler = Callable[[str, str, Optional[str], Optional[str]], Awaitable[None]]
+# on_command(room_id, command): 방 소유 워커에서 명령 실행
+CommandHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+# on_presence(room_id, total): 모든 워커를 합친 방 청취자 수 변경
+PresenceHandler = Callable[[str, int], Awaitable[None]]
+# on_disown(room_id): 이 워커가 더 이상 방의 소유자가 아님
+DisownHandler = Callable[[str], Awaitable[None]]
+# on_handoff(room_id): 방을 다른 워커에 넘기기 위해 마스터 클라이언트를 멈추고 재생 상태 반환 (없으면 None)
+HandoffHandler = Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+# on_adopt(room_id, state): 다른 워커가 넘긴 재생 상태로 방의 마스터 클라이언트 시작
+AdoptHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class RoomBus:
+    """
+    워커 프로세스 간 방 상태 메시지 버스 인터페이스
+
+    방마다 하나의 소유 워커가 MasterClient를 실행합니다.
+    명령은 소유 워커로 전달되고, 소유 워커의 동기화 프레임은 모든 워커의 소켓으로 전달됩니다.
+    워커가 늘거나 줄어 소유자가 바뀌면 이전 소유자가 on_handoff로 넘긴 상태를 새 소유자가 on_adopt로 이어받습니다.
+    """
+
+    def __init__(self):
+        self.worker_id = f"worker_{os.getpid()}_{uuid.uuid4().hex[:6]}"
+
+        self._frame_handler: Optional[FrameHandler] = None
+        self._command_handler: Optional[CommandHandler] = None
+        self._presence_handler: Optional[PresenceHandler] = None
+        self._disown_handler: Optional[DisownHandler] = None
+        self._handoff_handler: Optional[HandoffHandler] = None
+        self._adopt_handler: Optional[AdoptHandler] = None
+
+    def set_handlers(
+        self,
+        on_frame: FrameHandler,
+        on_command: CommandHandler,
+        on_presence: Optional[PresenceHandler] = None,
+        on_disown: Optional[DisownHandler] = None,
+        on_handoff: Optional[HandoffHandler] = None,
+        on_adopt: Optional[AdoptHandler] = None
+    ):
+        """버스에서 받은 메시지를 처리할 핸들러 등록"""
+        self._frame_handler = on_frame
+        self._command_handler = on_command
+        self._presence_handler = on_presence
+        self._disown_handler = on_disown
+        self._handoff_handler = on_handoff
+        self._adopt_handler = on_adopt
+
+    def target(self, connection_id: str) -> Dict[str, str]:
+        """이 워커의 특정 연결을 가리키는 전송 대상"""
+        return {"worker": self.worker_id, "connection": connection_id}
+
+    async def start(self):
+        """버스 시작"""
+
+    async def stop(self):
+        """버스 종료"""
+
+    async def leave(self):
+        """종료 전에 소유한 방을 다른 워커에 인계 (다른 워커가 없으면 아무것도 하지 않음)"""
+
+    def is_owner(self, room_id: str) -> bool:
+        """이 워커가 방의 소유자인지 여부"""
+        raise NotImplementedError
+
+    async def publish(
+        self,
+        room_id: str,
+        payload: str,
+        coalesce_key: Optional[str] = None,
+        target: Optional[Dict[str, str]] = None
+    ):
+        """방의 모든 워커(target이 있으면 해당 연결 하나)에 프레임 전달"""
+        raise NotImplementedError
+
+    async def send_command(self, room_id: str, command: Dict[str, Any]):
+        """방 소유 워커로 명령 전달 (소유자가 없으면 이 워커가 소유자가 됨)"""
+        raise NotImplementedError
+
+    async def release(self, room_id: str):
+        """방 소유권 반납"""
+        raise NotImplementedError
+
+    async def update_presence(self, room_id: str, local_count: int):
+        """이 워커의 방 청취자 수 보고"""
+        raise NotImplementedError
+
+    def listener_count(self, room_id: str) -> int:
+        """모든 워커를 합친 방 청취자 수"""
+        raise NotImplementedError
+
+    def listener_counts(self) -> Dict[str, int]:
+        """청취자가 있는 모든 방의 {방 ID: 모든 워커를 합친 청취자 수}"""
+        raise NotImplementedError
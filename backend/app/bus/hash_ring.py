@@ -0,0 +1,53 @@
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set
+
+from backend.config import settings
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    방 ID -> 소유 워커 일관 해싱
+
+    워커마다 vnodes개의 가상 노드를 링에 올리고, 방 ID의 해시 다음에 오는 노드의 워커가 소유자입니다.
+    워커가 하나 늘거나 줄어도 대략 1/N의 방만 소유자가 바뀝니다.
+    """
+
+    def __init__(self, workers: Iterable[str] = (), vnodes: int = settings.ROOM_RING_VNODES):
+        self.vnodes = vnodes
+        self.workers: Set[str] = set()
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for worker_id in workers:
+            self.add(worker_id)
+
+    def add(self, worker_id: str):
+        """워커 추가"""
+        self.workers.add(worker_id)
+        for i in range(self.vnodes):
+            point = _hash(f"{worker_id}#{i}")
+            if point in self._owners:
+                continue
+            self._owners[point] = worker_id
+            bisect.insort(self._points, point)
+
+    def remove(self, worker_id: str):
+        """워커 제거"""
+        self.workers.discard(worker_id)
+        points = [point for point, owner in self._owners.items() if owner == worker_id]
+        for point in points:
+            del self._owners[point]
+        self._points = [point for point in self._points if point in self._owners]
+
+    def owner(self, room_id: str) -> Optional[str]:
+        """방의 소유 워커 (워커가 없으면 None)"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(room_id))
+        if index == len(self._points):
+            index = 0
+        return self._owners[self._points[index]]
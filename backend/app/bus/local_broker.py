@@ -0,0 +1,525 @@
+import asyncio
+import fcntl
+import os
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from backend.config import settings
+from ..services import json_codec
+from .base import RoomBus
+from .hash_ring import HashRing
+
+# 한 줄(메시지)의 최대 크기 - 긴 플레이리스트 스냅샷도 담을 수 있도록 넉넉하게
+STREAM_LIMIT = 16 * 1024 * 1024
+# 워커 송신 버퍼가 이 크기를 넘으면 병합 가능한 프레임은 버림 (클라이언트가 리비전 공백으로 복구)
+MAX_WORKER_BUFFER = 4 * 1024 * 1024
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return (json_codec.dumps(message) + "\n").encode()
+
+
+class RoomBusBroker:
+    """
+    같은 머신의 워커 프로세스들을 잇는 로컬 브로커 (Unix 도메인 소켓)
+
+    방 소유권과 워커별 청취자 수를 관리하고, 명령은 소유 워커로, 프레임은 청취자가 있는 워커로 전달합니다.
+    방 소유자는 연결된 워커들의 일관 해싱 링으로 정하므로 같은 방은 항상 같은 워커에서 실행됩니다.
+    워커가 새로 연결되면 링에서 그 워커에 배정된 방을 이전 소유자로부터 넘겨받게 합니다 (재생 상태 인계).
+    인계 중인 방으로 온 명령은 모아 두었다가 새 소유자가 상태를 받은 뒤 순서대로 전달합니다.
+    """
+
+    def __init__(self, socket_path: str = settings.ROOM_BUS_SOCKET):
+        self.socket_path = socket_path
+        self.workers: Dict[str, asyncio.StreamWriter] = {}
+        # room_id -> 소유 워커
+        self.owners: Dict[str, str] = {}
+        # 연결된 워커들의 일관 해싱 링
+        self.ring = HashRing()
+        # 인계 중인 방 -> 이전 소유자가 상태를 넘길 때까지 모아 둔 명령
+        self.handoffs: Dict[str, List[Dict[str, Any]]] = {}
+        # 종료 전에 방을 인계하는 중인 워커 (링에서는 이미 빠짐)
+        self.leaving: Set[str] = set()
+        # room_id -> {worker_id: 청취자 수}
+        self.presence: Dict[str, Dict[str, int]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._lock_file = None
+
+    async def start(self):
+        """
+        브로커 소켓 열기
+
+        잠금 파일로 머신당 브로커 하나만 실행되도록 보장합니다.
+        이미 다른 프로세스가 브로커를 실행 중이면 BlockingIOError가 발생합니다.
+        """
+        lock_file = open(self.socket_path + ".lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise BlockingIOError(f"이미 실행 중인 룸 버스 브로커가 있습니다: {self.socket_path}")
+        self._lock_file = lock_file
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_worker, self.socket_path, limit=STREAM_LIMIT)
+        print(f"룸 버스 브로커 시작: {self.socket_path}")
+
+    async def stop(self):
+        """브로커 종료"""
+        if self._server:
+            self._server.close()
+            self._server = None
+        for writer in self.workers.values():
+            writer.close()
+        self.workers.clear()
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _send(self, worker_id: str, message: Dict[str, Any], droppable: bool = False):
+        writer = self.workers.get(worker_id)
+        if writer is None or writer.is_closing():
+            return
+        if droppable and writer.transport.get_write_buffer_size() > MAX_WORKER_BUFFER:
+            return
+        writer.write(_encode(message))
+
+    def _room_total(self, room_id: str) -> int:
+        return sum(self.presence.get(room_id, {}).values())
+
+    def _broadcast_presence(self, room_id: str):
+        message = {"op": "presence", "room": room_id, "total": self._room_total(room_id)}
+        for worker_id in self.workers:
+            self._send(worker_id, message)
+
+    def _assign_owner(self, room_id: str) -> str:
+        """방 소유자가 없으면 링에서 정한 워커를 소유자로 지정"""
+        owner = self.owners.get(room_id)
+        if owner is None or owner not in self.workers:
+            owner = self.ring.owner(room_id)
+            self.owners[room_id] = owner
+            self._send(owner, {"op": "own", "room": room_id})
+        return owner
+
+    def _rebalance(self):
+        """링에서 소유자가 바뀐 방을 이전 소유자에게 인계 요청"""
+        moved = 0
+        for room_id, owner in list(self.owners.items()):
+            if self._start_handoff(room_id, owner):
+                moved += 1
+        if moved:
+            print(f"방 소유자 재배치: {moved}/{len(self.owners)}개 방 인계 (워커 {len(self.workers)}개)")
+
+    def _start_handoff(self, room_id: str, owner: str) -> bool:
+        """소유자가 링의 소유자와 다르면 인계 요청 (요청했으면 True)"""
+        if room_id in self.handoffs or owner not in self.workers or self.ring.owner(room_id) == owner:
+            return False
+        self.handoffs[room_id] = []
+        self._send(owner, {"op": "handoff", "room": room_id})
+        return True
+
+    def _check_left(self, worker_id: str):
+        """종료 중인 워커의 방이 모두 인계되었으면 알림"""
+        if worker_id in self.leaving and worker_id not in self.owners.values():
+            self.leaving.discard(worker_id)
+            self._send(worker_id, {"op": "left"})
+
+    def _complete_handoff(self, room_id: str, state: Optional[Dict[str, Any]]):
+        """
+        이전 소유자가 넘긴 상태를 링의 현재 소유자에게 전달하고 모아 둔 명령을 이어서 전달
+
+        state가 None이면 (이전 소유자의 메모리에 없던 방) 새 소유자가 저장된 상태에서 복원합니다.
+        """
+        commands = self.handoffs.pop(room_id, [])
+        owner = self.ring.owner(room_id)
+        if owner is None:
+            self.owners.pop(room_id, None)
+            return
+        self.owners[room_id] = owner
+        self._send(owner, {"op": "own", "room": room_id, "state": state})
+        for command in commands:
+            self._send(owner, command)
+
+    async def _handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        worker_id = None
+        try:
+            hello = json_codec.loads(await reader.readline())
+            worker_id = hello["worker"]
+            self.workers[worker_id] = writer
+            self.ring.add(worker_id)
+            # 새로 연결된 (재시작한) 워커에 현재 방별 청취자 수를 알려줌
+            for room_id in self.presence:
+                self._send(worker_id, {"op": "presence", "room": room_id, "total": self._room_total(room_id)})
+            # 링에서 새 워커에 배정된 방을 넘겨받음
+            self._rebalance()
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._dispatch(worker_id, json_codec.loads(line))
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            print(f"룸 버스 브로커 오류 ({worker_id}): {e}")
+        finally:
+            if worker_id is not None:
+                self._remove_worker(worker_id)
+            writer.close()
+
+    def _remove_worker(self, worker_id: str):
+        """
+        워커 연결이 끊기면 소유권과 청취자 수 정리
+
+        끊긴 워커의 방은 다음 명령 때 링의 새 소유자가 저장된 상태에서 복원합니다.
+        """
+        self.workers.pop(worker_id, None)
+        self.ring.remove(worker_id)
+        self.leaving.discard(worker_id)
+        for room_id in [room_id for room_id, owner in self.owners.items() if owner == worker_id]:
+            if room_id in self.handoffs:
+                # 상태를 넘기기 전에 끊김 - 새 소유자가 저장된 상태에서 복원
+                self._complete_handoff(room_id, None)
+            else:
+                del self.owners[room_id]
+
+        for room_id, counts in list(self.presence.items()):
+            if counts.pop(worker_id, None) is not None:
+                if not counts:
+                    del self.presence[room_id]
+                self._broadcast_presence(room_id)
+
+    def _dispatch(self, worker_id: str, message: Dict[str, Any]):
+        op = message["op"]
+        room_id = message.get("room")
+
+        if op == "command":
+            if room_id in self.handoffs:
+                self.handoffs[room_id].append(message)
+                return
+            owner = self._assign_owner(room_id)
+            self._send(owner, message)
+
+        elif op == "handoff_state":
+            if room_id in self.handoffs:
+                self._complete_handoff(room_id, message.get("state"))
+            self._check_left(worker_id)
+
+        elif op == "leave":
+            # 종료하는 워커 - 링에서 빼고 소유한 방을 남은 워커들에 인계
+            self.ring.remove(worker_id)
+            if self.ring.workers:
+                self.leaving.add(worker_id)
+                self._rebalance()
+                self._check_left(worker_id)
+            else:
+                self._send(worker_id, {"op": "left"})
+
+        elif op == "frame":
+            target = message.get("target")
+            if target:
+                self._send(target["worker"], message)
+                return
+            # 청취자가 있는 다른 워커에만 전달
+            droppable = message.get("key") is not None
+            for other_id, count in self.presence.get(room_id, {}).items():
+                if other_id != worker_id and count > 0:
+                    self._send(other_id, message, droppable)
+
+        elif op == "presence":
+            counts = self.presence.setdefault(room_id, {})
+            if message["count"]:
+                counts[worker_id] = message["count"]
+            else:
+                counts.pop(worker_id, None)
+                if not counts:
+                    del self.presence[room_id]
+            self._broadcast_presence(room_id)
+
+        elif op == "claim":
+            # 브로커 재시작 후 워커가 실행 중인 방의 소유권을 다시 등록
+            owner = self.owners.get(room_id)
+            if owner is None or owner not in self.workers:
+                self.owners[room_id] = worker_id
+                # 링의 소유자가 아니면 바로 인계 (아직 다시 연결되지 않은 워커의 방은 그 워커가 연결될 때 옮겨짐)
+                self._start_handoff(room_id, worker_id)
+            elif owner != worker_id:
+                self._send(worker_id, {"op": "disown", "room": room_id})
+
+        elif op == "release":
+            if self.owners.get(room_id) == worker_id and room_id not in self.handoffs:
+                del self.owners[room_id]
+
+
+class LocalBrokerRoomBus(RoomBus):
+    """
+    로컬 브로커를 통한 멀티 워커 버스
+
+    외부 서비스 없이 같은 머신의 워커들이 Unix 도메인 소켓으로 연결됩니다.
+    브로커가 없으면 잠금 파일을 먼저 잡은 워커가 브로커를 내장 실행합니다.
+
+    프레임 전달과 청취자 수 갱신만 수신 루프에서 바로 처리하고, 명령과 방 인계/인수/반납 처리는
+    방마다 순서를 지키는 작업 큐에서 실행합니다. 한 방의 처리가 DB 조회 등으로 오래 걸려도
+    다른 방의 프레임과 명령은 계속 읽습니다.
+    """
+
+    RECONNECT_DELAY = 0.5
+    # 종료 전 방 인계를 기다리는 최대 시간 (초)
+    LEAVE_TIMEOUT = 5.0
+
+    def __init__(self, socket_path: str = settings.ROOM_BUS_SOCKET):
+        super().__init__()
+        self.socket_path = socket_path
+        self.owned_rooms: Set[str] = set()
+        self._local_presence: Dict[str, int] = {}
+        self._totals: Dict[str, int] = {}
+
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+        self._left = asyncio.Event()
+        self._broker: Optional[RoomBusBroker] = None
+
+        # 방별 대기 중인 처리 작업과 그 큐를 비우는 태스크
+        self._room_jobs: Dict[str, Deque[Callable[[], Awaitable[None]]]] = {}
+        self._room_tasks: Dict[str, asyncio.Task] = {}
+
+    async def start(self):
+        self._task = asyncio.create_task(self._connection_loop())
+        try:
+            await asyncio.wait_for(self._connected.wait(), 5.0)
+        except asyncio.TimeoutError:
+            print("룸 버스 브로커에 연결하지 못했습니다 - 백그라운드에서 재시도합니다")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._room_tasks.values()):
+            task.cancel()
+        self._room_jobs.clear()
+        self._room_tasks.clear()
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._broker:
+            await self._broker.stop()
+            self._broker = None
+
+    async def leave(self):
+        if not self.owned_rooms or not self._write({"op": "leave"}):
+            return
+        try:
+            await asyncio.wait_for(self._left.wait(), self.LEAVE_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"방 인계를 마치지 못했습니다 - 남은 방 {len(self.owned_rooms)}개는 저장된 상태에서 복원됩니다")
+
+    async def _try_start_broker(self):
+        """실행 중인 브로커가 없으면 이 워커에서 브로커 실행"""
+        if self._broker:
+            return
+        broker = RoomBusBroker(self.socket_path)
+        try:
+            await broker.start()
+        except BlockingIOError:
+            # 다른 워커가 브로커를 시작하는 중 - 잠시 후 다시 연결
+            await asyncio.sleep(self.RECONNECT_DELAY)
+            return
+        self._broker = broker
+
+    async def _connection_loop(self):
+        """브로커 연결 유지 - 끊기면 재연결 (필요하면 브로커를 직접 실행)"""
+        while True:
+            try:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=STREAM_LIMIT)
+                except (FileNotFoundError, ConnectionRefusedError):
+                    await self._try_start_broker()
+                    reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=STREAM_LIMIT)
+
+                self._writer = writer
+                self._write({"op": "hello", "worker": self.worker_id})
+                # 브로커가 재시작된 경우를 위해 소유권과 청취자 수를 다시 등록
+                for room_id in self.owned_rooms:
+                    self._write({"op": "claim", "room": room_id})
+                for room_id, count in self._local_presence.items():
+                    self._write({"op": "presence", "room": room_id, "count": count})
+                self._connected.set()
+
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    await self._dispatch(json_codec.loads(line))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"룸 버스 연결 오류: {e}")
+
+            self._connected.clear()
+            self._writer = None
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    def _write(self, message: Dict[str, Any]) -> bool:
+        if self._writer is None or self._writer.is_closing():
+            return False
+        self._writer.write(_encode(message))
+        return True
+
+    def _run_in_room(self, room_id: str, job: Callable[[], Awaitable[None]]):
+        """방의 작업 큐에 처리 추가 (같은 방은 도착 순서대로, 다른 방과는 독립적으로 실행)"""
+        jobs = self._room_jobs.get(room_id)
+        if jobs is None:
+            jobs = self._room_jobs[room_id] = deque()
+            self._room_tasks[room_id] = asyncio.create_task(self._drain_room(room_id, jobs))
+        jobs.append(job)
+
+    async def _drain_room(self, room_id: str, jobs: Deque[Callable[[], Awaitable[None]]]):
+        try:
+            while jobs:
+                job = jobs.popleft()
+                try:
+                    await job()
+                except Exception as e:
+                    print(f"룸 버스 처리 오류 (방: {room_id}): {e}")
+        finally:
+            if self._room_jobs.get(room_id) is jobs:
+                del self._room_jobs[room_id]
+                del self._room_tasks[room_id]
+
+    async def _hand_off(self, room_id: str):
+        """방 인계 - 마스터 클라이언트를 멈추고 재생 상태를 브로커로 보냄 (실패해도 브로커가 기다리지 않도록 응답)"""
+        state = None
+        try:
+            if self._handoff_handler:
+                state = await self._handoff_handler(room_id)
+        finally:
+            self._write({"op": "handoff_state", "room": room_id, "state": state})
+
+    async def _dispatch(self, message: Dict[str, Any]):
+        """
+        브로커 메시지 처리
+
+        소유권(owned_rooms)은 도착한 순서대로 바로 반영하고, 처리 함수 호출은 방별 작업 큐로 넘깁니다.
+        """
+        op = message["op"]
+        room_id = message.get("room")
+
+        if op == "frame":
+            if self._frame_handler:
+                target = message.get("target")
+                connection_id = target["connection"] if target else None
+                await self._frame_handler(room_id, message["payload"], message.get("key"), connection_id)
+
+        elif op == "command":
+            if room_id in self.owned_rooms:
+                if self._command_handler:
+                    command = message["command"]
+                    self._run_in_room(room_id, lambda: self._command_handler(room_id, command))
+            else:
+                # 소유권을 반납한 뒤 도착한 명령은 브로커로 다시 보내 새 소유자에게 전달
+                self._write(message)
+
+        elif op == "own":
+            self.owned_rooms.add(room_id)
+            # 다른 워커에서 인계된 방이면 넘겨받은 재생 상태로 시작 (뒤따르는 명령보다 먼저)
+            state = message.get("state")
+            if state is not None and self._adopt_handler:
+                self._run_in_room(room_id, lambda: self._adopt_handler(room_id, state))
+
+        elif op == "handoff":
+            # 링에서 다른 워커로 배정된 방 - 소유권을 내려놓은 뒤 도착하는 명령은 브로커로 되돌아감
+            # (이미 큐에 들어간 명령은 인계 전에 실행됨)
+            self.owned_rooms.discard(room_id)
+            self._run_in_room(room_id, lambda: self._hand_off(room_id))
+
+        elif op == "left":
+            self._left.set()
+
+        elif op == "disown":
+            self.owned_rooms.discard(room_id)
+            if self._disown_handler:
+                self._run_in_room(room_id, lambda: self._disown_handler(room_id))
+
+        elif op == "presence":
+            if message["total"]:
+                self._totals[room_id] = message["total"]
+            else:
+                self._totals.pop(room_id, None)
+            if self._presence_handler:
+                await self._presence_handler(room_id, message["total"])
+
+    def is_owner(self, room_id: str) -> bool:
+        # 방 작업 큐에 처리가 남아 있으면 (인수 중 등) 아니라고 답해서 명령이 send_command로 큐 뒤에 붙게 함
+        return room_id in self.owned_rooms and room_id not in self._room_jobs
+
+    async def publish(
+        self,
+        room_id: str,
+        payload: str,
+        coalesce_key: Optional[str] = None,
+        target: Optional[Dict[str, str]] = None
+    ):
+        # 이 워커의 소켓에는 브로커를 거치지 않고 바로 전달
+        if target is None or target["worker"] == self.worker_id:
+            if self._frame_handler:
+                connection_id = target["connection"] if target else None
+                await self._frame_handler(room_id, payload, coalesce_key, connection_id)
+            if target is not None:
+                return
+
+        self._write({"op": "frame", "room": room_id, "payload": payload, "key": coalesce_key, "target": target})
+
+    async def send_command(self, room_id: str, command: Dict[str, Any]):
+        # 이 워커가 소유자면 바로 실행 (방 작업 큐에 처리가 남아 있으면 그 뒤에 실행)
+        if room_id in self.owned_rooms:
+            if self._command_handler:
+                if room_id in self._room_jobs:
+                    self._run_in_room(room_id, lambda: self._command_handler(room_id, command))
+                else:
+                    await self._command_handler(room_id, command)
+            return
+
+        if not self._write({"op": "command", "room": room_id, "command": command}):
+            print(f"룸 버스 연결 없음 - 명령 버림 (방: {room_id}, 타입: {command.get('type')})")
+
+    async def release(self, room_id: str):
+        if room_id in self.owned_rooms:
+            self.owned_rooms.discard(room_id)
+            self._write({"op": "release", "room": room_id})
+
+    async def update_presence(self, room_id: str, local_count: int):
+        if local_count:
+            self._local_presence[room_id] = local_count
+        else:
+            self._local_presence.pop(room_id, None)
+        self._write({"op": "presence", "room": room_id, "count": local_count})
+
+    def listener_count(self, room_id: str) -> int:
+        # 브로커 집계가 아직 도착하지 않았을 수 있으므로 로컬 수보다 작게 보고하지 않음
+        return max(self._totals.get(room_id, 0), self._local_presence.get(room_id, 0))
+
+    def listener_counts(self) -> Dict[str, int]:
+        counts = dict(self._totals)
+        for room_id, count in self._local_presence.items():
+            counts[room_id] = max(counts.get(room_id, 0), count)
+        return counts
+
+
+async def run_broker():
+    """브로커를 별도 프로세스로 실행: python -m backend.app.bus.local_broker"""
+    broker = RoomBusBroker()
+    await broker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await broker.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_broker())
@@ -0,0 +1,47 @@
+from typing import Any, Dict, Optional
+
+from .base import RoomBus
+
+
+class InMemoryRoomBus(RoomBus):
+    """단일 프로세스용 버스 - 이 워커가 모든 방의 소유자 (테스트 및 워커 1개 실행용)"""
+
+    def __init__(self):
+        super().__init__()
+        self._listeners: Dict[str, int] = {}
+
+    def is_owner(self, room_id: str) -> bool:
+        return True
+
+    async def publish(
+        self,
+        room_id: str,
+        payload: str,
+        coalesce_key: Optional[str] = None,
+        target: Optional[Dict[str, str]] = None
+    ):
+        if self._frame_handler:
+            connection_id = target["connection"] if target else None
+            await self._frame_handler(room_id, payload, coalesce_key, connection_id)
+
+    async def send_command(self, room_id: str, command: Dict[str, Any]):
+        if self._command_handler:
+            await self._command_handler(room_id, command)
+
+    async def release(self, room_id: str):
+        pass
+
+    async def update_presence(self, room_id: str, local_count: int):
+        if local_count:
+            self._listeners[room_id] = local_count
+        else:
+            self._listeners.pop(room_id, None)
+
+        if self._presence_handler:
+            await self._presence_handler(room_id, local_count)
+
+    def listener_count(self, room_id: str) -> int:
+        return self._listeners.get(room_id, 0)
+
+    def listener_counts(self) -> Dict[str, int]:
+        return dict(self._listeners)
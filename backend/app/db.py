@@ -1,7 +1,6 @@
 import os
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from databases import Database
 from backend.config import settings
 
@@ -9,25 +8,23 @@ from backend.config import settings
 DATABASE_URL = settings.database_url
 ASYNC_DATABASE_URL = settings.async_database_url
 
-# SQLAlchemy 엔진 생성 (PostgreSQL용)
+# SQLAlchemy 엔진 생성 (PostgreSQL용) - 시작 시 테이블 생성에만 사용
 engine = create_engine(DATABASE_URL)
 
-# 세션 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # Base 클래스 생성
 Base = declarative_base()
 
 # 메타데이터 객체
 metadata = MetaData()
 
-# Database 인스턴스 (비동기용)
-database = Database(ASYNC_DATABASE_URL)
-
-# DB 세션 의존성
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+# Database 인스턴스 (비동기용, asyncpg 커넥션 풀)
+# 연결을 꺼낼 때마다 ping하지는 않음 (asyncpg의 setup은 매번 실행되어 쿼리마다 왕복이 한 번 늘어남)
+# 오래 놀던 연결은 DB_POOL_RECYCLE로 닫고 새로 연결
+database = Database(
+    ASYNC_DATABASE_URL,
+    min_size=settings.DB_POOL_SIZE,
+    max_size=settings.DB_POOL_SIZE + settings.DB_POOL_MAX_OVERFLOW,
+    max_inactive_connection_lifetime=settings.DB_POOL_RECYCLE,
+    statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+    command_timeout=settings.DB_COMMAND_TIMEOUT,
+)
@@ -1,10 +1,26 @@
 import asyncio
+from sqlalchemy import text
 from .db import engine, Base, database
+# 테이블을 만들 모델 (import하면서 Base.metadata에도 등록됨)
+from .models.room import Room
+from .models.room_state import RoomState
+
+MODELS = (Room, RoomState)
 
 async def init_db():
     """데이터베이스 초기화 및 연결"""
     # 테이블 생성
-    Base.metadata.create_all(bind=engine)
+    tables = [model.__table__ for model in MODELS]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    # 이미 있던 테이블에는 create_all이 인덱스를 만들지 않으므로 따로 확인해서 생성
+    for table in tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    # 마찬가지로 이미 있던 테이블에 나중에 추가된 컬럼
+    with engine.begin() as connection:
+        connection.execute(text(
+            "ALTER TABLE room_states ADD COLUMN IF NOT EXISTS track_revision integer NOT NULL DEFAULT 0"
+        ))
     
     # 비동기 데이터베이스 연결
     if not database.is_connected:
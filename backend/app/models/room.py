@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, Text
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
 from sqlalchemy.sql import func
 
 from ..db import Base
@@ -14,6 +14,17 @@ class Room(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     participants = Column(Integer, default=0)
 
+    __table_args__ = (
+        # 최신순 키셋 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_rooms_created_at_id", created_at.desc(), id.desc()),
+        # 대소문자 무시 이름 접두사 검색 (lower(name) LIKE 'abc%')
+        Index(
+            "ix_rooms_name_lower_prefix",
+            func.lower(name).label("name_lower"),
+            postgresql_ops={"name_lower": "text_pattern_ops"}
+        ),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
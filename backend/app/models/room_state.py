@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+
+from ..db import Base
+
+class RoomState(Base):
+    """방의 재생 상태 스냅샷 (재시작/방 정리 후 복원용)"""
+    __tablename__ = "room_states"
+
+    # 기본 방("default")처럼 rooms 테이블에 없는 방도 저장하므로 외래 키를 두지 않음
+    room_id = Column(String, primary_key=True)
+    playlist = Column(JSONB, nullable=False, default=list)
+    current_track = Column(Integer, nullable=True)
+    position = Column(Float, nullable=False, default=0.0)
+    is_playing = Column(Boolean, nullable=False, default=False)
+    last_update_time = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False, default=1.0)
+    revision = Column(Integer, nullable=False, default=0)
+    # 현재 트랙 재생이 시작된 리비전 (복원 후에도 중복 next_track을 무시하도록)
+    track_revision = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
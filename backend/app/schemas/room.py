@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 class RoomBase(BaseModel):
@@ -25,4 +25,8 @@ class RoomInDB(RoomBase):
 class RoomResponse(RoomBase):
     id: str
     createdAt: str
-    participants: int 
\ No newline at end of file
+    participants: int
+
+class RoomListResponse(BaseModel):
+    rooms: List[RoomResponse]
+    nextCursor: Optional[str] = None
@@ -0,0 +1,83 @@
+from typing import Annotated, Any, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+class ClientMessage(BaseModel):
+    # 알 수 없는 필드는 버림 (저장하거나 전달하지 않음)
+    model_config = ConfigDict(extra="ignore")
+
+class TrackPayload(ClientMessage):
+    id: str = Field(..., min_length=1, max_length=64)
+    title: str = Field("", max_length=300)
+    thumbnail: str = Field("", max_length=2048)
+    channel: str = Field("", max_length=200)
+    duration: Optional[str] = Field(None, max_length=32)
+    publishedAt: str = Field("", max_length=64)
+
+class PlayMessage(ClientMessage):
+    type: Literal["play"]
+
+class PauseMessage(ClientMessage):
+    type: Literal["pause"]
+
+class SeekMessage(ClientMessage):
+    type: Literal["seek"]
+    position: Optional[float] = Field(None, ge=0, le=86400)
+    current_track: Optional[int] = Field(None, ge=0)
+
+class AddTrackMessage(ClientMessage):
+    type: Literal["add_track"]
+    track: TrackPayload
+
+class InsertNextMessage(ClientMessage):
+    type: Literal["insert_next"]
+    track: TrackPayload
+
+class RemoveTrackMessage(ClientMessage):
+    type: Literal["remove_track"]
+    track_id: str = Field(..., min_length=1, max_length=64)
+
+class MoveTrackMessage(ClientMessage):
+    type: Literal["move_track"]
+    track_id: str = Field(..., min_length=1, max_length=64)
+    to: int = Field(..., ge=0)
+
+class NextTrackMessage(ClientMessage):
+    type: Literal["next_track"]
+    revision: Optional[int] = None
+
+class PrevTrackMessage(ClientMessage):
+    type: Literal["prev_track"]
+    revision: Optional[int] = None
+
+class SyncRequestMessage(ClientMessage):
+    type: Literal["sync_request"]
+    revision: Optional[int] = None
+
+class TimeSyncMessage(ClientMessage):
+    type: Literal["time_sync"]
+    t0: float
+    drift: Optional[float] = None
+
+class PongMessage(ClientMessage):
+    type: Literal["pong"]
+
+# type 필드로 모델을 바로 고르는 판별 유니온 (모든 모델을 차례로 시도하지 않음)
+IncomingMessage = Annotated[
+    Union[
+        PlayMessage, PauseMessage, SeekMessage, AddTrackMessage, InsertNextMessage,
+        RemoveTrackMessage, MoveTrackMessage, NextTrackMessage, PrevTrackMessage,
+        SyncRequestMessage, TimeSyncMessage, PongMessage,
+    ],
+    Field(discriminator="type"),
+]
+
+# 시작 시 한 번 만들어 둔 검증기 - JSON 파싱과 검증을 pydantic-core에서 한 번에 처리
+incoming_message_adapter = TypeAdapter(IncomingMessage)
+
+def parse_client_message(data: Union[str, bytes]) -> ClientMessage:
+    """클라이언트 메시지 파싱 및 검증 (잘못된 메시지면 pydantic.ValidationError)"""
+    return incoming_message_adapter.validate_json(data)
+
+def parse_client_object(obj: Any) -> ClientMessage:
+    """이미 역직렬화된 메시지 검증 (msgpack 바이너리 프레임용)"""
+    return incoming_message_adapter.validate_python(obj)
@@ -0,0 +1,195 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List
+
+from cachetools import TTLCache
+
+
+class _CountingTTLCache(TTLCache):
+    """용량 초과로 밀려난 항목과 만료된 항목 수를 세는 TTLCache"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evictions = 0
+        self.expirations = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+
+class AsyncTTLCache:
+    """
+    TTL/LRU 기반 비동기 결과 캐시
+
+    같은 키에 대한 동시 요청은 하나의 로더 호출로 합쳐집니다 (single-flight).
+    로더는 별도 태스크에서 실행되므로 요청 하나가 취소되어도 같은 키를 기다리는 다른 요청에는 영향이 없습니다.
+    로더가 예외를 던지거나 None을 반환하면 캐시하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = _CountingTTLCache(maxsize=maxsize, ttl=ttl)
+        # 진행 중인 로드의 키별 결과 (키 -> Future, 로드는 별도 태스크에서 실행)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> Any:
+        """캐시된 값 반환 (없으면 None) - 통계에 반영"""
+        value = self._cache.get(key)
+        if value is not None:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """값을 캐시에 직접 저장"""
+        if value is not None:
+            self._cache[key] = value
+
+    def _start_load(
+        self,
+        keys: List[Hashable],
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+    ) -> Dict[Hashable, asyncio.Future]:
+        """
+        키들을 가져오는 로드 작업을 별도 태스크로 시작 (키 -> 결과 Future)
+
+        로더를 요청한 쪽의 태스크에서 실행하지 않으므로, 처음 요청한 쪽이 취소되어도
+        같은 키를 기다리는 다른 요청들은 계속 결과를 받습니다.
+        """
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in keys}
+        self._inflight.update(futures)
+
+        async def load():
+            try:
+                loaded = await loader(keys)
+            except asyncio.CancelledError:
+                # 이벤트 루프 종료 등으로 로드 자체가 취소됨
+                for future in futures.values():
+                    future.cancel()
+                raise
+            except Exception as e:
+                for future in futures.values():
+                    future.set_exception(e)
+                    # 기다리는 요청이 없어도 경고가 나지 않도록 예외를 조회해 둠
+                    future.exception()
+            else:
+                for key, future in futures.items():
+                    value = loaded.get(key)
+                    if value is not None:
+                        self._cache[key] = value
+                    future.set_result(value)
+            finally:
+                for key in keys:
+                    del self._inflight[key]
+
+        loop.create_task(load())
+        return futures
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        캐시된 값을 반환하거나, 없으면 로더를 호출해 채움
+
+        Args:
+            key: 캐시 키
+            loader: 값을 가져오는 코루틴 함수
+
+        Returns:
+            캐시된 값 또는 로더 결과
+        """
+        value = self._cache.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            # 같은 키를 이미 가져오는 중이면 그 결과를 함께 기다림
+            self.coalesced += 1
+        else:
+            self.misses += 1
+
+            async def load_one(keys):
+                return {key: await loader()}
+
+            future = self._start_load([key], load_one)[key]
+        # 이 요청이 취소되어도 로드와 다른 요청의 대기는 계속됨
+        return await asyncio.shield(future)
+
+    async def get_many_or_load(
+        self,
+        keys: Iterable[Hashable],
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+    ) -> Dict[Hashable, Any]:
+        """
+        여러 키를 한 번에 조회 - 캐시에 없고 아무도 가져오고 있지 않은 키만 모아서 로더 한 번으로 채움
+
+        Args:
+            keys: 캐시 키 목록
+            loader: 키 목록을 받아 {키: 값}을 반환하는 코루틴 함수 (없는 키는 생략)
+
+        Returns:
+            Dict: 찾은 키에 대한 {키: 값}
+
+        Raises:
+            이 호출이 시작한 로드가 실패하면 그 예외 (다른 요청이 시작한 로드의 실패는 그 키만 건너뜀)
+        """
+        results: Dict[Hashable, Any] = {}
+        waiting: Dict[Hashable, asyncio.Future] = {}
+        missing: List[Hashable] = []
+
+        for key in dict.fromkeys(keys):
+            value = self._cache.get(key)
+            if value is not None:
+                self.hits += 1
+                results[key] = value
+            elif key in self._inflight:
+                self.coalesced += 1
+                waiting[key] = self._inflight[key]
+            else:
+                self.misses += 1
+                missing.append(key)
+
+        loading = self._start_load(missing, loader) if missing else {}
+
+        for key, future in loading.items():
+            value = await asyncio.shield(future)
+            if value is not None:
+                results[key] = value
+
+        for key, future in waiting.items():
+            try:
+                value = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 이 요청이 취소된 경우만 전파 (다른 요청의 로드가 취소되었으면 그 키만 건너뜀)
+                if not future.cancelled():
+                    raise
+                continue
+            except Exception:
+                continue
+            if value is not None:
+                results[key] = value
+
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        return {
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "ttl": self._cache.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self._cache.evictions,
+            "expirations": self._cache.expirations,
+        }
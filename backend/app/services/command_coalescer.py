@@ -0,0 +1,135 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.config import settings
+
+# 명령 타입 -> 병합 슬롯 (같은 슬롯의 명령은 창 안에서 마지막 것만 적용)
+COALESCE_SLOTS = {
+    "seek": "seek",
+    "play": "playback",
+    "pause": "playback",
+    "next_track": "track",
+    "prev_track": "track",
+    "track_change": "track",
+}
+
+
+class CommandCoalescer:
+    """
+    방 명령 병합기
+
+    조용하던 방의 첫 명령은 바로 적용하고 window초 동안 창을 엽니다.
+    창이 열려 있는 동안 들어온 탐색/재생/일시정지/트랙 이동은 슬롯별로 마지막 것만 남겼다가
+    창이 닫힐 때 도착 순서대로 적용하므로, 탐색 바를 끌거나 버튼을 연타해도
+    방 전체 브로드캐스트는 슬롯당 창마다 한 번으로 제한됩니다.
+    병합하지 않는 명령(트랙 추가 등)은 순서를 지키기 위해 대기 중인 명령을 먼저 적용한 뒤 바로 실행합니다.
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[Dict[str, Any]], Awaitable[None]],
+        window: float = settings.COMMAND_COALESCE_WINDOW
+    ):
+        self._apply = apply
+        self.window = window
+
+        # 슬롯 -> 대기 중인 최신 명령 (도착 순서 유지)
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._window_handle: Optional[asyncio.TimerHandle] = None
+        # 명령은 하나씩 적용 (창 종료 시 적용과 새 명령이 섞이지 않도록)
+        self._lock = asyncio.Lock()
+        # 새 명령을 받는지 여부 (방을 내리기 시작하면 False)
+        self.accepting = True
+        self.closed = False
+
+        # 통계
+        self.applied = 0
+        self.merged = 0
+        self.rejected = 0
+
+    async def submit(self, command: Dict[str, Any]):
+        """명령 제출 - 바로 적용하거나 창이 닫힐 때까지 대기열에 병합 (닫힌 뒤에는 거절)"""
+        if not self.accepting:
+            self._reject(command)
+            return
+
+        slot = COALESCE_SLOTS.get(command["type"])
+
+        if slot is None:
+            async with self._lock:
+                await self._apply_pending()
+                await self._run(command)
+            return
+
+        if self._window_handle is None:
+            self._open_window()
+            async with self._lock:
+                await self._run(command)
+            return
+
+        if slot in self._pending:
+            # 같은 슬롯의 이전 명령을 버리고 최신 명령을 맨 뒤로 (다른 슬롯 명령 이후에 적용되도록)
+            del self._pending[slot]
+            self.merged += 1
+        self._pending[slot] = command
+
+    def _open_window(self):
+        self._window_handle = asyncio.get_running_loop().call_later(self.window, self._on_window_end)
+
+    def _on_window_end(self):
+        self._window_handle = None
+        if self._pending and not self.closed:
+            # 명령이 계속 들어오는 동안에도 창 단위로 묶이도록 다음 창을 바로 엶
+            self._open_window()
+            asyncio.create_task(self.flush())
+
+    async def flush(self):
+        """대기 중인 명령을 모두 적용"""
+        async with self._lock:
+            await self._apply_pending()
+
+    async def _apply_pending(self):
+        pending, self._pending = self._pending, OrderedDict()
+        for command in pending.values():
+            await self._run(command)
+
+    async def drain(self):
+        """새 명령을 받지 않도록 닫은 뒤 대기 중인 명령을 모두 적용"""
+        self.accepting = False
+        if self._window_handle:
+            self._window_handle.cancel()
+            self._window_handle = None
+        await self.flush()
+
+    def _reject(self, command: Dict[str, Any]):
+        self.rejected += 1
+        print(f"닫힌 방의 명령 거절 ({command.get('type')})")
+
+    async def _run(self, command: Dict[str, Any]):
+        if self.closed:
+            self._reject(command)
+            return
+        try:
+            await self._apply(command)
+        except Exception as e:
+            print(f"명령 처리 오류 ({command.get('type')}): {e}")
+        self.applied += 1
+
+    def close(self):
+        """창을 닫고 대기 중인 명령을 버림"""
+        self.accepting = False
+        self.closed = True
+        if self._window_handle:
+            self._window_handle.cancel()
+            self._window_handle = None
+        self._pending.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """병합 통계"""
+        return {
+            "pending": len(self._pending),
+            "applied": self.applied,
+            "merged": self.merged,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,68 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from backend.config import settings
+
+
+class RoomEventLog:
+    """
+    방 이벤트 재전송 버퍼
+
+    리비전을 올린 이벤트 프레임(state_update, playlist_delta)을 최근 capacity개만 보관합니다.
+    다시 접속하거나 공백을 감지한 클라이언트가 마지막으로 받은 리비전을 알려주면
+    그 뒤의 이벤트만 돌려주고, 버퍼가 그만큼 거슬러 올라가지 못하면 None을 돌려 스냅샷으로 대체하게 합니다.
+    놓친 이벤트가 max_replay개보다 많아도 스냅샷으로 대체합니다 - 재전송 프레임은 양보 없이 한꺼번에
+    송신 큐에 들어가므로, 큐 크기를 넘으면 클라이언트가 하나도 받기 전에 느린 연결로 종료되기 때문입니다.
+    """
+
+    def __init__(
+        self,
+        capacity: int = settings.ROOM_EVENT_LOG_SIZE,
+        max_replay: int = settings.WS_SEND_QUEUE_SIZE // 2
+    ):
+        # (리비전, JSON 프레임) - 가득 차면 가장 오래된 이벤트부터 밀려남
+        self._events: Deque[Tuple[int, str]] = deque(maxlen=capacity)
+        # 한 번에 재전송할 최대 이벤트 수 (송신 큐에 이미 있는 메시지와 이어지는 sync_tick 자리를 남김)
+        self.max_replay = max_replay
+
+        # 통계
+        self.replays = 0
+        self.replayed_events = 0
+        self.misses = 0
+
+    def append(self, revision: int, frame: str):
+        """브로드캐스트한 이벤트 기록"""
+        self._events.append((revision, frame))
+
+    def since(self, revision: int, current: int) -> Optional[List[str]]:
+        """
+        revision 이후의 이벤트 프레임 (이미 최신이면 빈 목록)
+
+        Returns:
+            revision+1부터 current까지 빠짐없이 남아 있고 max_replay개 이하면 그 프레임 목록,
+            아니면 None (스냅샷 필요)
+        """
+        missing = current - revision
+        if missing == 0:
+            return []
+        if missing < 0 or missing > min(len(self._events), self.max_replay):
+            self.misses += 1
+            return None
+
+        # 버퍼 끝에서부터 필요한 만큼만 꺼냄 (리비전이 연속인지 확인)
+        events = [self._events[i] for i in range(len(self._events) - missing, len(self._events))]
+        if events[0][0] != revision + 1 or events[-1][0] != current:
+            self.misses += 1
+            return None
+
+        self.replays += 1
+        self.replayed_events += missing
+        return [frame for _, frame in events]
+
+    def get_stats(self) -> Dict[str, int]:
+        """재전송 통계"""
+        return {
+            "replays": self.replays,
+            "replayed_events": self.replayed_events,
+            "misses": self.misses,
+        }
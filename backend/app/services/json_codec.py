@@ -0,0 +1,40 @@
+import json
+from typing import Any
+
+from backend.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _select_backend(name: str) -> str:
+    """설정값(auto/orjson/json)에 맞는 JSON 백엔드 선택 - orjson이 없으면 표준 json 사용"""
+    name = (name or "auto").lower()
+    if name in ("auto", "orjson") and orjson is not None:
+        return "orjson"
+    if name == "orjson":
+        print("orjson이 설치되어 있지 않아 표준 json 백엔드를 사용합니다")
+    return "json"
+
+
+BACKEND = _select_backend(settings.JSON_BACKEND)
+
+
+if BACKEND == "orjson":
+    def dumps(obj: Any) -> str:
+        """객체를 JSON 문자열로 직렬화"""
+        return orjson.dumps(obj).decode()
+
+    def loads(data: Any) -> Any:
+        """JSON 문자열(또는 bytes)을 객체로 역직렬화"""
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> str:
+        """객체를 JSON 문자열로 직렬화"""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def loads(data: Any) -> Any:
+        """JSON 문자열(또는 bytes)을 객체로 역직렬화"""
+        return json.loads(data)
@@ -1,29 +1,70 @@
 import asyncio
-import json
 import time
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import uuid
 
+from backend.config import settings
+from . import json_codec
+from .playlist import Playlist
+from .command_coalescer import CommandCoalescer
+from .event_log import RoomEventLog
+from .room_state_store import RoomStateStore
+from .sync_scheduler import SyncScheduler
+from .youtube import youtube_service
+
+# 요청한 연결에만 현재 상태를 보내는 명령
+STATE_REQUESTS = ("snapshot_request", "sync_request")
+
 @dataclass
 class PlaybackState:
     """재생 상태를 관리하는 데이터 클래스"""
-    playlist: List[Dict[str, Any]]
+    playlist: Playlist
     current_track_index: Optional[int]
     position: float  # 현재 재생 위치 (초)
     is_playing: bool
     last_update_time: float  # 마지막 업데이트 시간 (timestamp)
     volume: float = 1.0
+    revision: int = 0  # 상태가 바뀔 때마다 1씩 증가하는 리비전
+    track_revision: int = 0  # 현재 트랙 재생이 시작된 리비전 (중복 next_track 무시용)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlaybackState":
+        """to_dict() 또는 저장소에서 불러온 값으로 상태 복원"""
+        return cls(
+            playlist=Playlist(data["playlist"]),
+            current_track_index=data["current_track"],
+            position=data["position"],
+            is_playing=data["playing"],
+            last_update_time=data["last_update_time"],
+            volume=data["volume"],
+            revision=data["revision"],
+            track_revision=data.get("track_revision", 0)
+        )
     
     def to_dict(self):
         return {
-            "playlist": self.playlist,
+            "playlist": self.playlist.to_list(),
             "current_track": self.current_track_index,
             "position": self.position,
             "playing": self.is_playing,
             "last_update_time": self.last_update_time,
-            "volume": self.volume
+            "volume": self.volume,
+            "revision": self.revision,
+            "track_revision": self.track_revision
+        }
+    
+    def playback_dict(self):
+        """플레이리스트를 제외한 재생 상태"""
+        return {
+            "current_track": self.current_track_index,
+            "position": self.position,
+            "playing": self.is_playing,
+            "last_update_time": self.last_update_time,
+            "volume": self.volume,
+            "revision": self.revision
         }
     
     def get_current_position(self) -> float:
@@ -39,84 +80,324 @@ class PlaybackState:
         """재생 위치 업데이트"""
         self.position = new_position
         self.last_update_time = time.time()
+    
+    def current_track(self) -> Optional[Dict[str, Any]]:
+        """현재 트랙 (없으면 None)"""
+        if self.current_track_index is None or not self.playlist:
+            return None
+        return self.playlist[self.current_track_index]
+    
+    def bump_revision(self) -> int:
+        """상태 변경 시 리비전 증가"""
+        self.revision += 1
+        return self.revision
 
 class MasterClient:
     """방의 마스터 클라이언트 - 동기화 관리 담당"""
     
-    def __init__(self, room_id: str, connection_manager):
+    def __init__(
+        self,
+        room_id: str,
+        connection_manager,
+        scheduler: Optional[SyncScheduler] = None,
+        state_store: Optional[RoomStateStore] = None,
+        saved_state: Optional[Dict[str, Any]] = None
+    ):
         self.room_id = room_id
         self.connection_manager = connection_manager
+        self.scheduler = scheduler
+        self.state_store = state_store
         self.client_id = f"master_{room_id}_{uuid.uuid4().hex[:8]}"
         
-        # 재생 상태 초기화
-        self.playback_state = PlaybackState(
-            playlist=[],
-            current_track_index=None,
-            position=0.0,
-            is_playing=False,
-            last_update_time=time.time()
-        )
+        # 재생 상태 초기화 (저장된 상태가 있으면 이어서 재생)
+        if saved_state is not None:
+            self.playback_state = PlaybackState.from_dict(saved_state)
+        else:
+            self.playback_state = PlaybackState(
+                playlist=Playlist(),
+                current_track_index=None,
+                position=0.0,
+                is_playing=False,
+                last_update_time=time.time()
+            )
         
-        # 동기화 작업을 위한 태스크
-        self.sync_task: Optional[asyncio.Task] = None
         self.is_active = True
         
         # 클라이언트들의 상태 추적
         self.client_states: Dict[str, Dict[str, Any]] = {}
         
+        # 방 명령 병합기 (명령 폭주 시 슬롯별 마지막 명령만 적용)
+        self.commands = CommandCoalescer(self.apply_command)
+        
+        # 최근 이벤트 (다시 접속한 클라이언트에 놓친 이벤트만 재전송)
+        self.events = RoomEventLog()
+        
+        # 재생 중 동기화 주기 (상태가 바뀌면 최소 주기, 변화 없이 틱을 보낼 때마다 늘어남)
+        self._sync_interval = settings.SYNC_MIN_INTERVAL
+        
+        # 직렬화 캐시: 이름 -> (리비전, 시간과 무관한 부분의 JSON 조각)
+        self._frame_cache: Dict[str, Tuple[int, str]] = {}
+        
+        # 트랙 종료 시 자동으로 다음 트랙으로 넘기는 타이머
+        self._end_timer: Optional[asyncio.TimerHandle] = None
+        self._advance_task: Optional[asyncio.Task] = None
+        # video ID -> 재생 시간 조회 작업 (같은 트랙을 반복 조회하지 않도록, 중지 시 취소)
+        self._duration_lookups: Dict[str, asyncio.Task] = {}
+        # 마지막으로 확인한 현재 트랙 ID (트랙이 바뀌면 track_revision 갱신)
+        current = self.playback_state.current_track()
+        self._track_id = current["id"] if current else None
+        
     async def start(self):
         """마스터 클라이언트 시작"""
         print(f"마스터 클라이언트 시작: {self.client_id} (방: {self.room_id})")
         
-        # 주기적 동기화 태스크 시작
-        self.sync_task = asyncio.create_task(self._sync_loop())
+        # 공용 스케줄러에 등록 (재생 중일 때만 주기적 동기화 예약)
+        if self.scheduler:
+            self.scheduler.add(self.room_id, self)
+            self._reschedule_sync()
+        
+        # 복원된 방이 재생 중이면 남은 시간에 맞춰 트랙 종료 타이머 설정
+        self._arm_end_timer()
         
     async def stop(self):
         """마스터 클라이언트 중지"""
         print(f"마스터 클라이언트 중지: {self.client_id} (방: {self.room_id})")
         self.is_active = False
+        self._cancel_end_timer()
+        for task in self._duration_lookups.values():
+            task.cancel()
+        self.commands.close()
+        
+        if self.scheduler:
+            self.scheduler.remove(self.room_id)
+    
+    @property
+    def sync_interval(self) -> Optional[float]:
+        """
+        현재 재생 상태에 맞는 동기화 주기 (일시정지 중이면 None - 타이머 없음)
+        
+        클라이언트는 time_sync로 서버 시계와의 차이를 알고 있어 받은 위치를 스스로 이어가므로,
+        상태가 바뀌지 않는 동안의 틱은 위치 확인용 keepalive입니다.
+        """
+        if self.playback_state.is_playing:
+            return self._sync_interval
+        return None
+    
+    async def sync_tick(self) -> Optional[float]:
+        """스케줄러가 호출하는 주기적 동기화 - 다음 동기화까지의 간격 반환 (보낼 때마다 주기를 늘림)"""
+        if not self.is_active:
+            return None
+        
+        await self._broadcast_sync_tick()
+        self._sync_interval = min(self._sync_interval * settings.SYNC_BACKOFF, settings.SYNC_MAX_INTERVAL)
+        return self.sync_interval
+    
+    def handle_drift_report(self, drift: float):
+        """클라이언트 재생 위치 오차가 허용 범위를 넘음 - 바로 틱을 보내고 최소 주기로 복귀"""
+        if self._sync_interval > settings.SYNC_MIN_INTERVAL and self.playback_state.is_playing:
+            print(f"동기화 오차 보고 (방: {self.room_id}): {drift:.2f}초 - 동기화 주기 초기화")
+            self._sync_interval = settings.SYNC_MIN_INTERVAL
+            if self.scheduler and self.is_active:
+                self.scheduler.reschedule(self.room_id, 0.0)
+    
+    def _reschedule_sync(self):
+        """재생 상태가 바뀌면 다음 주기적 동기화를 새 주기에 맞춰 재예약 (일시정지면 예약 취소)"""
+        if self.scheduler and self.is_active:
+            interval = self.sync_interval
+            if interval is None:
+                self.scheduler.cancel(self.room_id)
+            else:
+                self.scheduler.reschedule(self.room_id, interval)
+    
+    def _cached_fragment(self, name: str, render) -> str:
+        """현재 리비전에 대한 JSON 조각을 캐시에서 가져오거나 새로 직렬화"""
+        revision = self.playback_state.revision
+        cached = self._frame_cache.get(name)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        
+        fragment = render()
+        self._frame_cache[name] = (revision, fragment)
+        return fragment
+    
+    def _render_snapshot_fragment(self) -> str:
+        # 위치를 제외한 상태를 직렬화하고 마지막 '}'를 떼어내 위치를 이어붙일 수 있게 함
+        state = self.playback_state.to_dict()
+        del state["position"]
+        del state["track_revision"]
+        return '{"type":"master_sync","master_client_id":' + json_codec.dumps(self.client_id) + \
+            ',"data":' + json_codec.dumps(state)[:-1]
+    
+    def _render_tick_fragment(self) -> str:
+        return ',"playing":' + json_codec.dumps(self.playback_state.is_playing) + \
+            ',"revision":' + json_codec.dumps(self.playback_state.revision) + '},"timestamp":'
+    
+    def build_snapshot_message(self) -> str:
+        """플레이리스트를 포함한 전체 상태 스냅샷 메시지 (접속 시 또는 리비전 공백 발생 시)"""
+        # 플레이리스트 등은 리비전이 바뀔 때만 직렬화하고, 위치와 시각만 매번 렌더링
+        fragment = self._cached_fragment("snapshot", self._render_snapshot_fragment)
+        return fragment + ',"position":' + json_codec.dumps(self.playback_state.get_current_position()) + \
+            '},"timestamp":' + json_codec.dumps(time.time()) + '}'
+    
+    def _state_changed(self):
+        """상태 변경 - 리비전을 올리고 저장 예약, 동기화 주기와 트랙 종료 타이머 재설정"""
+        revision = self.playback_state.bump_revision()
+        
+        current = self.playback_state.current_track()
+        track_id = current["id"] if current else None
+        if track_id != self._track_id:
+            self._track_id = track_id
+            self.playback_state.track_revision = revision
         
-        if self.sync_task:
-            self.sync_task.cancel()
-            try:
-                await self.sync_task
-            except asyncio.CancelledError:
-                pass
+        if self.state_store:
+            self.state_store.mark(self)
+        
+        # 변경 직후에는 다시 짧은 주기로 위치를 맞춤
+        self._sync_interval = settings.SYNC_MIN_INTERVAL
+        self._reschedule_sync()
+        self._arm_end_timer()
+    
+    def _cancel_end_timer(self):
+        if self._end_timer:
+            self._end_timer.cancel()
+            self._end_timer = None
     
-    async def _sync_loop(self):
-        """주기적으로 클라이언트들과 동기화"""
+    def _arm_end_timer(self):
+        """재생 중이고 현재 트랙 길이를 알면 정확히 끝나는 시각에 다음 트랙으로 넘기도록 예약"""
+        self._cancel_end_timer()
+        if not self.is_active or not self.playback_state.is_playing:
+            return
+        
+        current = self.playback_state.current_track()
+        if current is None:
+            return
+        duration = current.get("durationSeconds")
+        if not duration:
+            # 재생 시간을 모르면 동영상 정보를 조회한 뒤 다시 설정
+            if current["id"] not in self._duration_lookups:
+                self._duration_lookups[current["id"]] = asyncio.create_task(self._lookup_duration(current["id"]))
+            return
+        
+        remaining = max(0.0, duration - self.playback_state.get_current_position())
+        self._end_timer = asyncio.get_running_loop().call_later(
+            remaining, self._on_track_end, self.playback_state.revision
+        )
+    
+    def _on_track_end(self, revision: int):
+        """트랙 종료 - 예약 이후 상태가 바뀌지 않았을 때만 한 번 넘김"""
+        self._end_timer = None
+        if not self.is_active or revision != self.playback_state.revision:
+            return
+        self._advance_task = asyncio.create_task(self.handle_next_track())
+    
+    def _prepare_track(self, track: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        추가할 트랙에서 클라이언트가 보낸 재생 시간을 버림
+        
+        종료 타이머가 재생 시간으로 방 전체의 다음 트랙 전환 시각을 정하므로 클라이언트 값은 믿지 않습니다.
+        재생을 시작할 때 동영상 정보(get_video_details)를 조회해서 duration과 durationSeconds를 채웁니다.
+        """
+        track = dict(track)
+        track.pop("duration", None)
+        track.pop("durationSeconds", None)
+        # 제거 후 다시 추가된 트랙이면 새 항목에 다시 채우도록 끝난 조회 기록을 지움
+        lookup = self._duration_lookups.get(track["id"])
+        if lookup is not None and lookup.done():
+            del self._duration_lookups[track["id"]]
+        return track
+    
+    async def _lookup_duration(self, video_id: str):
+        """
+        동영상 정보에서 재생 시간을 가져와 트랙에 채움
+        
+        트랙 변경분("update")으로 브로드캐스트해서 리비전을 올립니다. 그래야 캐시된 스냅샷 조각과
+        재전송 버퍼, 저장된 상태에도 재생 시간이 반영되고, 현재 트랙이면 종료 타이머도 다시 설정됩니다.
+        """
         try:
-            while self.is_active:
-                await self._broadcast_state_update()
-                
-                # 재생 중이면 1초마다, 일시정지 중이면 10초마다 동기화
-                if self.playback_state.is_playing:
-                    await asyncio.sleep(1.0)  # 재생 중: 1초마다
-                else:
-                    await asyncio.sleep(10.0)  # 일시정지: 10초마다
+            details = await youtube_service.get_video_details(video_id)
+            if not details or not details.get("durationSeconds") or not self.is_active:
+                return
+            
+            # 조회하는 동안 트랙이 제거되었으면 반영하지 않고, 다시 추가되었으면 지금 플레이리스트의 항목을 갱신
+            playlist = self.playback_state.playlist
+            index = playlist.index_of(video_id)
+            if index is None:
+                return
+            track = playlist[index]
+            track["duration"] = details["duration"]
+            track["durationSeconds"] = details["durationSeconds"]
+            await self._broadcast_playlist_delta("update", index=index, track=track)
         except asyncio.CancelledError:
-            pass
+            raise
         except Exception as e:
-            print(f"동기화 루프 오류: {e}")
+            print(f"재생 시간 조회 오류 ({self.room_id}, {video_id}): {e}")
+    
+    def build_sync_tick_message(self) -> str:
+        """재생 위치, 재생 여부, 리비전만 담은 동기화 메시지"""
+        fragment = self._cached_fragment("tick", self._render_tick_fragment)
+        return '{"type":"sync_tick","data":{"position":' + \
+            json_codec.dumps(self.playback_state.get_current_position()) + \
+            fragment + json_codec.dumps(time.time()) + '}'
+    
+    async def _broadcast_sync_tick(self):
+        """주기적 동기화 - 재생 위치, 재생 여부, 리비전만 전송"""
+        if not self.is_active:
+            return
+        
+        # 아직 전송되지 않은 이전 틱은 최신 틱으로 병합
+        await self.connection_manager.broadcast_to_room(
+            self.build_sync_tick_message(), self.room_id, coalesce_key="sync_tick"
+        )
     
     async def _broadcast_state_update(self):
-        """현재 상태를 모든 클라이언트에 브로드캐스트"""
+        """재생 상태 변경(재생/일시정지/탐색/트랙 변경)을 브로드캐스트 - 플레이리스트 제외"""
+        self._state_changed()
         if not self.is_active:
             return
-            
-        current_state = self.playback_state.to_dict()
+        
+        data = self.playback_state.playback_dict()
         
         # 현재 재생 위치 업데이트
         if self.playback_state.is_playing:
-            current_state["position"] = self.playback_state.get_current_position()
+            data["position"] = self.playback_state.get_current_position()
         
-        message = json.dumps({
-            "type": "master_sync",
-            "data": current_state,
+        message = json_codec.dumps({
+            "type": "state_update",
+            "data": data,
             "master_client_id": self.client_id,
             "timestamp": time.time()
         })
         
+        self.events.append(self.playback_state.revision, message)
+        await self.connection_manager.broadcast_to_room(message, self.room_id)
+    
+    async def _broadcast_playlist_delta(self, op: str, **fields):
+        """
+        플레이리스트 변경분 브로드캐스트
+        
+        Args:
+            op: "add" (index, track) / "remove" (index, id) / "move" (from, to) /
+                "update" (index, track - 나중에 채운 재생 시간 등 트랙 정보 교체)
+        """
+        self._state_changed()
+        if not self.is_active:
+            return
+        
+        data = {
+            "op": op,
+            **fields,
+            "current_track": self.playback_state.current_track_index,
+            "revision": self.playback_state.revision
+        }
+        
+        message = json_codec.dumps({
+            "type": "playlist_delta",
+            "data": data,
+            "master_client_id": self.client_id,
+            "timestamp": time.time()
+        })
+        
+        self.events.append(self.playback_state.revision, message)
         await self.connection_manager.broadcast_to_room(message, self.room_id)
     
     async def handle_play(self):
@@ -160,41 +441,174 @@ class MasterClient:
             self.playback_state.current_track_index = track_index
             self.playback_state.position = 0.0
             self.playback_state.last_update_time = time.time()
+            # 같은 트랙을 다시 선택해도 새 재생으로 취급 (track_revision 갱신)
+            self._track_id = None
             
             await self._broadcast_state_update()
     
     async def handle_add_track(self, track: Dict[str, Any]):
-        """트랙 추가 처리"""
-        if track not in self.playback_state.playlist:
-            self.playback_state.playlist.append(track)
-            
-            # 첫 번째 트랙이면 자동으로 선택
-            if len(self.playback_state.playlist) == 1:
-                self.playback_state.current_track_index = 0
-                self.playback_state.last_update_time = time.time()
-            
-            await self._broadcast_state_update()
+        """트랙 추가 처리 (같은 video ID는 한 번만 추가)"""
+        if track["id"] in self.playback_state.playlist:
+            return False
+        
+        track = self._prepare_track(track)
+        index = self.playback_state.playlist.append(track)
+        
+        # 첫 번째 트랙이면 자동으로 선택
+        if len(self.playback_state.playlist) == 1:
+            self.playback_state.current_track_index = 0
+            self.playback_state.last_update_time = time.time()
+        
+        await self._broadcast_playlist_delta("add", index=index, track=track)
+        return True
+    
+    async def handle_insert_next(self, track: Dict[str, Any]):
+        """트랙을 현재 트랙 바로 다음에 추가 (이미 있으면 다음 순서로 이동)"""
+        playlist = self.playback_state.playlist
+        current = self.playback_state.current_track_index
+        target_index = current + 1 if current is not None else len(playlist)
+        
+        existing_index = playlist.index_of(track["id"])
+        if existing_index is not None:
+            # 이동 후 위치 기준으로 현재 트랙 바로 다음이 되도록 보정
+            if existing_index < target_index:
+                target_index -= 1
+            await self.handle_move_track(track["id"], target_index)
             return True
-        return False
+        
+        track = self._prepare_track(track)
+        index = playlist.insert(target_index, track)
+        if current is None:
+            self.playback_state.current_track_index = 0
+            self.playback_state.last_update_time = time.time()
+        
+        await self._broadcast_playlist_delta("add", index=index, track=track)
+        return True
+    
+    async def handle_remove_track(self, track_id: str):
+        """트랙 제거 처리 - 현재 트랙이 제거되면 같은 위치의 다음 트랙을 처음부터 재생"""
+        playlist = self.playback_state.playlist
+        index = playlist.index_of(track_id)
+        if index is None:
+            return False
+        
+        previous_current = self.playback_state.current_track_index
+        playlist.pop(index)
+        self.playback_state.current_track_index = Playlist.index_after_remove(previous_current, index, len(playlist))
+        
+        await self._broadcast_playlist_delta("remove", index=index, id=track_id)
+        
+        if index == previous_current:
+            # 현재 트랙이 바뀌었으므로 위치 초기화 (플레이리스트가 비었으면 정지)
+            self.playback_state.position = 0.0
+            self.playback_state.last_update_time = time.time()
+            if not playlist:
+                self.playback_state.is_playing = False
+            await self._broadcast_state_update()
+        return True
     
-    async def handle_next_track(self):
-        """다음 트랙으로 이동"""
-        if not self.playback_state.playlist:
+    async def handle_move_track(self, track_id: str, to_index: int):
+        """트랙 순서 변경 처리 - 현재 트랙은 같은 트랙을 계속 가리킴"""
+        playlist = self.playback_state.playlist
+        from_index = playlist.index_of(track_id)
+        if from_index is None:
+            return False
+        
+        to_index = max(0, min(to_index, len(playlist) - 1))
+        if from_index == to_index:
+            return False
+        
+        playlist.move(from_index, to_index)
+        self.playback_state.current_track_index = Playlist.index_after_move(
+            self.playback_state.current_track_index, from_index, to_index
+        )
+        
+        await self._broadcast_playlist_delta("move", **{"from": from_index, "to": to_index})
+        return True
+    
+    def _is_stale_skip(self, revision: Optional[int]) -> bool:
+        """클라이언트가 보낸 리비전 이후에 트랙이 이미 바뀌었으면 중복 요청"""
+        return revision is not None and revision < self.playback_state.track_revision
+    
+    async def handle_next_track(self, revision: Optional[int] = None):
+        """
+        다음 트랙으로 이동
+        
+        Args:
+            revision: 요청한 클라이언트가 알고 있던 리비전 - 그 뒤에 트랙이 바뀌었으면
+                      (자동 넘김이나 다른 클라이언트의 요청으로) 무시
+        """
+        if not self.playback_state.playlist or self._is_stale_skip(revision):
             return
             
         if self.playback_state.current_track_index is not None:
             next_index = (self.playback_state.current_track_index + 1) % len(self.playback_state.playlist)
             await self.handle_track_change(next_index)
     
-    async def handle_prev_track(self):
-        """이전 트랙으로 이동"""
-        if not self.playback_state.playlist:
+    async def handle_prev_track(self, revision: Optional[int] = None):
+        """이전 트랙으로 이동 (revision은 handle_next_track과 같음)"""
+        if not self.playback_state.playlist or self._is_stale_skip(revision):
             return
             
         if self.playback_state.current_track_index is not None:
             prev_index = (self.playback_state.current_track_index - 1) % len(self.playback_state.playlist)
             await self.handle_track_change(prev_index)
     
+    async def apply_command(self, command: Dict[str, Any]):
+        """명령 실행 (병합기를 거쳐 호출됨)"""
+        command_type = command["type"]
+        
+        if command_type == "play":
+            await self.handle_play()
+        elif command_type == "pause":
+            await self.handle_pause()
+        elif command_type == "seek":
+            await self.handle_seek(command["position"])
+        elif command_type == "track_change":
+            await self.handle_track_change(command["track_index"])
+        elif command_type == "add_track":
+            await self.handle_add_track(command["track"])
+        elif command_type == "insert_next":
+            await self.handle_insert_next(command["track"])
+        elif command_type == "remove_track":
+            await self.handle_remove_track(command["track_id"])
+        elif command_type == "move_track":
+            await self.handle_move_track(command["track_id"], command["to"])
+        elif command_type == "next_track":
+            await self.handle_next_track(command.get("revision"))
+        elif command_type == "prev_track":
+            await self.handle_prev_track(command.get("revision"))
+        elif command_type == "drift_report":
+            self.handle_drift_report(command["drift"])
+        elif command_type == "snapshot_request":
+            # 처음 접속한 연결에 스냅샷 전송
+            await self.connection_manager.send_to_target(
+                self.build_snapshot_message(), self.room_id, command["target"]
+            )
+        elif command_type == "sync_request":
+            # 다시 접속했거나 리비전 공백을 감지한 연결 - 놓친 이벤트만 보내고, 버퍼에 없으면 스냅샷
+            await self.resume(command.get("revision"), command["target"], command.get("reconnect", False))
+    
+    async def resume(self, revision: Optional[int], target: Dict[str, str], reconnect: bool = False):
+        """
+        클라이언트가 마지막으로 받은 리비전 이후의 이벤트를 요청한 연결에만 재전송
+        
+        이벤트 버퍼가 그 리비전까지 거슬러 올라가지 못하면 (또는 리비전을 모르면) 전체 스냅샷을 보냅니다.
+        다시 접속한 경우에는 끊긴 동안 흐른 재생 위치를 맞추도록 동기화 메시지를 이어서 보냅니다.
+        """
+        frames = None
+        if revision is not None:
+            frames = self.events.since(revision, self.playback_state.revision)
+        
+        if frames is None:
+            await self.connection_manager.send_to_target(self.build_snapshot_message(), self.room_id, target)
+            return
+        
+        for frame in frames:
+            await self.connection_manager.send_to_target(frame, self.room_id, target)
+        if reconnect:
+            await self.connection_manager.send_to_target(self.build_sync_tick_message(), self.room_id, target)
+    
     def get_current_state(self) -> Dict[str, Any]:
         """현재 상태 반환"""
         state = self.playback_state.to_dict()
@@ -204,43 +618,200 @@ class MasterClient:
 
 
 class MasterClientManager:
-    """모든 방의 마스터 클라이언트들을 관리"""
+    """
+    모든 방의 마스터 클라이언트들을 관리
+
+    메모리에는 사용 중인 방만 올려 둡니다. 청취자가 없는 방은 상태를 저장한 뒤 내리고(휴면),
+    다음 접속이나 명령 때 저장된 상태에서 다시 만듭니다. 메모리의 방이 max_live_rooms를 넘으면
+    가장 오래 사용하지 않은 방 중 청취자가 없거나 일시정지된 방부터 휴면시킵니다.
+    """
     
-    def __init__(self, connection_manager):
+    def __init__(self, connection_manager, max_live_rooms: int = settings.MAX_LIVE_ROOMS):
         self.connection_manager = connection_manager
-        self.master_clients: Dict[str, MasterClient] = {}
+        # 최근에 사용한 방이 뒤에 오도록 유지 (LRU)
+        self.master_clients: "OrderedDict[str, MasterClient]" = OrderedDict()
+        self.max_live_rooms = max_live_rooms
+        # 모든 방이 공유하는 동기화 스케줄러
+        self.scheduler = SyncScheduler()
+        # 방 재생 상태 저장소 (재시작/방 정리 후 복원용)
+        self.state_store = RoomStateStore()
+        # 저장된 상태를 불러오는 중인 방 (같은 방을 동시에 두 번 만들지 않도록)
+        self._creating: Dict[str, asyncio.Task] = {}
+        # 메모리에서 내린 방들의 명령 병합, 이벤트 재전송 통계 누적
+        self._retired_command_stats = {"applied": 0, "merged": 0, "rejected": 0}
+        self._retired_resume_stats = {"replays": 0, "replayed_events": 0, "misses": 0}
     
-    async def get_or_create_master_client(self, room_id: str) -> MasterClient:
-        """방의 마스터 클라이언트를 가져오거나 생성"""
-        if room_id not in self.master_clients:
-            master_client = MasterClient(room_id, self.connection_manager)
-            self.master_clients[room_id] = master_client
-            await master_client.start()
-            
-        return self.master_clients[room_id]
+    async def get_or_create_master_client(self, room_id: str, requested_state: bool = False) -> MasterClient:
+        """
+        방의 마스터 클라이언트를 가져오거나, 저장된 상태에서 복원하거나, 새로 생성
+        
+        requested_state: 방을 깨운 명령이 요청한 연결에 상태를 직접 보내는 명령(snapshot_request, sync_request)인지 여부
+        """
+        master_client = self.master_clients.get(room_id)
+        if master_client is not None:
+            self.master_clients.move_to_end(room_id)
+            return master_client
+        
+        task = self._creating.get(room_id)
+        if task is None:
+            task = asyncio.create_task(self._create_master_client(room_id, requested_state))
+            self._creating[room_id] = task
+            task.add_done_callback(lambda _: self._creating.pop(room_id, None))
+        return await asyncio.shield(task)
+    
+    async def _create_master_client(self, room_id: str, requested_state: bool) -> MasterClient:
+        saved_state = await self.state_store.load(room_id)
+        master_client = MasterClient(
+            room_id, self.connection_manager, self.scheduler, self.state_store, saved_state
+        )
+        self.master_clients[room_id] = master_client
+        await master_client.start()
+        
+        if len(self.master_clients) > self.max_live_rooms:
+            asyncio.create_task(self._hibernate_least_recently_used())
+        
+        if saved_state is not None:
+            print(f"방 상태 복원: {room_id} (리비전 {master_client.playback_state.revision})")
+            # 상태를 요청하며 방을 깨운 연결은 그 요청의 응답으로 스냅샷을 받으므로 빼고 셈
+            await self._announce_takeover(master_client, 1 if requested_state else 0)
+        return master_client
+    
+    async def _announce_takeover(self, master_client: MasterClient, requesters: int = 0):
+        """
+        다른 워커에서 이어받은 방에 이미 청취자가 있으면 새 상태 기준으로 다시 맞추도록 스냅샷 전송
+        
+        청취자가 없던 방을 다시 깨운 경우(휴면 후 첫 접속)에는 보내지 않습니다.
+        """
+        if self.connection_manager.listener_count(master_client.room_id) > requesters:
+            await self.connection_manager.broadcast_to_room(
+                master_client.build_snapshot_message(), master_client.room_id
+            )
+    
+    async def handle_command(self, room_id: str, command: Dict[str, Any]):
+        """룸 버스로 전달된 명령을 방의 마스터 클라이언트에서 실행 (이 워커가 방 소유자일 때)"""
+        master_client = await self.get_or_create_master_client(room_id, command["type"] in STATE_REQUESTS)
+        # 연달아 들어온 탐색/재생/일시정지/트랙 이동은 병합해서 마지막 것만 적용
+        await master_client.commands.submit(command)
     
     async def remove_master_client(self, room_id: str):
-        """방의 마스터 클라이언트 제거"""
-        if room_id in self.master_clients:
-            await self.master_clients[room_id].stop()
-            del self.master_clients[room_id]
+        """방의 마스터 클라이언트 제거 (저장되지 않은 상태는 먼저 저장)"""
+        if await self._detach(room_id) is not None:
+            await self.state_store.flush([room_id])
     
-    async def cleanup_inactive_rooms(self):
-        """비활성화된 방의 마스터 클라이언트들 정리"""
-        inactive_rooms = []
+    async def _detach(self, room_id: str) -> Optional[MasterClient]:
+        """
+        병합 대기 중인 명령까지 적용한 뒤 마스터 클라이언트를 멈추고 메모리에서 내림
         
+        연결에 저장된 마스터 클라이언트로 명령이 계속 제출될 수 있으므로 먼저 새 명령을 받지 않도록 닫습니다
+        (그 뒤 제출된 명령은 거절되어 통계와 로그에 남음).
+        """
+        master_client = self.master_clients.get(room_id)
+        if master_client is None:
+            return None
+        await master_client.commands.drain()
+        if self.master_clients.get(room_id) is not master_client:
+            # 기다리는 동안 다른 작업이 이미 내림
+            return None
+        del self.master_clients[room_id]
+        await master_client.stop()
+        self._retire_stats(master_client)
+        return master_client
+    
+    async def hand_off(self, room_id: str) -> Optional[Dict[str, Any]]:
+        """
+        방을 다른 워커에 넘기기 위해 마스터 클라이언트를 멈추고 재생 상태 반환 (메모리에 없던 방이면 None)
+        
+        DB 저장을 기다리지 않고 상태를 바로 넘기며, 이 워커의 저장 예약은 취소합니다 (이후 저장은 새 소유자가 함).
+        이미 진행 중인 저장은 리비전이 새 소유자의 저장보다 높지 않으므로 새 상태를 덮어쓰지 않습니다.
+        """
+        task = self._creating.get(room_id)
+        if task is not None:
+            # 저장된 상태를 불러오는 중이면 다 만든 뒤 넘김
+            await asyncio.shield(task)
+        master_client = await self._detach(room_id)
+        if master_client is None:
+            return None
+        self.state_store.discard(room_id)
+        print(f"방 인계: {room_id} (리비전 {master_client.playback_state.revision})")
+        return master_client.playback_state.to_dict()
+    
+    async def adopt(self, room_id: str, state: Dict[str, Any]):
+        """다른 워커가 넘긴 재생 상태로 방의 마스터 클라이언트 시작 (DB를 거치지 않음)"""
+        await self._detach(room_id)
+        master_client = MasterClient(
+            room_id, self.connection_manager, self.scheduler, self.state_store, state
+        )
+        self.master_clients[room_id] = master_client
+        await master_client.start()
+        print(f"방 인수: {room_id} (리비전 {master_client.playback_state.revision})")
+        await self._announce_takeover(master_client)
+        
+        if len(self.master_clients) > self.max_live_rooms:
+            asyncio.create_task(self._hibernate_least_recently_used())
+    
+    def _retire_stats(self, master_client: MasterClient):
+        for key in self._retired_command_stats:
+            self._retired_command_stats[key] += master_client.commands.get_stats()[key]
+        for key, value in master_client.events.get_stats().items():
+            self._retired_resume_stats[key] += value
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """방 수와 명령 병합, 이벤트 재전송 통계 (이 워커 기준)"""
+        commands = dict(self._retired_command_stats, pending=0)
+        resume = dict(self._retired_resume_stats)
+        for master_client in self.master_clients.values():
+            for key, value in master_client.commands.get_stats().items():
+                commands[key] += value
+            for key, value in master_client.events.get_stats().items():
+                resume[key] += value
+        return {
+            "live_rooms": len(self.master_clients),
+            "commands": commands,
+            "resume": resume,
+            "scheduler": self.scheduler.get_stats(),
+            "state_store": self.state_store.get_stats(),
+        }
+    
+    async def hibernate_room(self, room_id: str):
+        """방 휴면 - 상태를 저장하고 메모리에서 내림 (청취자가 없으면 소유권도 반납)"""
+        if room_id not in self.master_clients:
+            return
+        await self.remove_master_client(room_id)
+        print(f"방 휴면: {room_id}")
+        if self.connection_manager.listener_count(room_id) == 0:
+            await self.connection_manager.room_bus.release(room_id)
+    
+    async def _hibernate_least_recently_used(self):
+        """메모리의 방 수가 상한을 넘으면 오래 사용하지 않은 방부터 휴면"""
+        excess = len(self.master_clients) - self.max_live_rooms
+        victims = []
         for room_id, master_client in self.master_clients.items():
-            # 방에 연결된 클라이언트가 없으면 비활성화
-            if room_id not in self.connection_manager.rooms or len(self.connection_manager.rooms[room_id]) == 0:
-                # 기본 방은 제외
-                if room_id != self.connection_manager.DEFAULT_ROOM:
-                    inactive_rooms.append(room_id)
+            if len(victims) >= excess:
+                break
+            # 청취자가 있는 재생 중인 방은 주기적 동기화가 필요하므로 내리지 않음
+            if not master_client.playback_state.is_playing or self.connection_manager.listener_count(room_id) == 0:
+                victims.append(room_id)
+        
+        if len(victims) < excess:
+            print(f"메모리의 방 수가 상한을 넘었지만 휴면시킬 수 있는 방이 부족합니다 ({len(self.master_clients)}/{self.max_live_rooms})")
+        for room_id in victims:
+            await self.hibernate_room(room_id)
+    
+    async def cleanup_inactive_rooms(self):
+        """모든 워커에서 청취자가 없는 방을 휴면"""
+        inactive_rooms = [
+            room_id for room_id in self.master_clients
+            if self.connection_manager.listener_count(room_id) == 0
+        ]
         
         for room_id in inactive_rooms:
-            await self.remove_master_client(room_id)
+            await self.hibernate_room(room_id)
     
     async def shutdown_all(self):
         """모든 마스터 클라이언트 종료"""
         for master_client in self.master_clients.values():
             await master_client.stop()
-        self.master_clients.clear() 
\ No newline at end of file
+        self.master_clients.clear()
+        await self.scheduler.stop()
+        # 남은 상태 저장
+        await self.state_store.stop() 
\ No newline at end of file
@@ -0,0 +1,88 @@
+import asyncio
+from typing import Callable, Dict, Optional
+
+from backend.config import settings
+from .room_service import RoomService
+
+
+class ParticipantCountWriter:
+    """
+    방 참여자 수 write-behind
+
+    연결/해제마다 DB를 읽고 쓰는 대신 방별 최신 청취자 수만 메모리에 모아 두었다가
+    주기적으로 UPDATE 한 번에 기록합니다. 같은 방이 여러 번 바뀌어도 마지막 값만 기록됩니다.
+    시작 후 첫 기록 때는 모든 방을 실제 연결 수에 맞춰 이전 프로세스가 남긴 값을 정리합니다.
+    """
+
+    def __init__(
+        self,
+        live_counts: Callable[[], Dict[str, int]],
+        flush_interval: float = settings.PARTICIPANTS_FLUSH_INTERVAL
+    ):
+        # 모든 워커를 합친 현재 청취자 수를 돌려주는 함수 (시작 시 정리용)
+        self._live_counts = live_counts
+        self.flush_interval = flush_interval
+
+        # 아직 기록하지 않은 방별 청취자 수
+        self._dirty: Dict[str, int] = {}
+        self._reconciled = False
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.flushes = 0
+        self.rows_updated = 0
+
+    def mark(self, room_id: str, count: int):
+        """방 청취자 수 변경 기록 (다음 flush 때 반영)"""
+        self._dirty[room_id] = count
+
+    def start(self):
+        """주기적 기록 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기적 기록을 멈추고 남은 변경을 기록"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """모인 변경을 DB에 기록 (실패하면 다음 flush 때 다시 시도)"""
+        try:
+            if not self._reconciled:
+                # 버스가 다른 워커의 청취자 수를 받아온 뒤에 전체를 한 번 맞춤
+                self._dirty.clear()
+                self.rows_updated += await RoomService.reconcile_participants(self._live_counts())
+                self._reconciled = True
+            elif self._dirty:
+                dirty, self._dirty = self._dirty, {}
+                try:
+                    self.rows_updated += await RoomService.flush_participants(dirty)
+                except BaseException:
+                    # 기록하는 동안 들어온 더 새로운 값은 유지
+                    self._dirty = {**dirty, **self._dirty}
+                    raise
+            else:
+                return
+            self.flushes += 1
+        except Exception as e:
+            print(f"참여자 수 기록 오류: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """기록 통계"""
+        return {
+            "pending": len(self._dirty),
+            "flushes": self.flushes,
+            "rows_updated": self.rows_updated,
+        }
@@ -0,0 +1,121 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class Playlist:
+    """
+    video ID로 색인된 플레이리스트
+
+    - ID 중복 확인, 트랙 조회, ID -> 위치 조회는 dict로 O(1)
+    - 추가/제거/이동은 O(1)이 아님: 리스트 memmove와 함께 밀려난 범위(k칸)의 위치 색인을 고치는 O(k)
+      (색인 갱신은 ID 리스트 슬라이스를 dict.update에 넘겨 C 루프로 처리하고, 전체를 다시 만들지 않음)
+    """
+
+    def __init__(self, tracks: Optional[Iterable[Dict[str, Any]]] = None):
+        self._tracks: List[Dict[str, Any]] = []
+        # _tracks와 같은 순서의 video ID 목록 (위치 색인 갱신용)
+        self._ids: List[str] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        # video ID -> 위치
+        self._positions: Dict[str, int] = {}
+
+        for track in tracks or []:
+            self.append(track)
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._tracks)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self._tracks[index]
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._by_id
+
+    def __bool__(self) -> bool:
+        return bool(self._tracks)
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """video ID로 트랙 조회"""
+        return self._by_id.get(video_id)
+
+    def index_of(self, video_id: str) -> Optional[int]:
+        """video ID의 현재 위치"""
+        return self._positions.get(video_id)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """직렬화용 트랙 목록 (내부 리스트를 그대로 반환하므로 수정하지 말 것)"""
+        return self._tracks
+
+    def _reindex(self, start: int, end: int):
+        """start~end 범위의 위치 색인 갱신"""
+        end = min(end, len(self._ids) - 1)
+        if start <= end:
+            self._positions.update(zip(self._ids[start:end + 1], range(start, end + 1)))
+
+    def append(self, track: Dict[str, Any]) -> Optional[int]:
+        """끝에 트랙 추가 - 이미 있는 ID면 None, 추가되면 위치 반환"""
+        return self.insert(len(self._tracks), track)
+
+    def insert(self, index: int, track: Dict[str, Any]) -> Optional[int]:
+        """index 위치에 트랙 추가 - 이미 있는 ID면 None, 추가되면 위치 반환"""
+        video_id = track["id"]
+        if video_id in self._by_id:
+            return None
+
+        index = max(0, min(index, len(self._tracks)))
+        self._tracks.insert(index, track)
+        self._ids.insert(index, video_id)
+        self._by_id[video_id] = track
+        self._reindex(index, len(self._tracks) - 1)
+        return index
+
+    def pop(self, index: int) -> Dict[str, Any]:
+        """index 위치의 트랙 제거 후 반환"""
+        if index < 0:
+            index += len(self._tracks)
+        track = self._tracks.pop(index)
+        del self._ids[index]
+        del self._by_id[track["id"]]
+        del self._positions[track["id"]]
+        self._reindex(index, len(self._tracks) - 1)
+        return track
+
+    def move(self, from_index: int, to_index: int):
+        """from_index의 트랙을 to_index 위치로 이동"""
+        if from_index == to_index:
+            return
+        track = self._tracks.pop(from_index)
+        self._tracks.insert(to_index, track)
+        self._ids.insert(to_index, self._ids.pop(from_index))
+        self._reindex(min(from_index, to_index), max(from_index, to_index))
+
+    @staticmethod
+    def index_after_remove(current: Optional[int], removed: int, length: int) -> Optional[int]:
+        """
+        트랙 제거 후 현재 트랙 위치
+
+        현재 트랙보다 앞이 제거되면 한 칸 당기고, 현재 트랙이 제거되면 같은 위치의 다음 트랙을 가리킴
+        (마지막 트랙이었으면 처음으로, 비었으면 None)
+        """
+        if current is None or length == 0:
+            return None
+        if removed < current:
+            return current - 1
+        if removed == current and current >= length:
+            return 0
+        return current
+
+    @staticmethod
+    def index_after_move(current: Optional[int], from_index: int, to_index: int) -> Optional[int]:
+        """트랙 이동 후에도 현재 트랙이 같은 트랙을 가리키도록 위치 보정"""
+        if current is None:
+            return None
+        if current == from_index:
+            return to_index
+        if from_index < current <= to_index:
+            return current - 1
+        if to_index <= current < from_index:
+            return current + 1
+        return current
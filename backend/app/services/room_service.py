@@ -1,18 +1,120 @@
-from sqlalchemy.orm import Session
+import base64
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
 from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, select, tuple_, update
 import uuid
 
+from ..db import database
 from ..models.room import Room
+from ..models.room_state import RoomState
 from ..schemas.room import RoomCreate, RoomUpdate
 
+# Core 쿼리에 사용할 테이블 객체
+rooms_table = Room.__table__
+room_states_table = RoomState.__table__
+
+# 방별 참여자 수 일괄 기록 - unnest로 (id, count) 쌍을 만들어 한 문장으로 갱신
+_FLUSH_PARTICIPANTS = """
+    WITH updated AS (
+        UPDATE rooms SET participants = v.participants
+        FROM unnest(CAST(:ids AS text[]), CAST(:counts AS integer[])) AS v(id, participants)
+        WHERE rooms.id = v.id AND rooms.participants IS DISTINCT FROM v.participants
+        RETURNING 1
+    )
+    SELECT count(*) FROM updated
+"""
+
+# 참여자 수 전체 맞춤 - 목록에 없는 방은 0
+_RECONCILE_PARTICIPANTS = """
+    WITH updated AS (
+        UPDATE rooms SET participants = COALESCE(
+            (SELECT v.participants FROM unnest(CAST(:ids AS text[]), CAST(:counts AS integer[])) AS v(id, participants)
+             WHERE v.id = rooms.id),
+            0
+        )
+        WHERE rooms.participants <> 0 OR rooms.id = ANY(CAST(:ids AS text[]))
+        RETURNING 1
+    )
+    SELECT count(*) FROM updated
+"""
+
+def encode_cursor(created_at: datetime, room_id: str) -> str:
+    """페이지 커서 생성 - 마지막 방의 (created_at, id)"""
+    raw = f"{created_at.isoformat()}|{room_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """페이지 커서 해석 (잘못된 커서면 400)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, room_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), room_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 페이지 커서입니다."
+        )
+
+def _escape_like(value: str) -> str:
+    """LIKE 패턴의 특수문자 이스케이프"""
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
 class RoomService:
+    """방 저장소 - 비동기 `database`(asyncpg 커넥션 풀)로 쿼리를 실행하므로 스레드풀을 쓰지 않음"""
+
     @staticmethod
-    def get_all_rooms(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Room).offset(skip).limit(limit).all()
+    async def list_rooms(
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        room_ids: Optional[Iterable[str]] = None
+    ):
+        """
+        최신순 방 목록 (키셋 페이지네이션)
+
+        OFFSET 대신 (created_at, id) < 커서 조건으로 인덱스를 따라 읽으므로
+        페이지 깊이와 상관없이 비용이 일정하고, 같은 시각에 만든 방도 순서가 고정됩니다.
+
+        Args:
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor
+            name_prefix: 이름 접두사 (대소문자 무시)
+            room_ids: 이 ID들 중에서만 조회 (청취자가 있는 방 필터용)
+
+        Returns:
+            (방 레코드 목록, 다음 페이지 커서 또는 None)
+        """
+        query = select(rooms_table)
+
+        if cursor:
+            created_at, room_id = decode_cursor(cursor)
+            query = query.where(tuple_(rooms_table.c.created_at, rooms_table.c.id) < tuple_(created_at, room_id))
+        if name_prefix:
+            query = query.where(
+                func.lower(rooms_table.c.name).like(_escape_like(name_prefix.lower()) + "%", escape="/")
+            )
+        if room_ids is not None:
+            room_ids = list(room_ids)
+            if not room_ids:
+                return [], None
+            query = query.where(rooms_table.c.id.in_(room_ids))
+
+        # 다음 페이지가 있는지 알기 위해 하나 더 가져옴
+        query = query.order_by(rooms_table.c.created_at.desc(), rooms_table.c.id.desc()).limit(limit + 1)
+        rooms = await database.fetch_all(query)
+
+        next_cursor = None
+        if len(rooms) > limit:
+            rooms = rooms[:limit]
+            last = rooms[-1]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+        return rooms, next_cursor
 
     @staticmethod
-    def get_room_by_id(db: Session, room_id: str):
-        room = db.query(Room).filter(Room.id == room_id).first()
+    async def get_room_by_id(room_id: str):
+        query = select(rooms_table).where(rooms_table.c.id == room_id)
+        room = await database.fetch_one(query)
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -21,45 +123,79 @@ class RoomService:
         return room
 
     @staticmethod
-    def create_room(db: Session, room_data: RoomCreate):
-        room_id = str(uuid.uuid4())
-        db_room = Room(
-            id=room_id,
+    async def create_room(room_data: RoomCreate):
+        query = insert(rooms_table).values(
+            id=str(uuid.uuid4()),
             name=room_data.name,
             description=room_data.description,
-        )
-        db.add(db_room)
-        db.commit()
-        db.refresh(db_room)
-        return db_room
+            created_at=datetime.utcnow(),
+            participants=0,
+        ).returning(*rooms_table.c)
+        return await database.fetch_one(query)
 
     @staticmethod
-    def update_room(db: Session, room_id: str, room_data: RoomUpdate):
-        db_room = RoomService.get_room_by_id(db, room_id)
-        
-        # 업데이트할 필드가 있으면 업데이트
+    async def update_room(room_id: str, room_data: RoomUpdate):
+        # 업데이트할 필드가 없으면 현재 값 반환
         update_data = room_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_room, key, value)
-        
-        db.commit()
-        db.refresh(db_room)
-        return db_room
+        if not update_data:
+            return await RoomService.get_room_by_id(room_id)
+
+        query = (
+            update(rooms_table)
+            .where(rooms_table.c.id == room_id)
+            .values(**update_data)
+            .returning(*rooms_table.c)
+        )
+        room = await database.fetch_one(query)
+        if not room:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"방 ID {room_id}를 찾을 수 없습니다."
+            )
+        return room
 
     @staticmethod
-    def delete_room(db: Session, room_id: str):
-        db_room = RoomService.get_room_by_id(db, room_id)
-        db.delete(db_room)
-        db.commit()
+    async def delete_room(room_id: str):
+        async with database.transaction():
+            query = delete(rooms_table).where(rooms_table.c.id == room_id).returning(rooms_table.c.id)
+            if await database.fetch_val(query) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"방 ID {room_id}를 찾을 수 없습니다."
+                )
+            # 저장된 재생 상태도 함께 삭제
+            await database.execute(delete(room_states_table).where(room_states_table.c.room_id == room_id))
         return {"message": f"방 ID {room_id}가 삭제되었습니다."}
 
     @staticmethod
-    def update_room_participants(db: Session, room_id: str, delta: int = 1):
+    async def flush_participants(counts: Dict[str, int]) -> int:
         """
-        방 참여자 수를 업데이트합니다.
-        delta가 양수면 증가, 음수면 감소합니다.
+        여러 방의 참여자 수를 UPDATE 한 번으로 기록
+
+        값이 같은 행은 건너뛰므로 여러 워커가 같은 수를 써도 실제 행 쓰기는 일어나지 않습니다.
+
+        Returns:
+            int: 값이 바뀐 방 수
+        """
+        if not counts:
+            return 0
+        return await database.fetch_val(_FLUSH_PARTICIPANTS, values={
+            "ids": list(counts.keys()),
+            "counts": list(counts.values()),
+        })
+
+    @staticmethod
+    async def reconcile_participants(counts: Dict[str, int]) -> int:
+        """
+        시작 시 DB의 참여자 수를 실제 연결 수에 맞춤
+
+        counts에 없는 방은 0으로 (이전 프로세스가 비정상 종료되어 남은 값 정리),
+        counts에 있는 방은 그 값으로 UPDATE 한 번에 맞춥니다.
+
+        Returns:
+            int: 값이 바뀐 방 수
         """
-        db_room = RoomService.get_room_by_id(db, room_id)
-        db_room.participants = max(0, db_room.participants + delta)
-        db.commit()
-        return db_room 
\ No newline at end of file
+        return await database.fetch_val(_RECONCILE_PARTICIPANTS, values={
+            "ids": list(counts.keys()),
+            "counts": list(counts.values()),
+        })
@@ -0,0 +1,186 @@
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import select
+
+from backend.config import settings
+from . import json_codec
+from ..db import database
+from ..models.room_state import RoomState
+
+# Core 쿼리에 사용할 테이블 객체
+room_states_table = RoomState.__table__
+
+# 여러 방의 상태를 한 문장으로 저장 - 이미 같거나 더 새로운 리비전이 저장되어 있으면 덮어쓰지 않음
+# (방을 넘겨준 이전 소유자의 늦은 저장이 새 소유자가 저장한 상태를 덮어쓰지 않도록, 상태를 바꾸면 항상 리비전을 올림)
+_SAVE_STATES = """
+    INSERT INTO room_states (
+        room_id, playlist, current_track, position, is_playing, last_update_time, volume, revision,
+        track_revision, updated_at
+    )
+    SELECT v.room_id, CAST(v.playlist AS jsonb), v.current_track, v.position, v.is_playing,
+           v.last_update_time, v.volume, v.revision, v.track_revision, now() AT TIME ZONE 'utc'
+    FROM unnest(
+        CAST(:room_ids AS text[]), CAST(:playlists AS text[]), CAST(:current_tracks AS integer[]),
+        CAST(:positions AS float8[]), CAST(:playing AS boolean[]), CAST(:update_times AS float8[]),
+        CAST(:volumes AS float8[]), CAST(:revisions AS integer[]), CAST(:track_revisions AS integer[])
+    ) AS v(room_id, playlist, current_track, position, is_playing, last_update_time, volume, revision, track_revision)
+    ON CONFLICT (room_id) DO UPDATE SET
+        playlist = EXCLUDED.playlist,
+        current_track = EXCLUDED.current_track,
+        position = EXCLUDED.position,
+        is_playing = EXCLUDED.is_playing,
+        last_update_time = EXCLUDED.last_update_time,
+        volume = EXCLUDED.volume,
+        revision = EXCLUDED.revision,
+        track_revision = EXCLUDED.track_revision,
+        updated_at = EXCLUDED.updated_at
+    WHERE room_states.revision < EXCLUDED.revision
+"""
+
+
+class RoomStateStore:
+    """
+    방 재생 상태 저장소 (write-behind)
+
+    상태가 바뀐 방을 표시만 해 두었다가 주기적으로 한 번에 저장합니다.
+    짧은 시간에 여러 번 바뀐 방은 저장 시점의 최신 상태 한 번만 기록됩니다.
+    """
+
+    def __init__(self, save_interval: float = settings.ROOM_STATE_SAVE_INTERVAL):
+        self.save_interval = save_interval
+
+        # 저장이 필요한 방 -> 상태를 가진 객체 (저장 시점에 playback_state를 직렬화)
+        self._dirty: Dict[str, Any] = {}
+        # 저장 중인 방 -> 저장 완료 이벤트 (저장 중에 같은 방을 불러오면 완료를 기다림)
+        self._saving: Dict[str, asyncio.Event] = {}
+        # 저장 중에 저장 예약이 취소된 방 (그 저장이 실패해도 다시 표시하지 않음)
+        self._discarded: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.saves = 0
+        self.rooms_saved = 0
+
+    def mark(self, master_client):
+        """방 상태가 바뀌었음을 표시 (다음 저장 때 최신 상태 기록)"""
+        self._dirty[master_client.room_id] = master_client
+        self._schedule()
+
+    def discard(self, room_id: str):
+        """방의 저장 예약 취소 (다른 워커에 넘겨준 방 - 이후 저장은 새 소유자가 함)"""
+        self._dirty.pop(room_id, None)
+        if room_id in self._saving:
+            self._discarded.add(room_id)
+
+    def _schedule(self):
+        """저장이 예약되어 있지 않으면 save_interval 후 저장 예약"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(self.save_interval)
+        self._task = None
+        await self.flush()
+
+    async def load(self, room_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 방 상태 조회 (없거나 DB 오류면 None)"""
+        # 아직 저장되지 않은 상태가 있으면 DB보다 새로우므로 그대로 사용
+        pending = self._dirty.get(room_id)
+        if pending is not None:
+            return pending.playback_state.to_dict()
+        saving = self._saving.get(room_id)
+        if saving is not None:
+            await saving.wait()
+            pending = self._dirty.get(room_id)
+            if pending is not None:
+                return pending.playback_state.to_dict()
+
+        try:
+            row = await database.fetch_one(
+                select(room_states_table).where(room_states_table.c.room_id == room_id)
+            )
+        except Exception as e:
+            print(f"방 상태 불러오기 오류 ({room_id}): {e}")
+            return None
+        if row is None:
+            return None
+
+        playlist = row["playlist"]
+        if isinstance(playlist, str):
+            playlist = json_codec.loads(playlist)
+        return {
+            "playlist": playlist,
+            "current_track": row["current_track"],
+            "position": row["position"],
+            "playing": row["is_playing"],
+            "last_update_time": row["last_update_time"],
+            "volume": row["volume"],
+            "revision": row["revision"],
+            "track_revision": row["track_revision"],
+        }
+
+    async def flush(self, room_ids=None):
+        """표시된 방들의 상태를 한 문장으로 저장 (실패하면 다음 저장 때 다시 시도)"""
+        if room_ids is None:
+            pending, self._dirty = self._dirty, {}
+        else:
+            pending = {room_id: self._dirty.pop(room_id) for room_id in room_ids if room_id in self._dirty}
+        if not pending:
+            return
+
+        done = asyncio.Event()
+        for room_id in pending:
+            self._saving[room_id] = done
+
+        states = [master_client.playback_state for master_client in pending.values()]
+        try:
+            await database.execute(_SAVE_STATES, values={
+                "room_ids": list(pending.keys()),
+                "playlists": [json_codec.dumps(state.playlist.to_list()) for state in states],
+                "current_tracks": [state.current_track_index for state in states],
+                "positions": [state.position for state in states],
+                "playing": [state.is_playing for state in states],
+                "update_times": [state.last_update_time for state in states],
+                "volumes": [state.volume for state in states],
+                "revisions": [state.revision for state in states],
+                "track_revisions": [state.track_revision for state in states],
+            })
+        except BaseException as e:
+            # 저장하는 동안 다시 표시된 방과 예약이 취소된 방은 그대로 두고 나머지를 되돌림 (취소된 경우 포함)
+            for room_id, master_client in pending.items():
+                if room_id not in self._discarded:
+                    self._dirty.setdefault(room_id, master_client)
+            if not isinstance(e, Exception):
+                raise
+            print(f"방 상태 저장 오류: {e}")
+            self._schedule()
+            return
+        finally:
+            done.set()
+            self._discarded.difference_update(pending)
+            for room_id in pending:
+                if self._saving.get(room_id) is done:
+                    del self._saving[room_id]
+
+        self.saves += 1
+        self.rooms_saved += len(pending)
+
+    async def stop(self):
+        """예약된 저장을 취소하고 남은 상태를 모두 저장"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        """저장 통계"""
+        return {
+            "pending": len(self._dirty),
+            "saves": self.saves,
+            "rooms_saved": self.rooms_saved,
+        }
@@ -0,0 +1,162 @@
+import asyncio
+import heapq
+import math
+from typing import Dict, Any, List, Optional, Tuple
+
+from backend.config import settings
+
+
+class SyncScheduler:
+    """
+    모든 방의 주기적 동기화를 하나의 태스크에서 처리하는 스케줄러
+
+    다음 동기화 시각을 기준으로 한 힙을 사용하며, 같은 틱에 도래한 방들은 한 번에 처리합니다.
+    방의 동기화 주기가 바뀌어도 태스크를 새로 만들 필요 없이 reschedule만 호출하면 됩니다.
+    """
+
+    def __init__(self, tick_interval: float = settings.SYNC_TICK_INTERVAL):
+        self.tick_interval = tick_interval
+
+        # (due_time, seq, room_id) - 취소/변경된 항목은 seq 비교로 무시 (lazy invalidation)
+        self._heap: List[Tuple[float, int, str]] = []
+        # room_id -> 현재 유효한 seq
+        self._entries: Dict[str, int] = {}
+        # room_id -> 동기화 대상 (sync_tick() 코루틴을 제공하는 객체)
+        self._targets: Dict[str, Any] = {}
+        self._seq = 0
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.ticks = 0
+        self.rooms_synced = 0
+        self.last_tick_lag = 0.0
+        self.max_tick_lag = 0.0
+        self._total_tick_lag = 0.0
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _quantize(self, due_time: float) -> float:
+        """같은 틱에 도래하는 방들이 한 번에 처리되도록 시각을 틱 단위로 올림"""
+        return math.ceil(due_time / self.tick_interval) * self.tick_interval
+
+    def add(self, room_id: str, target, delay: float = 0.0):
+        """동기화 대상 등록 (delay초 후 첫 동기화)"""
+        self._targets[room_id] = target
+        self.reschedule(room_id, delay)
+        self._ensure_running()
+
+    def remove(self, room_id: str):
+        """동기화 대상 제거"""
+        self._targets.pop(room_id, None)
+        self._entries.pop(room_id, None)
+
+    def cancel(self, room_id: str):
+        """예약된 동기화만 취소 (대상은 유지하므로 reschedule로 다시 예약 가능)"""
+        self._entries.pop(room_id, None)
+
+    def reschedule(self, room_id: str, delay: float):
+        """방의 다음 동기화 시각 변경"""
+        if room_id not in self._targets:
+            return
+
+        self._seq += 1
+        due_time = self._quantize(self._now() + delay)
+        self._entries[room_id] = self._seq
+        heapq.heappush(self._heap, (due_time, self._seq, room_id))
+
+        # 가장 빠른 예정 시각이 바뀌었으면 대기 중인 루프를 깨움
+        if self._wakeup and self._heap[0][0] >= due_time:
+            self._wakeup.set()
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """스케줄러 중지"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._heap.clear()
+        self._entries.clear()
+        self._targets.clear()
+
+    async def _run(self):
+        """도래한 방들을 틱 단위로 모아서 동기화"""
+        try:
+            while True:
+                # 무효화된 항목 정리
+                while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                now = self._now()
+                due_time = self._heap[0][0]
+                if due_time > now:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), due_time - now)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._process_due(now)
+        except asyncio.CancelledError:
+            pass
+
+    async def _process_due(self, now: float):
+        """현재 시각까지 도래한 모든 방을 한 번에 처리"""
+        batch: List[str] = []
+        earliest_due = self._heap[0][0]
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, room_id = heapq.heappop(self._heap)
+            if self._entries.get(room_id) == seq:
+                del self._entries[room_id]
+                batch.append(room_id)
+
+        if not batch:
+            return
+
+        lag = now - earliest_due
+        self.ticks += 1
+        self.rooms_synced += len(batch)
+        self.last_tick_lag = lag
+        self.max_tick_lag = max(self.max_tick_lag, lag)
+        self._total_tick_lag += lag
+
+        for room_id in batch:
+            target = self._targets.get(room_id)
+            if target is None:
+                continue
+            try:
+                next_delay = await target.sync_tick()
+            except Exception as e:
+                print(f"동기화 틱 오류 (방: {room_id}): {e}")
+                next_delay = getattr(target, "sync_interval", None)
+
+            # sync_tick 도중 다시 예약되지 않았다면 반환된 주기로 다음 동기화 예약
+            if next_delay is not None and room_id not in self._entries:
+                self.reschedule(room_id, next_delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스케줄러 통계 반환"""
+        return {
+            "rooms": len(self._targets),
+            "ticks": self.ticks,
+            "rooms_synced": self.rooms_synced,
+            "last_tick_lag": self.last_tick_lag,
+            "max_tick_lag": self.max_tick_lag,
+            "avg_tick_lag": self._total_tick_lag / self.ticks if self.ticks else 0.0,
+        }
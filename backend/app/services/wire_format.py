@@ -0,0 +1,89 @@
+from typing import Any, Iterable, Optional, Tuple, Union
+
+from . import json_codec
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# 연결별 전송 형식 (기본은 JSON 텍스트 프레임)
+JSON = "json"
+MSGPACK = "msgpack"
+
+# WebSocket 서브프로토콜 -> 전송 형식
+SUBPROTOCOLS = {
+    "openjukebox.json": JSON,
+    "openjukebox.msgpack": MSGPACK,
+}
+
+Payload = Union[str, bytes]
+
+
+def available(wire_format: str) -> bool:
+    """이 서버에서 사용할 수 있는 형식인지 (msgpack은 패키지가 설치되어 있어야 함)"""
+    return wire_format == JSON or (wire_format == MSGPACK and msgpack is not None)
+
+
+def negotiate(
+    requested: Optional[str], offered_subprotocols: Iterable[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    연결의 전송 형식 결정
+
+    쿼리 파라미터(format=msgpack)를 먼저 보고, 없으면 클라이언트가 제안한 서브프로토콜 중
+    사용할 수 있는 첫 번째 것을 고릅니다. 사용할 수 없는 형식을 요청하면 JSON으로 대체합니다.
+
+    클라이언트가 서브프로토콜을 제안했으면 그중 하나로 응답해야 합니다 (브라우저는 제안한 서브프로토콜을
+    돌려받지 못하면 핸드셰이크를 실패로 처리). 고른 형식의 서브프로토콜이 없으면 제안한 것 중 사용할 수 있는
+    형식으로 바꾸고, 그것도 없으면 (None, None)을 반환해 연결을 거부하게 합니다.
+
+    Returns:
+        (전송 형식, 수락할 서브프로토콜 또는 None) - 수락할 수 없으면 (None, None)
+    """
+    offered = list(offered_subprotocols)
+    wire_format = JSON
+    if requested:
+        requested = requested.lower()
+        if available(requested):
+            wire_format = requested
+    else:
+        for subprotocol in offered:
+            if subprotocol in SUBPROTOCOLS and available(SUBPROTOCOLS[subprotocol]):
+                wire_format = SUBPROTOCOLS[subprotocol]
+                break
+
+    if not offered:
+        return wire_format, None
+
+    # 선택한 형식에 해당하는 서브프로토콜로 응답 (없으면 제안한 것 중 사용할 수 있는 형식으로)
+    subprotocol = next((name for name in offered if SUBPROTOCOLS.get(name) == wire_format), None)
+    if subprotocol is None:
+        subprotocol = next(
+            (name for name in offered if name in SUBPROTOCOLS and available(SUBPROTOCOLS[name])), None
+        )
+        if subprotocol is None:
+            return None, None
+        wire_format = SUBPROTOCOLS[subprotocol]
+    return wire_format, subprotocol
+
+
+def encode(obj: Any, wire_format: str) -> Payload:
+    """객체를 연결 형식의 프레임으로 직렬화"""
+    if wire_format == MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json_codec.dumps(obj)
+
+
+def transcode(payload: str, wire_format: str) -> Payload:
+    """JSON으로 만든 브로드캐스트 프레임을 연결 형식으로 변환 (JSON이면 그대로)"""
+    if wire_format == MSGPACK:
+        return msgpack.packb(json_codec.loads(payload), use_bin_type=True)
+    return payload
+
+
+def decode_binary(data: bytes) -> Any:
+    """클라이언트가 보낸 바이너리 프레임 역직렬화 (msgpack)"""
+    if msgpack is None:
+        raise ValueError("바이너리 메시지를 처리할 수 없습니다 (msgpack 미설치)")
+    return msgpack.unpackb(data, raw=False)
@@ -1,92 +1,232 @@
+import asyncio
+import re
 from typing import List, Dict, Any, Optional
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
 from ...config import settings
+from .cache import AsyncTTLCache
+
+# YouTube Data API v3 엔드포인트 (디스커버리 문서 없이 고정된 REST 경로 사용 - 시작 시 네트워크 접근 없음)
+YOUTUBE_API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+YOUTUBE_SEARCH_PATH = "/search"
+YOUTUBE_VIDEOS_PATH = "/videos"
+# videos.list 한 번에 조회할 수 있는 최대 ID 수
+VIDEOS_PER_REQUEST = 50
+# contentDetails.duration 형식 (예: PT4M13S, PT1H2M, P1DT3H)
+_ISO8601_DURATION = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+def parse_duration(duration: Optional[str]) -> Optional[int]:
+    """
+    ISO-8601 재생 시간을 초 단위 정수로 변환
+
+    Returns:
+        int: 재생 시간 (초), 형식이 다르거나 0(라이브 방송의 P0D 등)이면 None
+    """
+    if not duration:
+        return None
+    match = _ISO8601_DURATION.match(duration)
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(value) if value else 0 for value in match.groups())
+    total = ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+    return total or None
+
+class YouTubeAPIError(Exception):
+    """YouTube API 호출 실패 (네트워크 오류, 타임아웃, 오류 응답)"""
+
 
 class YouTubeService:
     def __init__(self, api_key: str = settings.YOUTUBE_API_KEY):
-        """YouTube API 서비스 초기화"""
-        self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=self.api_key)
-    
-    async def search_videos(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
-        YouTube 동영상 검색
+        YouTube API 서비스 초기화
         
+        HTTP 클라이언트는 첫 API 호출 시 생성되므로 모듈 import와 서비스 생성은 네트워크에 접근하지 않습니다.
+        """
+        self.api_key = api_key
+
+        # keep-alive 연결을 재사용하는 비동기 HTTP 클라이언트 (첫 사용 시 생성)
+        self._client = None
+        # 동시에 진행되는 YouTube API 요청 수 제한
+        self._semaphore = asyncio.Semaphore(settings.YOUTUBE_MAX_CONCURRENCY)
+
+        # 결과 캐시 (동영상 상세 정보는 잘 바뀌지 않으므로 더 오래 보관)
+        self.search_cache = AsyncTTLCache(maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_CACHE_TTL)
+        self.video_cache = AsyncTTLCache(maxsize=settings.VIDEO_CACHE_SIZE, ttl=settings.VIDEO_CACHE_TTL)
+
+    def _get_client(self):
+        """HTTP 클라이언트를 가져오거나 처음 사용할 때 생성"""
+        if self._client is None:
+            # httpx import와 SSL 컨텍스트 생성 비용을 앱 시작 시점에서 첫 요청 시점으로 미룸
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                base_url=YOUTUBE_API_BASE_URL,
+                timeout=httpx.Timeout(settings.YOUTUBE_API_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.YOUTUBE_MAX_CONCURRENCY,
+                    max_keepalive_connections=settings.YOUTUBE_MAX_CONCURRENCY
+                )
+            )
+        return self._client
+
+    async def close(self):
+        """HTTP 연결 풀 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """YouTube API GET 요청 (오류 시 YouTubeAPIError 발생)"""
+        import httpx
+
+        client = self._get_client()
+        try:
+            async with self._semaphore:
+                response = await client.get(path, params={**params, "key": self.api_key})
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise YouTubeAPIError(str(e)) from e
+        return response.json()
+
+    async def search_videos(self, query: str, max_results: int = 10, with_details: bool = False) -> List[Dict[str, Any]]:
+        """
+        YouTube 동영상 검색 (캐시 사용, 같은 검색어의 동시 요청은 한 번만 호출)
+
         Args:
             query: 검색어
             max_results: 최대 검색 결과 수
-            
+            with_details: True면 재생 시간(duration)을 한 번의 일괄 조회로 채워서 반환
+
         Returns:
             List[Dict]: 검색 결과 목록
         """
+        key = (query.strip().lower(), max_results)
         try:
-            search_response = self.youtube.search().list(
-                q=query,
-                part='snippet',
-                maxResults=max_results,
-                type='video'
-            ).execute()
-            
-            videos = []
-            for item in search_response.get('items', []):                
-                # 채널 결과는 건너뛰기 - videoId가 없거나 kind가 channel인 경우
-                if 'videoId' not in item['id'] or item['id'].get('kind') == 'youtube#channel':
-                    print(f"채널 결과 건너뛰기: {item.get('snippet', {}).get('title', 'Unknown')}")
-                    continue
-                
-                video_id = item['id']['videoId']
-                video_info = {
-                    'id': video_id,
-                    'title': item['snippet']['title'],
-                    'thumbnail': item['snippet']['thumbnails']['default']['url'],
-                    'channel': item['snippet']['channelTitle'],
-                    'publishedAt': item['snippet']['publishedAt']
-                }
-                videos.append(video_info)
-                
-            return videos
-            
-        except HttpError as e:
+            videos = await self.search_cache.get_or_load(key, lambda: self._fetch_search(query, max_results))
+        except YouTubeAPIError as e:
             print(f"YouTube API 오류: {e}")
             return []
-    
+
+        if not with_details or not videos:
+            return videos
+
+        details = {video['id']: video for video in await self.get_videos_details([video['id'] for video in videos])}
+        return [
+            {
+                **video,
+                'duration': details[video['id']]['duration'],
+                'durationSeconds': details[video['id']]['durationSeconds']
+            } if video['id'] in details else video
+            for video in videos
+        ]
+
+    async def _fetch_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """YouTube 검색 API 호출"""
+        search_response = await self._get(YOUTUBE_SEARCH_PATH, {
+            "q": query,
+            "part": "snippet",
+            "maxResults": max_results,
+            "type": "video"
+        })
+
+        videos = []
+        for item in search_response.get('items', []):
+            # 채널 결과는 건너뛰기 - videoId가 없거나 kind가 channel인 경우
+            if 'videoId' not in item['id'] or item['id'].get('kind') == 'youtube#channel':
+                print(f"채널 결과 건너뛰기: {item.get('snippet', {}).get('title', 'Unknown')}")
+                continue
+
+            video_id = item['id']['videoId']
+            video_info = {
+                'id': video_id,
+                'title': item['snippet']['title'],
+                'thumbnail': item['snippet']['thumbnails']['default']['url'],
+                'channel': item['snippet']['channelTitle'],
+                'publishedAt': item['snippet']['publishedAt']
+            }
+            videos.append(video_info)
+
+        return videos
+
     async def get_video_details(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
-        YouTube 동영상 상세 정보 조회
-        
+        YouTube 동영상 상세 정보 조회 (캐시 사용)
+
         Args:
             video_id: YouTube 동영상 ID
-            
+
         Returns:
             Dict: 동영상 상세 정보
         """
         try:
-            video_response = self.youtube.videos().list(
-                id=video_id,
-                part='snippet,contentDetails'
-            ).execute()
-            
-            items = video_response.get('items', [])
-            if not items:
-                return None
-                
-            item = items[0]
-            video_info = {
+            return await self.video_cache.get_or_load(video_id, lambda: self._fetch_video_details(video_id))
+        except YouTubeAPIError as e:
+            print(f"YouTube API 오류: {e}")
+            return None
+
+    async def get_videos_details(self, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        여러 YouTube 동영상 상세 정보 일괄 조회
+
+        캐시에 없는 ID만 50개 단위로 나눠 동시에 조회하고 캐시와 합칩니다.
+
+        Args:
+            video_ids: YouTube 동영상 ID 목록
+
+        Returns:
+            List[Dict]: 요청한 순서대로 정렬된 동영상 상세 정보 (찾지 못한 ID는 제외)
+        """
+        try:
+            details = await self.video_cache.get_many_or_load(video_ids, self._fetch_videos_details)
+        except YouTubeAPIError as e:
+            print(f"YouTube API 오류: {e}")
+            return []
+
+        return [details[video_id] for video_id in dict.fromkeys(video_ids) if video_id in details]
+
+    async def _fetch_video_details(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """YouTube 동영상 API 호출"""
+        return (await self._fetch_videos_chunk([video_id])).get(video_id)
+
+    async def _fetch_videos_details(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """YouTube 동영상 API를 50개 단위로 나눠 동시에 호출"""
+        chunks = [
+            video_ids[i:i + VIDEOS_PER_REQUEST]
+            for i in range(0, len(video_ids), VIDEOS_PER_REQUEST)
+        ]
+        results: Dict[str, Dict[str, Any]] = {}
+        for chunk_result in await asyncio.gather(*(self._fetch_videos_chunk(chunk) for chunk in chunks)):
+            results.update(chunk_result)
+        return results
+
+    async def _fetch_videos_chunk(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """YouTube 동영상 API 호출 (최대 50개 ID)"""
+        video_response = await self._get(YOUTUBE_VIDEOS_PATH, {
+            "id": ",".join(video_ids),
+            "part": "snippet,contentDetails",
+            "maxResults": VIDEOS_PER_REQUEST
+        })
+
+        videos = {}
+        for item in video_response.get('items', []):
+            video_id = item['id']
+            videos[video_id] = {
                 'id': video_id,
                 'title': item['snippet']['title'],
                 'thumbnail': item['snippet']['thumbnails']['default']['url'],
                 'channel': item['snippet']['channelTitle'],
                 'duration': item['contentDetails']['duration'],
+                'durationSeconds': parse_duration(item['contentDetails']['duration']),
                 'publishedAt': item['snippet']['publishedAt']
             }
-            
-            return video_info
-            
-        except HttpError as e:
-            print(f"YouTube API 오류: {e}")
-            return None
+
+        return videos
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """검색/동영상 캐시 통계"""
+        return {
+            "search": self.search_cache.get_stats(),
+            "video": self.video_cache.get_stats()
+        }
 
 # 서비스 인스턴스 생성
-youtube_service = YouTubeService() 
\ No newline at end of file
+youtube_service = YouTubeService()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from .connection_manager import ConnectionManager
+from ..bus import create_room_bus
 from ..services.master_client import MasterClientManager
 
 router = APIRouter()
@@ -13,4 +14,8 @@ master_client_manager = MasterClientManager(manager)
 # 순환 참조 방지를 위해 별도로 설정
 manager.set_master_client_manager(master_client_manager)
 
+# 워커 간 방 상태 전달용 룸 버스 (ROOM_BUS_BACKEND 설정에 따라 선택)
+room_bus = create_room_bus()
+manager.set_room_bus(room_bus)
+
 from .routes import * 
\ No newline at end of file
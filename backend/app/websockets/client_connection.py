@@ -0,0 +1,189 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from fastapi import WebSocket
+
+from backend.config import settings
+from .rate_limit import TokenBucket
+from ..services import wire_format as wire
+
+# 강제 종료 사유 -> WebSocket 종료 코드
+CLOSE_CODES = {
+    "idle_timeout": 4000,   # 하트비트 응답 없음
+    "slow_consumer": 4001,  # 송신 큐 초과
+    "send_timeout": 4001,   # 전송이 멈춤
+    "send_failed": 1011,    # 전송 오류
+}
+
+
+class ClientConnection:
+    """
+    WebSocket 연결 하나에 대한 송신 큐와 전용 writer 태스크
+
+    브로드캐스트는 큐에 메시지를 넣기만 하고 바로 반환합니다.
+    느린 클라이언트가 있어도 같은 방의 다른 클라이언트 전송이 지연되지 않습니다.
+    전송에 실패하거나 송신 큐가 가득 차면 연결을 닫고 on_evict로 알립니다.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        room_id: str,
+        wire_format: str = wire.JSON,
+        max_queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        on_evict: Optional[Callable[["ClientConnection", str], None]] = None
+    ):
+        self.websocket = websocket
+        self.room_id = room_id
+        # 전송 형식 (json: 텍스트 프레임, msgpack: 바이너리 프레임)
+        self.wire_format = wire_format
+        # 접속 시각과 마지막으로 메시지를 받은 시각 (timestamp)
+        self.joined_at = time.time()
+        self.last_seen = self.joined_at
+        self.connection_id = uuid.uuid4().hex
+        self.max_queue_size = max_queue_size
+        # on_evict(connection, reason): 강제 종료 시 호출 (연결 관리자에서 제거하고 소켓을 닫음)
+        self.on_evict = on_evict
+
+        # 송신 대기 메시지: [coalesce_key, payload] (최신 메시지로 대체된 항목은 payload가 None인 빈 항목으로 남음)
+        self._queue: Deque[List] = deque()
+        # coalesce_key -> 큐에 남아있는 항목 (같은 키의 최신 메시지로 대체)
+        self._pending: Dict[str, List] = {}
+        # 큐에서 빈 항목을 뺀 실제 대기 메시지 수
+        self._live = 0
+        self._wakeup = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        # 진행 중인 전송을 시작한 시각 (monotonic, 전송 중이 아니면 None) - 멈춘 전송 감지용
+        self.send_started: Optional[float] = None
+        self.closed = False
+
+        # 이 워커가 방 소유자일 때 해석해 둔 마스터 클라이언트 (명령마다 다시 찾지 않도록)
+        self.master_client = None
+
+        # 수신 메시지 속도 제한 (한 클라이언트가 방 전체에 명령을 쏟아내지 않도록)
+        self.command_bucket = TokenBucket()
+        # 동기화용 메시지는 따로 제한 (명령을 연타한 클라이언트도 시계 동기화와 하트비트는 유지)
+        self.control_bucket = TokenBucket(settings.WS_CONTROL_RATE, settings.WS_CONTROL_BURST)
+
+        # 통계
+        self.sent_count = 0
+        self.merged_count = 0
+        self.rate_limited_count = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._live
+
+    def describe(self) -> Dict[str, Any]:
+        """연결 메타데이터"""
+        return {
+            "connection_id": self.connection_id,
+            "room_id": self.room_id,
+            "format": self.wire_format,
+            "joined_at": self.joined_at,
+            "last_seen": self.last_seen,
+            "queue_depth": self.queue_depth,
+            "sent": self.sent_count,
+            "merged": self.merged_count,
+            "rate_limited": self.rate_limited_count,
+        }
+
+    def start(self):
+        """writer 태스크 시작"""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._writer())
+
+    def close(self):
+        """writer 태스크 중지 및 큐 비우기"""
+        self.closed = True
+        self._queue.clear()
+        self._pending.clear()
+        self._live = 0
+        if self._writer_task and not self._writer_task.done() and self._writer_task is not asyncio.current_task():
+            self._writer_task.cancel()
+
+    def evict(self, reason: str):
+        """연결 강제 종료 (reason은 CLOSE_CODES의 키)"""
+        if self.closed:
+            return
+        self.close()
+        if self.on_evict:
+            self.on_evict(self, reason)
+
+    def enqueue_message(self, message: Dict[str, Any]) -> bool:
+        """객체를 이 연결의 전송 형식으로 직렬화해서 큐에 추가"""
+        return self.enqueue(wire.encode(message, self.wire_format))
+
+    def enqueue(self, payload: wire.Payload, coalesce_key: Optional[str] = None) -> bool:
+        """
+        메시지를 송신 큐에 추가
+
+        Args:
+            payload: 전송할 메시지 (이 연결의 전송 형식으로 직렬화된 문자열 또는 bytes)
+            coalesce_key: 지정하면 아직 전송되지 않은 같은 키의 메시지를 버리고 최신 메시지로 대체
+
+        Returns:
+            bool: 큐에 들어갔으면 True, 연결이 닫혔거나 송신 큐 초과로 종료되어 버려졌으면 False
+        """
+        if self.closed:
+            return False
+
+        if coalesce_key is not None:
+            stale = self._pending.pop(coalesce_key, None)
+            if stale is not None:
+                # 아직 전송 전인 오래된 동기화 프레임은 비워 두고(writer가 건너뜀) 최신 프레임을 뒤에 추가
+                # (앞서 큐에 들어간 다른 메시지보다 먼저 전송되지 않도록, 큐를 훑지 않고 O(1)로 처리)
+                stale[0] = stale[1] = None
+                self._live -= 1
+                self.merged_count += 1
+                if len(self._queue) > 2 * self.max_queue_size:
+                    # 전송이 밀려 빈 항목이 쌓이면 한 번에 정리 (큐 길이가 계속 늘지 않도록)
+                    self._queue = deque(entry for entry in self._queue if entry[1] is not None)
+
+        if self._live >= self.max_queue_size:
+            # 병합하고도 큐가 가득 찼으면 따라오지 못하는 클라이언트 - 메시지를 골라 버리는 대신 연결을 끊음
+            # (다시 접속하면 스냅샷부터 받음)
+            self.evict("slow_consumer")
+            return False
+
+        entry = [coalesce_key, payload]
+        self._queue.append(entry)
+        self._live += 1
+        if coalesce_key is not None:
+            self._pending[coalesce_key] = entry
+
+        self._wakeup.set()
+        return True
+
+    async def _writer(self):
+        """큐에 쌓인 메시지를 순서대로 전송"""
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                coalesce_key, payload = self._queue.popleft()
+                if payload is None:
+                    # 최신 메시지로 대체된 빈 항목
+                    continue
+                self._live -= 1
+                if coalesce_key is not None:
+                    self._pending.pop(coalesce_key, None)
+
+                self.send_started = time.monotonic()
+                if isinstance(payload, bytes):
+                    await self.websocket.send_bytes(payload)
+                else:
+                    await self.websocket.send_text(payload)
+                self.send_started = None
+                self.sent_count += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"WebSocket 전송 오류 (방: {self.room_id}): {e}")
+            self.evict("send_failed")
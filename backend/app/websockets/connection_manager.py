@@ -1,142 +1,337 @@
+import asyncio
+import time
 from fastapi import WebSocket
-from typing import List, Dict, Any, Optional
-import json
+from typing import Dict, Any, Optional, Tuple
+
+from backend.config import settings
+from .client_connection import CLOSE_CODES, ClientConnection
+from .heartbeat import HeartbeatMonitor
+from ..bus import RoomBus
+from ..services import wire_format as wire
+from ..services.master_client import STATE_REQUESTS
+from ..services.participant_writer import ParticipantCountWriter
 
 class ConnectionManager:
     def __init__(self):
-        # 방별 활성 연결 보관
-        self.rooms: Dict[str, List[WebSocket]] = {}
-        # 웹소켓-방 매핑
-        self.socket_to_room: Dict[WebSocket, str] = {}
+        # 방별 활성 연결 (연결 ID -> 연결, 접속 순서 유지) - 추가/제거 모두 O(1)
+        self.rooms: Dict[str, Dict[str, ClientConnection]] = {}
+        # 연결 ID별 연결 (다른 워커가 보낸 개별 메시지 전달용)
+        self.connections: Dict[str, ClientConnection] = {}
+        # 방별 연결 목록 스냅샷 (브로드캐스트용, 접속/해제 시에만 다시 만듦)
+        self._room_snapshots: Dict[str, Tuple[ClientConnection, ...]] = {}
         
         # 기본 방 ID (하위 호환성)
         self.DEFAULT_ROOM = "default"
         
         # 기본 방 초기화
-        self.rooms[self.DEFAULT_ROOM] = []
+        self.rooms[self.DEFAULT_ROOM] = {}
         
-        # 마스터 클라이언트 매니저는 나중에 초기화됩니다 (순환 참조 방지)
+        # 마스터 클라이언트 매니저와 룸 버스는 나중에 초기화됩니다 (순환 참조 방지)
         self.master_client_manager = None
+        self.room_bus: Optional[RoomBus] = None
+
+        # 방 참여자 수를 모아서 DB에 기록 (연결마다 DB를 쓰지 않음)
+        self.participant_writer = ParticipantCountWriter(self.listener_counts)
+        
+        # ping 전송과 응답 없는 연결 정리
+        self.heartbeat = HeartbeatMonitor(self.connections.values)
+        
+        # 속도 제한으로 버린 수신 메시지 수와 검증에 실패한 메시지 수 (모든 연결 합계)
+        self.rate_limited_count = 0
+        self.rejected_count = 0
+        # 사유별 강제 종료한 연결 수
+        self.evicted_counts: Dict[str, int] = {reason: 0 for reason in CLOSE_CODES}
     
     def set_master_client_manager(self, master_client_manager):
         """마스터 클라이언트 매니저 설정 (순환 참조 방지를 위해 별도 메서드)"""
         self.master_client_manager = master_client_manager
     
-    async def connect(self, websocket: WebSocket, room_id: Optional[str] = None):
-        """새 WebSocket 클라이언트 연결 처리"""
-        await websocket.accept()
+    def set_room_bus(self, room_bus: RoomBus):
+        """룸 버스 설정 - 명령은 방 소유 워커로, 프레임은 모든 워커의 소켓으로 전달"""
+        self.room_bus = room_bus
+        room_bus.set_handlers(
+            on_frame=self.deliver_to_room,
+            on_command=self._handle_bus_command,
+            on_presence=self._handle_presence,
+            on_disown=self._handle_disown,
+            on_handoff=self._handle_handoff,
+            on_adopt=self._handle_adopt
+        )
+    
+    async def connect(
+        self,
+        websocket: WebSocket,
+        room_id: Optional[str] = None,
+        wire_format: str = wire.JSON,
+        subprotocol: Optional[str] = None,
+        revision: Optional[int] = None
+    ) -> ClientConnection:
+        """
+        새 WebSocket 클라이언트 연결 처리 (연결의 송신 큐 반환)
+        
+        revision: 다시 접속한 클라이언트가 마지막으로 받은 리비전 - 지정하면 스냅샷 대신 놓친 이벤트만 받음
+        """
+        await websocket.accept(subprotocol=subprotocol)
         
         # 방 ID가 지정되지 않은 경우 기본 방 사용
         if not room_id:
             room_id = self.DEFAULT_ROOM
         
         # 방이 존재하지 않으면 생성
-        if room_id not in self.rooms:
-            self.rooms[room_id] = []
+        members = self.rooms.setdefault(room_id, {})
         
-        # 연결 추가
-        self.rooms[room_id].append(websocket)
-        self.socket_to_room[websocket] = room_id
+        # 연결 추가 (전용 송신 큐와 writer 태스크 생성)
+        connection = ClientConnection(websocket, room_id, wire_format, on_evict=self.evict)
+        connection.start()
+        self.connections[connection.connection_id] = connection
+        members[connection.connection_id] = connection
+        self._room_snapshots.pop(room_id, None)
         
-        # 마스터 클라이언트 확인/생성 및 현재 상태 전송
-        if self.master_client_manager:
-            master_client = await self.master_client_manager.get_or_create_master_client(room_id)
-            current_state = master_client.get_current_state()
-            
-            await self.send_personal_message(json.dumps({
-                "type": "master_sync",
-                "data": current_state,
-                "master_client_id": master_client.client_id,
-                "timestamp": current_state.get("last_update_time", 0)
-            }), websocket)
-    
-    def disconnect(self, websocket: WebSocket):
+        await self.room_bus.update_presence(room_id, len(members))
+        
+        # 방 소유 워커의 마스터 클라이언트에 현재 상태 요청 (없으면 생성)
+        if revision is None:
+            await self.dispatch_command(connection, {
+                "type": "snapshot_request",
+                "target": self.room_bus.target(connection.connection_id)
+            })
+        else:
+            await self.dispatch_command(connection, {
+                "type": "sync_request",
+                "revision": revision,
+                "reconnect": True,
+                "target": self.room_bus.target(connection.connection_id)
+            })
+        return connection
+    
+    def disconnect(self, connection: ClientConnection):
         """WebSocket 클라이언트 연결 해제 처리"""
-        if websocket in self.socket_to_room:
-            room_id = self.socket_to_room[websocket]
-            
-            if room_id in self.rooms and websocket in self.rooms[room_id]:
-                self.rooms[room_id].remove(websocket)
-                
-                # 방에 더 이상 연결이 없고, 기본 방이 아니면 방 정리 고려
-                if len(self.rooms[room_id]) == 0 and room_id != self.DEFAULT_ROOM:
-                    # 마스터 클라이언트도 정리 (일정 시간 후)
-                    if self.master_client_manager:
-                        # 비동기 작업이므로 백그라운드에서 처리
-                        import asyncio
-                        asyncio.create_task(self._cleanup_room_later(room_id))
-            
-            del self.socket_to_room[websocket]
+        if self.connections.pop(connection.connection_id, None) is None:
+            return
+        
+        room_id = connection.room_id
+        members = self.rooms.get(room_id)
+        if members is not None and members.pop(connection.connection_id, None) is not None:
+            self._room_snapshots.pop(room_id, None)
+            # 비동기 작업이므로 백그라운드에서 처리 (방이 비면 정리도 이어서 처리)
+            asyncio.create_task(self.room_bus.update_presence(room_id, len(members)))
+        
+        connection.close()
     
-    async def _cleanup_room_later(self, room_id: str):
-        """방 정리를 지연 실행 (클라이언트가 재연결할 수 있도록)"""
-        import asyncio
-        await asyncio.sleep(10)  # 10초 후 정리
-        
-        # 여전히 비어있으면 정리
-        if room_id in self.rooms and len(self.rooms[room_id]) == 0 and room_id != self.DEFAULT_ROOM:
-            del self.rooms[room_id]
-            if self.master_client_manager:
-                await self.master_client_manager.remove_master_client(room_id)
-    
-    async def broadcast_to_room(self, message: str, room_id: str):
-        """특정 방의 모든 연결된 클라이언트에 메시지 브로드캐스트"""
-        if room_id in self.rooms:
-            for connection in self.rooms[room_id]:
-                try:
-                    await connection.send_text(message)
-                except Exception:
-                    pass
-    
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        """특정 클라이언트에 메시지 전송"""
+    def evict(self, connection: ClientConnection, reason: str):
+        """
+        응답 없거나 따라오지 못하는 연결 강제 종료
+        
+        다음 브로드캐스트부터 제외되도록 바로 목록에서 제거하고, 소켓은 종료 코드와 함께 백그라운드에서 닫습니다.
+        """
+        print(f"연결 강제 종료 ({reason}, 방: {connection.room_id}, 연결: {connection.connection_id})")
+        self.evicted_counts[reason] += 1
+        self.disconnect(connection)
+        asyncio.create_task(self._close_socket(connection.websocket, CLOSE_CODES[reason], reason))
+    
+    async def _close_socket(self, websocket: WebSocket, code: int, reason: str):
+        """종료 프레임 전송 (이미 끊긴 소켓이면 무시, 전송이 멈춘 소켓을 기다리지 않도록 제한 시간 적용)"""
         try:
-            await websocket.send_text(message)
+            await asyncio.wait_for(websocket.close(code=code, reason=reason), settings.WS_SEND_TIMEOUT)
         except Exception:
             pass
     
-    # 마스터 클라이언트를 통한 상태 업데이트 메서드들
-    async def handle_play(self, room_id: str):
-        """재생 명령을 마스터 클라이언트에 전달"""
-        if self.master_client_manager:
-            master_client = await self.master_client_manager.get_or_create_master_client(room_id)
-            await master_client.handle_play()
+    def room_connections(self, room_id: str) -> Tuple[ClientConnection, ...]:
+        """
+        이 워커에 연결된 방 청취자 스냅샷
+        
+        순회하는 동안 접속/해제가 일어나도 안전한 불변 튜플이며,
+        방 구성이 바뀔 때만 새로 만들어 브로드캐스트마다 복사하지 않습니다.
+        """
+        snapshot = self._room_snapshots.get(room_id)
+        if snapshot is None:
+            members = self.rooms.get(room_id)
+            if not members:
+                return ()
+            snapshot = self._room_snapshots[room_id] = tuple(members.values())
+        return snapshot
     
-    async def handle_pause(self, room_id: str):
-        """일시정지 명령을 마스터 클라이언트에 전달"""
-        if self.master_client_manager:
-            master_client = await self.master_client_manager.get_or_create_master_client(room_id)
-            await master_client.handle_pause()
+    def allow_message(self, connection: ClientConnection, control: bool = False) -> bool:
+        """
+        연결별 토큰 버킷 확인 - 한도를 넘은 메시지는 버림
+        
+        control: 동기화용 메시지(pong, time_sync, sync_request)면 명령과 따로 두는 버킷에서 토큰을 씀
+        """
+        bucket = connection.control_bucket if control else connection.command_bucket
+        if bucket.allow():
+            return True
+        
+        if connection.rate_limited_count == 0:
+            print(f"메시지 속도 제한 (방: {connection.room_id}, 연결: {connection.connection_id})")
+        connection.rate_limited_count += 1
+        self.rate_limited_count += 1
+        return False
     
-    async def handle_seek(self, room_id: str, position: float):
-        """재생 위치 변경을 마스터 클라이언트에 전달"""
-        if self.master_client_manager:
-            master_client = await self.master_client_manager.get_or_create_master_client(room_id)
-            await master_client.handle_seek(position)
+    def reject_message(self, connection: ClientConnection, detail: str):
+        """잘못된 메시지 거부 - 연결은 유지하고 해당 클라이언트에만 오류 응답"""
+        self.rejected_count += 1
+        connection.enqueue_message({
+            "type": "error",
+            "error": "invalid_message",
+            "detail": detail
+        })
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """연결과 송신 큐, 속도 제한, 강제 종료 통계 (이 워커 기준)"""
+        connections = list(self.connections.values())
+        return {
+            "connections": len(connections),
+            "queued": sum(connection.queue_depth for connection in connections),
+            "merged_frames": sum(connection.merged_count for connection in connections),
+            "rate_limited": self.rate_limited_count,
+            "rejected": self.rejected_count,
+            "evicted": dict(self.evicted_counts),
+            "heartbeat": self.heartbeat.get_stats(),
+        }
     
-    async def handle_track_change(self, room_id: str, track_index: int):
-        """트랙 변경을 마스터 클라이언트에 전달"""
+    def listener_count(self, room_id: str) -> int:
+        """모든 워커를 합친 방 청취자 수"""
+        return self.room_bus.listener_count(room_id)
+
+    def listener_counts(self) -> Dict[str, int]:
+        """청취자가 있는 모든 방의 청취자 수 (모든 워커 합계)"""
+        return self.room_bus.listener_counts()
+    
+    async def _handle_presence(self, room_id: str, total: int):
+        """방 청취자 수 변경 - DB 기록 예약, 모든 워커에서 방이 비면 휴면 예약"""
+        self.participant_writer.mark(room_id, total)
+        if total == 0:
+            # 마스터 클라이언트도 정리 (일정 시간 후)
+            asyncio.create_task(self._cleanup_room_later(room_id))
+    
+    async def _cleanup_room_later(self, room_id: str):
+        """방 휴면을 지연 실행 (클라이언트가 재연결할 수 있도록)"""
+        await asyncio.sleep(settings.ROOM_IDLE_TIMEOUT)
+        
+        # 여전히 비어있으면 상태를 저장하고 메모리에서 내림 (기본 방 포함)
+        if self.listener_count(room_id) == 0:
+            if room_id != self.DEFAULT_ROOM and room_id in self.rooms and not self.rooms[room_id]:
+                del self.rooms[room_id]
+                self._room_snapshots.pop(room_id, None)
+            if self.master_client_manager and self.room_bus.is_owner(room_id):
+                await self.master_client_manager.hibernate_room(room_id)
+    
+    async def _handle_disown(self, room_id: str):
+        """다른 워커가 방의 소유자가 되면 이 워커의 마스터 클라이언트 중지"""
         if self.master_client_manager:
-            master_client = await self.master_client_manager.get_or_create_master_client(room_id)
-            await master_client.handle_track_change(track_index)
+            await self.master_client_manager.remove_master_client(room_id)
     
-    async def handle_add_track(self, room_id: str, track: Dict[str, Any]):
-        """트랙 추가를 마스터 클라이언트에 전달"""
+    async def _handle_handoff(self, room_id: str) -> Optional[Dict[str, Any]]:
+        """방을 다른 워커에 넘김 - 마스터 클라이언트를 멈추고 재생 상태 반환"""
         if self.master_client_manager:
-            master_client = await self.master_client_manager.get_or_create_master_client(room_id)
-            return await master_client.handle_add_track(track)
-        return False
+            return await self.master_client_manager.hand_off(room_id)
+        return None
     
-    async def handle_next_track(self, room_id: str):
-        """다음 트랙으로 이동을 마스터 클라이언트에 전달"""
+    async def _handle_adopt(self, room_id: str, state: Dict[str, Any]):
+        """다른 워커가 넘긴 재생 상태로 방의 마스터 클라이언트 시작"""
         if self.master_client_manager:
-            master_client = await self.master_client_manager.get_or_create_master_client(room_id)
-            await master_client.handle_next_track()
+            await self.master_client_manager.adopt(room_id, state)
     
-    async def handle_prev_track(self, room_id: str):
-        """이전 트랙으로 이동을 마스터 클라이언트에 전달"""
+    async def _handle_bus_command(self, room_id: str, command: Dict[str, Any]):
+        """방 소유 워커로 전달된 명령을 마스터 클라이언트에서 실행"""
         if self.master_client_manager:
-            master_client = await self.master_client_manager.get_or_create_master_client(room_id)
-            await master_client.handle_prev_track()
+            await self.master_client_manager.handle_command(room_id, command)
+    
+    async def broadcast_to_room(self, message: str, room_id: str, coalesce_key: Optional[str] = None):
+        """
+        특정 방의 모든 연결된 클라이언트에 메시지 브로드캐스트
+        
+        룸 버스를 통해 방 청취자가 있는 모든 워커로 전달됩니다.
+        coalesce_key가 같은 미전송 메시지는 최신 메시지로 병합됩니다.
+        """
+        await self.room_bus.publish(room_id, message, coalesce_key)
+    
+    async def send_to_target(self, message: str, room_id: str, target: Dict[str, str]):
+        """특정 워커의 특정 연결에 메시지 전송 (룸 버스 경유)"""
+        await self.room_bus.publish(room_id, message, target=target)
+    
+    async def deliver_to_room(
+        self,
+        room_id: str,
+        message: str,
+        coalesce_key: Optional[str] = None,
+        connection_id: Optional[str] = None
+    ):
+        """
+        이 워커에 연결된 소켓들에 메시지 전달
+        
+        각 연결의 송신 큐에 넣기만 하고 바로 반환합니다.
+        프레임은 JSON으로 만들어지며, 다른 형식을 쓰는 연결이 있으면 형식마다 한 번만 변환합니다.
+        """
+        if connection_id is not None:
+            connection = self.connections.get(connection_id)
+            if connection:
+                connection.enqueue(wire.transcode(message, connection.wire_format), coalesce_key)
+            return
+        
+        frames = {wire.JSON: message}
+        for connection in self.room_connections(room_id):
+            frame = frames.get(connection.wire_format)
+            if frame is None:
+                frame = frames[connection.wire_format] = wire.transcode(message, connection.wire_format)
+            connection.enqueue(frame, coalesce_key)
+    
+    async def send_personal_message(self, message: str, connection_id: str):
+        """이 워커의 특정 연결에 메시지 전송 (message는 JSON 문자열)"""
+        connection = self.connections.get(connection_id)
+        if connection:
+            connection.enqueue(wire.transcode(message, connection.wire_format))
+    
+    async def dispatch_command(self, connection: ClientConnection, command: Dict[str, Any]):
+        """
+        명령을 방의 마스터 클라이언트에 전달
+        
+        이 워커가 방 소유자면 연결에 저장해 둔 마스터 클라이언트로 바로 제출하고
+        (휴면 등으로 중지되었으면 다시 해석), 아니면 룸 버스로 소유 워커에 보냅니다.
+        """
+        room_id = connection.room_id
+        if not self.room_bus.is_owner(room_id) or self.master_client_manager is None:
+            await self.room_bus.send_command(room_id, command)
+            return
+        
+        master_client = connection.master_client
+        if master_client is None or not master_client.is_active:
+            master_client = await self.master_client_manager.get_or_create_master_client(
+                room_id, command["type"] in STATE_REQUESTS
+            )
+            connection.master_client = master_client
+        await master_client.commands.submit(command)
+    
+    async def handle_sync_request(self, connection: ClientConnection, revision: Optional[int] = None):
+        """클라이언트의 리비전이 현재와 다르면 (공백 발생) 놓친 이벤트나 전체 스냅샷을 해당 클라이언트에만 전송"""
+        await self.dispatch_command(connection, {
+            "type": "sync_request",
+            "revision": revision,
+            "target": self.room_bus.target(connection.connection_id)
+        })
+    
+    async def handle_time_sync(
+        self,
+        connection: ClientConnection,
+        t0: float,
+        drift: Optional[float],
+        received_at: float
+    ):
+        """
+        NTP 방식 시계 동기화 - 받은 시각(t1)과 보내는 시각(t2)을 바로 응답
+        
+        클라이언트는 보낸 시각(t0)과 받은 시각(t3)으로 왕복 시간과 서버 시계와의 차이를 계산합니다.
+        모든 워커가 같은 시계를 쓰므로 방 소유 워커를 거치지 않고 이 워커에서 응답합니다.
+        함께 보낸 재생 위치 오차(drift)가 허용 범위를 넘으면 마스터 클라이언트에 알려 동기화 주기를 줄입니다.
+        """
+        connection.enqueue_message({
+            "type": "time_sync",
+            "t0": t0,
+            "t1": received_at,
+            "t2": time.time()
+        })
+        
+        if drift is not None and abs(drift) > settings.SYNC_DRIFT_TOLERANCE:
+            await self.dispatch_command(connection, {"type": "drift_report", "drift": drift})
     
-    # 모든 deprecated 메서드들 제거 - 마스터 클라이언트만 사용 
\ No newline at end of file
+    # 모든 deprecated 메서드들 제거 - 마스터 클라이언트만 사용
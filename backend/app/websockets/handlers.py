@@ -0,0 +1,80 @@
+from typing import Any, Awaitable, Callable, Dict, Set
+
+from . import manager
+from .client_connection import ClientConnection
+from ..schemas import ws as schemas
+
+# handler(connection, message, received_at): 검증된 클라이언트 메시지 처리
+MessageHandler = Callable[[ClientConnection, Any, float], Awaitable[None]]
+
+# 메시지 타입 -> 처리 함수
+MESSAGE_HANDLERS: Dict[str, MessageHandler] = {}
+
+# 방 상태를 바꾸지 않는 동기화용 메시지 타입 (명령과 다른 토큰 버킷으로 제한)
+CONTROL_MESSAGES: Set[str] = set()
+
+def message_handler(message_type: str, control: bool = False):
+    """메시지 타입별 처리 함수 등록 (control=True면 명령 속도 제한 대신 동기화용 제한 적용)"""
+    def register(handler: MessageHandler) -> MessageHandler:
+        MESSAGE_HANDLERS[message_type] = handler
+        if control:
+            CONTROL_MESSAGES.add(message_type)
+        return handler
+    return register
+
+@message_handler("play")
+async def handle_play(connection: ClientConnection, message: schemas.PlayMessage, received_at: float):
+    await manager.dispatch_command(connection, {"type": "play"})
+
+@message_handler("pause")
+async def handle_pause(connection: ClientConnection, message: schemas.PauseMessage, received_at: float):
+    await manager.dispatch_command(connection, {"type": "pause"})
+
+@message_handler("seek")
+async def handle_seek(connection: ClientConnection, message: schemas.SeekMessage, received_at: float):
+    if message.position is not None:
+        await manager.dispatch_command(connection, {"type": "seek", "position": message.position})
+    if message.current_track is not None:
+        # 트랙 변경 처리
+        await manager.dispatch_command(connection, {"type": "track_change", "track_index": message.current_track})
+
+@message_handler("add_track")
+async def handle_add_track(connection: ClientConnection, message: schemas.AddTrackMessage, received_at: float):
+    await manager.dispatch_command(connection, {"type": "add_track", "track": message.track.model_dump(exclude_none=True)})
+
+@message_handler("insert_next")
+async def handle_insert_next(connection: ClientConnection, message: schemas.InsertNextMessage, received_at: float):
+    # 현재 트랙 다음에 트랙 추가
+    await manager.dispatch_command(connection, {"type": "insert_next", "track": message.track.model_dump(exclude_none=True)})
+
+@message_handler("remove_track")
+async def handle_remove_track(connection: ClientConnection, message: schemas.RemoveTrackMessage, received_at: float):
+    await manager.dispatch_command(connection, {"type": "remove_track", "track_id": message.track_id})
+
+@message_handler("move_track")
+async def handle_move_track(connection: ClientConnection, message: schemas.MoveTrackMessage, received_at: float):
+    await manager.dispatch_command(connection, {"type": "move_track", "track_id": message.track_id, "to": message.to})
+
+@message_handler("next_track")
+async def handle_next_track(connection: ClientConnection, message: schemas.NextTrackMessage, received_at: float):
+    # revision: 클라이언트가 알고 있던 리비전 (그 뒤에 트랙이 바뀌었으면 무시)
+    await manager.dispatch_command(connection, {"type": "next_track", "revision": message.revision})
+
+@message_handler("prev_track")
+async def handle_prev_track(connection: ClientConnection, message: schemas.PrevTrackMessage, received_at: float):
+    await manager.dispatch_command(connection, {"type": "prev_track", "revision": message.revision})
+
+@message_handler("sync_request", control=True)
+async def handle_sync_request(connection: ClientConnection, message: schemas.SyncRequestMessage, received_at: float):
+    # 클라이언트가 리비전 공백을 감지하면 스냅샷 요청
+    await manager.handle_sync_request(connection, message.revision)
+
+@message_handler("time_sync", control=True)
+async def handle_time_sync(connection: ClientConnection, message: schemas.TimeSyncMessage, received_at: float):
+    # 시계 동기화 핑 - 서버 수신/송신 시각으로 바로 응답
+    await manager.handle_time_sync(connection, message.t0, message.drift, received_at)
+
+@message_handler("pong", control=True)
+async def handle_pong(connection: ClientConnection, message: schemas.PongMessage, received_at: float):
+    # 하트비트 응답 - 수신 시각(last_seen)은 이미 갱신됨
+    pass
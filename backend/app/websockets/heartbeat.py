@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from backend.config import settings
+from .client_connection import ClientConnection
+from ..services import wire_format as wire
+
+
+class HeartbeatMonitor:
+    """
+    연결 하트비트와 유령 연결 정리
+
+    interval초마다 이 워커의 연결을 한 번씩 훑어서
+    - interval초 넘게 받은 메시지가 없으면 ping을 보내고 (클라이언트는 pong으로 응답)
+    - idle_timeout초 넘게 아무것도 받지 못했으면 연결을 종료하고
+    - 메시지 하나의 전송이 send_timeout초 넘게 끝나지 않으면 연결을 종료합니다.
+    연결마다 타이머를 두지 않고 워커당 태스크 하나로 처리합니다.
+    """
+
+    def __init__(
+        self,
+        connections: Callable[[], Iterable[ClientConnection]],
+        interval: float = settings.WS_HEARTBEAT_INTERVAL,
+        idle_timeout: float = settings.WS_IDLE_TIMEOUT,
+        send_timeout: float = settings.WS_SEND_TIMEOUT
+    ):
+        # 이 워커의 모든 연결을 돌려주는 함수
+        self._connections = connections
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.send_timeout = send_timeout
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.sweeps = 0
+        self.pings = 0
+
+    def start(self):
+        """주기적 확인 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기적 확인 중지"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"하트비트 확인 오류: {e}")
+
+    def sweep(self):
+        """연결을 한 번 훑어서 ping 전송 및 응답 없는 연결 종료"""
+        now = time.time()
+        mono = time.monotonic()
+        # ping 프레임은 형식마다 한 번만 만듦
+        frames: Dict[str, wire.Payload] = {}
+
+        # 순회 중에 종료되는 연결이 있으므로 목록을 복사해서 순회
+        for connection in tuple(self._connections()):
+            if connection.send_started is not None and mono - connection.send_started > self.send_timeout:
+                connection.evict("send_timeout")
+                continue
+
+            quiet = now - connection.last_seen
+            if quiet > self.idle_timeout:
+                connection.evict("idle_timeout")
+            elif quiet >= self.interval:
+                frame = frames.get(connection.wire_format)
+                if frame is None:
+                    frame = frames[connection.wire_format] = wire.encode(
+                        {"type": "ping", "timestamp": now}, connection.wire_format
+                    )
+                # 아직 보내지 못한 이전 ping은 새 ping으로 대체
+                connection.enqueue(frame, "ping")
+                self.pings += 1
+
+        self.sweeps += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """하트비트 통계"""
+        return {
+            "sweeps": self.sweeps,
+            "pings": self.pings,
+        }
@@ -0,0 +1,29 @@
+import time
+
+from backend.config import settings
+
+
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한
+
+    초당 rate개씩 토큰이 차고 최대 burst개까지 모입니다.
+    메시지마다 토큰 하나를 쓰며, 토큰이 없으면 그 메시지는 거부됩니다.
+    """
+
+    def __init__(self, rate: float = settings.WS_COMMAND_RATE, burst: int = settings.WS_COMMAND_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def allow(self) -> bool:
+        """토큰이 있으면 하나 쓰고 True, 없으면 False"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
@@ -1,79 +1,110 @@
-from fastapi import WebSocket, WebSocketDisconnect, Depends, Query
-import json
-from typing import Dict, Any, Optional
-from sqlalchemy.orm import Session
+from fastapi import WebSocket, WebSocketDisconnect, Query
+from pydantic import ValidationError
+import time
+from typing import Optional, Union
 
+from backend.config import settings
 from . import router, manager
-from ..db import get_db
-from ..services.room_service import RoomService
+from .handlers import CONTROL_MESSAGES, MESSAGE_HANDLERS
+from ..schemas.ws import parse_client_message, parse_client_object
+from ..services import wire_format as wire
+
+async def _receive_frame(websocket: WebSocket) -> Union[str, bytes]:
+    """텍스트 또는 바이너리 프레임 하나 수신 (연결이 끊기면 WebSocketDisconnect)"""
+    frame = await websocket.receive()
+    if frame["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", 1000))
+    text = frame.get("text")
+    return text if text is not None else frame.get("bytes", b"")
 
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket, 
-    room_id: Optional[str] = Query(None)
+    room_id: Optional[str] = Query(None),
+    requested_format: Optional[str] = Query(None, alias="format", description="전송 형식 (json, msgpack)"),
+    revision: Optional[int] = Query(None, description="다시 접속할 때 마지막으로 받은 리비전")
 ):
     """
     WebSocket 연결 엔드포인트
     클라이언트와의 양방향 통신을 처리
-    """
-    # 연결 수락
-    await manager.connect(websocket, room_id)
     
-    # 방 ID 설정 (없으면 기본 방)
-    current_room_id = room_id if room_id else manager.DEFAULT_ROOM
+    메시지는 타입별 검증 모델로 파싱한 뒤 등록된 처리 함수로 전달합니다.
+    잘못된 메시지는 그 메시지만 거부하고 연결은 유지합니다.
+    
+    전송 형식은 ?format=msgpack 또는 서브프로토콜(openjukebox.msgpack)로 고를 수 있으며 기본은 JSON입니다.
+    지원하지 않는 서브프로토콜만 제안한 연결은 수락하지 않습니다.
+    클라이언트는 형식과 상관없이 JSON 텍스트나 msgpack 바이너리 프레임으로 메시지를 보낼 수 있습니다.
+    
+    다시 접속하는 클라이언트가 ?revision=N을 보내면 스냅샷 대신 N 이후의 이벤트만 재전송합니다.
+    """
+    # 전송 형식 협상 후 연결 수락 (방 ID가 없으면 기본 방)
+    wire_format, subprotocol = wire.negotiate(requested_format, websocket.scope.get("subprotocols", []))
+    if wire_format is None:
+        # 제안한 서브프로토콜을 하나도 지원하지 않음 - 서브프로토콜 없이 수락하면 브라우저가 실패로 처리하므로 거부
+        await websocket.close(code=1008)
+        return
+    connection = await manager.connect(websocket, room_id, wire_format, subprotocol, revision)
     
     try:
         while True:
             # 클라이언트로부터 메시지 수신
-            data = await websocket.receive_text()
-            message = json.loads(data)
-            
-            # 메시지 타입에 따라 마스터 클라이언트를 통해 처리
-            if message["type"] == "play":
-                # 재생 명령
-                await manager.handle_play(current_room_id)
-            
-            elif message["type"] == "pause":
-                # 일시정지 명령
-                await manager.handle_pause(current_room_id)
+            data = await _receive_frame(websocket)
+            received_at = time.time()
+            connection.last_seen = received_at
             
-            elif message["type"] == "seek":
-                # 재생 위치 변경 명령
-                if "position" in message:
-                    await manager.handle_seek(current_room_id, float(message["position"]))
-                
-                if "current_track" in message:
-                    # 트랙 변경 처리
-                    await manager.handle_track_change(current_room_id, message["current_track"])
+            # 거부되는 메시지는 명령 버킷에서 토큰을 씀 (잘못된 메시지를 쏟아내도 제한되도록)
+            if len(data) > settings.WS_MAX_MESSAGE_SIZE:
+                if manager.allow_message(connection):
+                    manager.reject_message(connection, f"메시지가 너무 깁니다 (최대 {settings.WS_MAX_MESSAGE_SIZE}자)")
+                continue
+            try:
+                if isinstance(data, bytes):
+                    message = parse_client_object(wire.decode_binary(data))
+                else:
+                    message = parse_client_message(data)
+            except ValidationError as e:
+                if manager.allow_message(connection):
+                    error = e.errors()[0]
+                    location = ".".join(str(part) for part in error["loc"])
+                    manager.reject_message(connection, f"{location}: {error['msg']}" if location else error["msg"])
+                continue
+            except Exception as e:
+                # 바이너리 프레임 역직렬화 실패
+                if manager.allow_message(connection):
+                    manager.reject_message(connection, f"잘못된 바이너리 메시지 ({type(e).__name__})")
+                continue
             
-            elif message["type"] == "add_track":
-                # 트랙 추가 명령
-                if "track" in message:
-                    await manager.handle_add_track(current_room_id, message["track"])
+            # 연결별 속도 제한 - 명령은 명령 버킷, 동기화용 메시지는 따로 둔 버킷 (한도를 넘은 메시지는 처리하지 않음)
+            if not manager.allow_message(connection, message.type in CONTROL_MESSAGES):
+                continue
             
-            elif message["type"] == "next_track":
-                # 다음 트랙으로 이동
-                await manager.handle_next_track(current_room_id)
-            
-            elif message["type"] == "prev_track":
-                # 이전 트랙으로 이동
-                await manager.handle_prev_track(current_room_id)
-            
-            elif message["type"] == "sync_request":
-                # 클라이언트가 동기화 요청 - 마스터 클라이언트가 자동으로 처리하므로 무시
-                pass
-            
-            else:
-                # 알 수 없는 메시지 타입 - 로깅만 하고 무시
-                pass
+            try:
+                await MESSAGE_HANDLERS[message.type](connection, message, received_at)
+            except Exception as e:
+                print(f"메시지 처리 오류 ({message.type}): {e}")
     
     except WebSocketDisconnect:
         # 클라이언트 연결 종료
-        manager.disconnect(websocket)
+        manager.disconnect(connection)
     except Exception as e:
         # 오류 처리
         print(f"WebSocket 오류: {e}")
-        manager.disconnect(websocket)
+        manager.disconnect(connection)
+
+
+@router.get("/ws/stats")
+async def websocket_stats():
+    """이 워커의 연결, 속도 제한, 명령 병합 통계"""
+    return {
+        "connections": manager.get_stats(),
+        "rooms": manager.master_client_manager.get_stats(),
+    }
+
+
+@router.get("/ws/rooms/{room_id}/connections")
+async def websocket_room_connections(room_id: str):
+    """이 워커에 연결된 방 청취자 목록 (접속 시각, 전송 형식, 마지막 수신 시각, 송신 큐 길이 등)"""
+    return [connection.describe() for connection in manager.room_connections(room_id)]
 
 
 # 웹소켓 연결/종료 시 참여자 수 업데이트 처리
@@ -0,0 +1,99 @@
+"""
+큰 방에서 대량 재접속(접속 해제 후 다시 접속) 비용 측정
+
+가짜 WebSocket으로 한 방에 N명을 접속시킨 뒤 무작위 순서로 모두 해제하고, 브로드캐스트를 섞어
+다시 접속시킵니다. 비교용으로 이전 방식(방별 리스트에서 `in`/`remove`)의 해제 시간도 측정합니다.
+
+사용법 (저장소 루트에서):
+    python backend/benchmarks/connection_churn.py --sizes 1000 5000 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.bus.memory import InMemoryRoomBus
+from backend.app.websockets.connection_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """전송을 버리는 WebSocket"""
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        pass
+
+    async def send_bytes(self, data):
+        pass
+
+
+async def run(size: int, broadcast_every: int):
+    random.seed(size)
+    manager = ConnectionManager()
+    manager.set_room_bus(InMemoryRoomBus())
+
+    start = time.perf_counter()
+    connections = [await manager.connect(FakeWebSocket(), "big") for _ in range(size)]
+    connect_seconds = time.perf_counter() - start
+
+    # 네트워크 끊김 - 무작위 순서로 모두 해제
+    random.shuffle(connections)
+    start = time.perf_counter()
+    for connection in connections:
+        manager.disconnect(connection)
+    disconnect_seconds = time.perf_counter() - start
+    await asyncio.sleep(0)
+
+    # 재접속하면서 broadcast_every번마다 브로드캐스트 (방 구성이 바뀐 뒤 첫 브로드캐스트만 스냅샷을 다시 만듦)
+    broadcasts = 0
+    fanout_seconds = 0.0
+    start = time.perf_counter()
+    for i in range(size):
+        await manager.connect(FakeWebSocket(), "big")
+        if i % broadcast_every == 0:
+            fanout_start = time.perf_counter()
+            await manager.deliver_to_room("big", '{"type":"sync_tick"}', "sync_tick")
+            fanout_seconds += time.perf_counter() - fanout_start
+            broadcasts += 1
+    reconnect_seconds = time.perf_counter() - start - fanout_seconds
+    assert len(manager.rooms["big"]) == size
+
+    # 이전 방식: 방별 리스트에서 선형 탐색 후 제거
+    legacy_room = list(range(size))
+    order = list(range(size))
+    random.shuffle(order)
+    start = time.perf_counter()
+    for item in order:
+        if item in legacy_room:
+            legacy_room.remove(item)
+    legacy_seconds = time.perf_counter() - start
+
+    for connection in list(manager.connections.values()):
+        manager.disconnect(connection)
+    await asyncio.sleep(0)
+
+    print(
+        f"{size:>7} | 접속 {connect_seconds / size * 1e6:7.1f} us/conn | "
+        f"전체 해제 {disconnect_seconds * 1e3:7.1f} ms (이전 리스트 {legacy_seconds * 1e3:7.1f} ms) | "
+        f"재접속 {reconnect_seconds / size * 1e6:6.1f} us/conn | "
+        f"브로드캐스트 {fanout_seconds / broadcasts * 1e3:6.2f} ms x {broadcasts}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대량 재접속 비용 측정")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000], help="방 청취자 수")
+    parser.add_argument("--broadcast-every", type=int, default=100, help="접속/해제 N번마다 브로드캐스트")
+    args = parser.parse_args()
+    for size in args.sizes:
+        asyncio.run(run(size, args.broadcast_every))
+
+
+if __name__ == "__main__":
+    main()
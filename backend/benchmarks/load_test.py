@@ -0,0 +1,677 @@
+"""
+방 N개 × 청취자 M명 WebSocket 부하 테스트
+
+uvicorn 서버 프로세스를 localhost에 띄우고, 클라이언트 프로세스에서 실제 WebSocket 연결을
+`/ws?room_id=` 로 열어 방마다 청취자 M명을 붙입니다. 방마다 청취자 한 명이 실제 사용과 비슷한 비율로
+명령(add_track, seek, play/pause, next_track)을 보내고, 모든 청취자가 받은 프레임으로 다음을 측정합니다.
+
+- 연결 속도: 청취자 연결 수 / 연결에 걸린 시간, 핸드셰이크 시간 분위수
+- 브로드캐스트 지연: 명령을 보낸 시점부터 각 청취자가 그 이벤트(state_update, playlist_delta)를 받을 때까지
+- 동기화 오차: 마지막으로 받은 상태에서 로컬로 외삽한 위치와 sync_tick 위치의 차이
+- 초당 수신 메시지 수와 바이트
+- 1000 연결당 서버 RSS 증가량 (방만 만들어진 상태 대비)
+
+서버의 PostgreSQL과 YouTube API는 고정 지연을 주는 로컬 대역으로 바꿔서 실행합니다 (외부 연결 없음).
+`--url`을 주면 이미 실행 중인 서버에 연결하고 (대역 없음), `--server-pid`를 주면 그 프로세스의 RSS를 잽니다.
+클라이언트도 같은 머신에서 실행되므로 코어가 적으면 `--client-processes`로 나눠도 클라이언트 처리 시간이 지연에 섞입니다.
+
+사용법 (저장소 루트에서):
+    python backend/benchmarks/load_test.py --rooms 100 --listeners 50 --duration 30
+    python backend/benchmarks/load_test.py --rooms 200 --listeners 50 --budget-p99 250 --json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import socket
+import sys
+import time
+import urllib.request
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# 리비전을 올리는 이벤트 (명령에 대한 응답)
+EVENT_TYPES = ("state_update", "playlist_delta")
+
+DEFAULT_MIX = "add_track=2,seek=4,play_pause=2,next_track=2"
+COMMAND_KINDS = ("add_track", "seek", "play_pause", "next_track")
+
+TRACK_SECONDS = 210
+
+
+# ---------------------------------------------------------------------------
+# 서버 (PostgreSQL, YouTube 대역)
+# ---------------------------------------------------------------------------
+
+class StandInTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class StandInDatabase:
+    """
+    PostgreSQL 대역 - 쿼리마다 고정 지연 후 빈 결과
+
+    방 상태 불러오기는 항상 저장된 상태가 없는 것으로, 저장과 참여자 수 기록은 성공한 것으로 처리합니다.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.is_connected = False
+        self.queries = 0
+
+    async def _round_trip(self):
+        self.queries += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    async def fetch_one(self, query, values=None):
+        await self._round_trip()
+        return None
+
+    async def fetch_all(self, query, values=None):
+        await self._round_trip()
+        return []
+
+    async def fetch_val(self, query, values=None, column=0):
+        await self._round_trip()
+        return 0
+
+    async def execute(self, query, values=None):
+        await self._round_trip()
+        return None
+
+    def transaction(self):
+        return StandInTransaction()
+
+
+def install_stand_ins(db_latency: float, youtube_latency: float):
+    """서버 모듈의 DB와 YouTube 클라이언트를 대역으로 교체 (backend.main import 후 호출)"""
+    import backend.main
+    from backend.app import init_db
+    from backend.app.services import room_service, room_state_store
+    from backend.app.services.youtube import youtube_service
+
+    database = StandInDatabase(db_latency)
+    room_service.database = database
+    room_state_store.database = database
+    init_db.database = database
+
+    # 시작 시 테이블 생성(create_all)은 건너뜀
+    async def start_database():
+        await database.connect()
+
+    backend.main.init_db = start_database
+    backend.main.close_db = database.disconnect
+
+    async def get_video_details(video_id: str) -> Optional[Dict[str, Any]]:
+        await asyncio.sleep(youtube_latency)
+        return {"id": video_id, "duration": f"PT{TRACK_SECONDS}S", "durationSeconds": TRACK_SECONDS}
+
+    youtube_service.get_video_details = get_video_details
+
+
+def serve(port: int, db_latency: float, youtube_latency: float):
+    """대역을 설치하고 uvicorn 실행 (서버 프로세스, 출력은 버림)"""
+    sys.stdout = open(os.devnull, "w")
+    import uvicorn
+    import backend.main
+
+    install_stand_ins(db_latency, youtube_latency)
+    uvicorn.run(backend.main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(host: str, port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"서버가 {timeout:.0f}초 안에 시작되지 않았습니다 ({host}:{port})")
+            await asyncio.sleep(0.2)
+
+
+def read_rss(pid: Optional[int]) -> Optional[int]:
+    """프로세스 RSS (바이트, Linux /proc 기준 - 읽을 수 없으면 None)"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def fetch_server_stats(http_url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with urllib.request.urlopen(f"{http_url}/ws/stats", timeout=10) as response:
+            return json.loads(response.read())
+    except Exception:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# 클라이언트
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    """클라이언트 프로세스 하나의 측정값"""
+
+    def __init__(self):
+        self.reset()
+        self.closed: Counter = Counter()
+
+    def reset(self):
+        self.frames: Counter = Counter()
+        self.bytes = 0
+        self.latencies: List[float] = []
+        self.drifts: List[float] = []
+        self.commands: Counter = Counter()
+        self.no_event = 0
+
+
+class RoomLoad:
+    """
+    방 하나의 부하 상태
+
+    명령은 방마다 한 번에 하나씩 보내고 (응답 이벤트를 받거나 시간이 지나면 다음 명령),
+    보낸 뒤 처음 받은 새 리비전을 그 명령의 결과로 보고 보낸 시각을 기록해 둡니다.
+    """
+
+    def __init__(self, room_id: str):
+        self.room_id = room_id
+        self.revision = 0
+        self.playing = False
+        self.tracks = 0
+        # 응답을 기다리는 명령을 보낸 시각
+        self.pending: Optional[float] = None
+        # 리비전 -> 그 이벤트를 일으킨 명령을 보낸 시각
+        self.sent_at: Dict[int, float] = {}
+        self.changed = asyncio.Event()
+
+    def on_event(self, revision: int, now: float) -> Optional[float]:
+        """이벤트 수신 - 명령을 보낸 뒤 걸린 시간 (명령으로 생긴 이벤트가 아니면 None)"""
+        if revision > self.revision:
+            self.revision = revision
+            if self.pending is not None:
+                self.sent_at[revision] = self.pending
+                self.pending = None
+                self.sent_at.pop(revision - 64, None)
+            self.changed.set()
+        sent = self.sent_at.get(revision)
+        return None if sent is None else now - sent
+
+    def make_track(self) -> Dict[str, Any]:
+        self.tracks += 1
+        # 재생 시간은 서버가 동영상 정보 조회(YouTube 대역)로 채움
+        return {
+            "id": f"{self.room_id}-{self.tracks}",
+            "title": f"Load test track {self.tracks}",
+            "thumbnail": "",
+            "channel": "Load test",
+            "publishedAt": "",
+        }
+
+    def make_command(self, kind: str) -> Dict[str, Any]:
+        if kind == "add_track":
+            return {"type": "add_track", "track": self.make_track()}
+        if kind == "seek":
+            return {"type": "seek", "position": round(random.uniform(0, TRACK_SECONDS - 10), 1)}
+        if kind == "play_pause":
+            return {"type": "pause" if self.playing else "play"}
+        return {"type": "next_track", "revision": self.revision}
+
+
+class Listener:
+    """청취자 연결 하나 - 받은 프레임으로 지연과 동기화 오차 기록"""
+
+    def __init__(self, websocket, room: RoomLoad, recorder: Recorder):
+        self.websocket = websocket
+        self.room = room
+        self.recorder = recorder
+        # 마지막으로 받은 재생 상태 (위치, 재생 여부, 받은 시각, 리비전)
+        self.anchor = None
+
+    async def run(self, loads):
+        recorder = self.recorder
+        try:
+            async for frame in self.websocket:
+                now = time.perf_counter()
+                message = loads(frame)
+                kind = message.get("type")
+                recorder.frames[kind] += 1
+                recorder.bytes += len(frame)
+
+                if kind == "ping":
+                    await self.websocket.send('{"type":"pong"}')
+                    continue
+
+                data = message.get("data") or {}
+                revision = data.get("revision")
+                if kind in EVENT_TYPES and revision is not None:
+                    latency = self.room.on_event(revision, now)
+                    if latency is not None:
+                        recorder.latencies.append(latency)
+
+                if kind == "sync_tick" and self.anchor is not None:
+                    position, playing, anchored_at, anchor_revision = self.anchor
+                    if playing and data.get("playing") and anchor_revision == revision:
+                        predicted = position + (now - anchored_at)
+                        recorder.drifts.append(abs(predicted - data["position"]))
+
+                if "position" in data:
+                    self.anchor = (data["position"], data.get("playing"), now, revision)
+                    if kind != "sync_tick":
+                        self.room.playing = bool(data.get("playing"))
+                elif self.anchor is not None and revision is not None:
+                    # 플레이리스트 변경은 위치를 바꾸지 않음 - 리비전만 따라감
+                    self.anchor = self.anchor[:3] + (revision,)
+        except Exception:
+            pass
+        code = self.websocket.close_code
+        recorder.closed[code if code is not None else "error"] += 1
+
+
+async def request(room: RoomLoad, websocket, command: Dict[str, Any], timeout: float, dumps) -> bool:
+    """명령을 보내고 그로 인한 이벤트를 기다림 (timeout 안에 이벤트가 없으면 False)"""
+    room.changed.clear()
+    room.pending = time.perf_counter()
+    await websocket.send(dumps(command))
+    try:
+        await asyncio.wait_for(room.changed.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        room.pending = None
+        return False
+
+
+async def drive(room: RoomLoad, websocket, recorder: Recorder, mix, interval: float, timeout: float, dumps):
+    """방 명령 부하 - 평균 interval초 간격(지수 분포)으로 명령 전송"""
+    kinds, weights = zip(*mix.items())
+    while True:
+        await asyncio.sleep(random.expovariate(1 / interval))
+        command = room.make_command(random.choices(kinds, weights)[0])
+        recorder.commands[command["type"]] += 1
+        if not await request(room, websocket, command, timeout, dumps):
+            recorder.no_event += 1
+
+
+async def _client(index: int, pipe, url: str, room_ids: List[str], options: Dict[str, Any]):
+    import websockets
+    from backend.app.services import json_codec
+
+    loop = asyncio.get_running_loop()
+
+    async def receive():
+        return await loop.run_in_executor(None, pipe.recv)
+
+    def open_connection(room_id: str):
+        return websockets.connect(
+            f"{url}?room_id={room_id}",
+            max_size=None,
+            ping_interval=None,
+            open_timeout=options["connect_timeout"],
+            compression="deflate" if options["compression"] else None,
+        )
+
+    recorder = Recorder()
+    rooms = [RoomLoad(room_id) for room_id in room_ids]
+    listeners: List[Listener] = []
+    tasks: List[asyncio.Task] = []
+
+    def attach(websocket, room: RoomLoad):
+        listener = Listener(websocket, room, recorder)
+        listeners.append(listener)
+        tasks.append(asyncio.create_task(listener.run(json_codec.loads)))
+        return listener
+
+    # 방마다 명령을 보낼 청취자를 먼저 연결하고 트랙을 채워 재생
+    drivers = []
+    for room in rooms:
+        websocket = await open_connection(room.room_id)
+        drivers.append(attach(websocket, room))
+        for _ in range(options["tracks"]):
+            await request(room, websocket, room.make_command("add_track"), options["event_timeout"], json_codec.dumps)
+        await request(room, websocket, {"type": "play"}, options["event_timeout"], json_codec.dumps)
+    pipe.send("seeded")
+
+    # 나머지 청취자 연결 (동시에 connect_concurrency개까지)
+    await receive()
+    semaphore = asyncio.Semaphore(options["connect_concurrency"])
+    handshakes: List[float] = []
+    failures = Counter()
+
+    async def connect_listener(room: RoomLoad):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                websocket = await open_connection(room.room_id)
+            except Exception as e:
+                failures[type(e).__name__] += 1
+                return
+            handshakes.append(time.perf_counter() - started)
+            attach(websocket, room)
+
+    connect_started = time.time()
+    await asyncio.gather(*(
+        connect_listener(room) for _ in range(options["listeners"] - 1) for room in rooms
+    ))
+    connect_finished = time.time()
+    pipe.send({
+        "handshakes": handshakes,
+        "failures": dict(failures),
+        "started": connect_started,
+        "finished": connect_finished,
+    })
+
+    # 측정 구간 - 연결 직후의 스냅샷 수신은 제외
+    await receive()
+    recorder.reset()
+    measure_started = time.perf_counter()
+    drivers_tasks = [
+        asyncio.create_task(drive(
+            listener.room, listener.websocket, recorder, options["mix"],
+            options["command_interval"], options["event_timeout"], json_codec.dumps
+        ))
+        for listener in drivers
+    ]
+    await asyncio.sleep(options["duration"])
+    for task in drivers_tasks:
+        task.cancel()
+    elapsed = time.perf_counter() - measure_started
+
+    pipe.send({
+        "elapsed": elapsed,
+        "frames": dict(recorder.frames),
+        "bytes": recorder.bytes,
+        "latencies": recorder.latencies,
+        "drifts": recorder.drifts,
+        "commands": dict(recorder.commands),
+        "no_event": recorder.no_event,
+        "closed": {str(code): count for code, count in recorder.closed.items()},
+    })
+
+    await receive()
+    await asyncio.gather(*(listener.websocket.close() for listener in listeners), return_exceptions=True)
+    for task in tasks:
+        task.cancel()
+
+
+def client_main(index: int, pipe, url: str, room_ids: List[str], options: Dict[str, Any]):
+    raise_fd_limit()
+    asyncio.run(_client(index, pipe, url, room_ids, options))
+
+
+def raise_fd_limit():
+    """연결 수만큼 파일 디스크립터를 쓸 수 있도록 soft limit을 hard limit까지 올림"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+# ---------------------------------------------------------------------------
+# 실행과 집계
+# ---------------------------------------------------------------------------
+
+def percentiles(samples: List[float], scale: float = 1000.0) -> Dict[str, Optional[float]]:
+    """p50/p90/p99/max (기본 밀리초 단위, 표본이 없으면 None)"""
+    if not samples:
+        return {"p50": None, "p90": None, "p99": None, "max": None, "n": 0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * scale
+
+    return {"p50": pick(0.50), "p90": pick(0.90), "p99": pick(0.99), "max": ordered[-1] * scale, "n": len(ordered)}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in COMMAND_KINDS:
+            raise argparse.ArgumentTypeError(f"알 수 없는 명령: {kind} (가능: {', '.join(COMMAND_KINDS)})")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+async def run(args) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context("spawn")
+
+    server = None
+    server_pid = args.server_pid
+    if args.url:
+        url = args.url
+    else:
+        port = free_port()
+        url = f"ws://127.0.0.1:{port}/ws"
+        server = context.Process(
+            target=serve, args=(port, args.db_latency / 1000, args.youtube_latency / 1000), daemon=True
+        )
+        server.start()
+        server_pid = server.pid
+        await wait_for_server("127.0.0.1", port)
+    http_url = "http" + url[2:].rsplit("/ws", 1)[0]
+
+    run_id = f"{random.getrandbits(32):08x}"
+    room_ids = [f"load-{run_id}-{i}" for i in range(args.rooms)]
+    options = {
+        "listeners": args.listeners,
+        "tracks": args.tracks,
+        "mix": args.mix,
+        "command_interval": args.command_interval,
+        "event_timeout": args.event_timeout,
+        "connect_concurrency": args.connect_concurrency,
+        "connect_timeout": args.connect_timeout,
+        "compression": args.compression,
+        "duration": args.duration,
+    }
+
+    processes_count = max(1, min(args.client_processes, args.rooms))
+    pipes, processes = [], []
+    for index in range(processes_count):
+        parent, child = context.Pipe()
+        process = context.Process(
+            target=client_main, args=(index, child, url, room_ids[index::processes_count], options), daemon=True
+        )
+        process.start()
+        pipes.append(parent)
+        processes.append(process)
+
+    async def gather():
+        return await asyncio.gather(*(loop.run_in_executor(None, pipe.recv) for pipe in pipes))
+
+    def broadcast(message):
+        for pipe in pipes:
+            pipe.send(message)
+
+    try:
+        await gather()
+        rss_rooms = read_rss(server_pid)
+
+        broadcast("connect")
+        connects = await gather()
+        rss_connected = read_rss(server_pid)
+
+        broadcast("go")
+        results = await gather()
+        rss_after = read_rss(server_pid)
+        server_stats = await loop.run_in_executor(None, fetch_server_stats, http_url)
+
+        broadcast("stop")
+        for process in processes:
+            process.join(30)
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+        if server is not None:
+            server.terminate()
+            server.join(10)
+
+    handshakes = [sample for connect in connects for sample in connect["handshakes"]]
+    failures = sum((Counter(connect["failures"]) for connect in connects), Counter())
+    connect_window = max(c["finished"] for c in connects) - min(c["started"] for c in connects)
+    elapsed = max(result["elapsed"] for result in results)
+    frames = sum((Counter(result["frames"]) for result in results), Counter())
+    listeners = len(handshakes)
+
+    def per_thousand(rss):
+        if rss is None or rss_rooms is None or not listeners:
+            return None
+        return (rss - rss_rooms) / listeners * 1000
+
+    return {
+        "rooms": args.rooms,
+        "listeners": args.listeners,
+        "connections": listeners + args.rooms,
+        "client_processes": processes_count,
+        "duration": elapsed,
+        "connect": {
+            "connections": listeners,
+            "seconds": connect_window,
+            "rate": listeners / connect_window if connect_window > 0 else None,
+            "handshake_ms": percentiles(handshakes),
+            "failures": dict(failures),
+        },
+        "fanout_ms": percentiles([s for result in results for s in result["latencies"]]),
+        "drift_ms": percentiles([s for result in results for s in result["drifts"]]),
+        "messages": {
+            "per_second": sum(frames.values()) / elapsed,
+            "bytes_per_second": sum(result["bytes"] for result in results) / elapsed,
+            "by_type": dict(frames),
+        },
+        "commands": {
+            "sent": dict(sum((Counter(result["commands"]) for result in results), Counter())),
+            "no_event": sum(result["no_event"] for result in results),
+        },
+        "rss": {
+            "rooms_mb": rss_rooms / 2**20 if rss_rooms is not None else None,
+            "connected_mb": rss_connected / 2**20 if rss_connected is not None else None,
+            "after_mb": rss_after / 2**20 if rss_after is not None else None,
+            "per_1k_connections_mb": (
+                per_thousand(rss_connected) / 2**20 if per_thousand(rss_connected) is not None else None
+            ),
+        },
+        "closed": dict(sum((Counter(result["closed"]) for result in results), Counter())),
+        "server": (server_stats or {}).get("connections"),
+    }
+
+
+def _ms(summary: Dict[str, Any]) -> str:
+    if not summary["n"]:
+        return "표본 없음"
+    return (
+        f"p50 {summary['p50']:.1f}ms  p90 {summary['p90']:.1f}ms  p99 {summary['p99']:.1f}ms  "
+        f"max {summary['max']:.1f}ms  (n={summary['n']})"
+    )
+
+
+def _mb(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}MB"
+
+
+def report(result: Dict[str, Any]):
+    connect = result["connect"]
+    messages = result["messages"]
+    commands = result["commands"]
+    rss = result["rss"]
+    rate = f"{connect['rate']:.0f}/s" if connect["rate"] else "-"
+
+    print(
+        f"rooms={result['rooms']} listeners={result['listeners']} connections={result['connections']} "
+        f"duration={result['duration']:.1f}s client_processes={result['client_processes']} cpus={os.cpu_count()}"
+    )
+    print(
+        f"연결         : {connect['connections']}개 / {connect['seconds']:.2f}s ({rate}), "
+        f"실패 {sum(connect['failures'].values())} {connect['failures'] or ''}"
+    )
+    print(f"핸드셰이크   : {_ms(connect['handshake_ms'])}")
+    print(f"브로드캐스트 : {_ms(result['fanout_ms'])}")
+    print(f"동기화 오차  : {_ms(result['drift_ms'])}")
+    print(
+        f"수신         : {messages['per_second']:.0f} msg/s, {messages['bytes_per_second'] / 1024:.0f} KB/s "
+        f"{dict(sorted(messages['by_type'].items()))}"
+    )
+    print(f"명령         : {dict(sorted(commands['sent'].items()))}, 응답 없음 {commands['no_event']}")
+    print(
+        f"서버 RSS     : 방 {_mb(rss['rooms_mb'])} -> 연결 후 {_mb(rss['connected_mb'])} -> "
+        f"종료 전 {_mb(rss['after_mb'])}, 1000 연결당 {_mb(rss['per_1k_connections_mb'])}"
+    )
+    server = result["server"]
+    if server:
+        print(
+            f"서버 연결    : 송신 대기 {server.get('queued')}, 병합 {server.get('merged_frames')}, "
+            f"속도 제한 {server.get('rate_limited')}, 강제 종료 {server.get('evicted')}"
+        )
+    print(f"종료 코드    : {result['closed']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="방 N개 × 청취자 M명 WebSocket 부하 테스트")
+    parser.add_argument("--rooms", type=int, default=100, help="방 수")
+    parser.add_argument("--listeners", type=int, default=50, help="방마다 연결할 청취자 수 (명령을 보내는 청취자 포함)")
+    parser.add_argument("--duration", type=float, default=30.0, help="명령 부하를 주며 측정하는 시간 (초)")
+    parser.add_argument("--command-interval", type=float, default=5.0, help="방마다 명령 사이 평균 간격 (초)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"명령 비율 (기본 {DEFAULT_MIX})")
+    parser.add_argument("--tracks", type=int, default=3, help="시작 전에 방마다 추가할 트랙 수")
+    parser.add_argument("--event-timeout", type=float, default=5.0, help="명령 응답 이벤트를 기다리는 시간 (초)")
+    parser.add_argument("--connect-concurrency", type=int, default=200, help="동시에 진행할 연결 수")
+    parser.add_argument("--connect-timeout", type=float, default=30.0, help="연결 하나의 핸드셰이크 제한 시간 (초)")
+    parser.add_argument("--client-processes", type=int, default=1, help="청취자를 나눠 실행할 클라이언트 프로세스 수")
+    parser.add_argument("--compression", action="store_true", help="permessage-deflate 압축 협상 (브라우저 기본값)")
+    parser.add_argument("--db-latency", type=float, default=2.0, help="PostgreSQL 대역 쿼리 지연 (밀리초)")
+    parser.add_argument("--youtube-latency", type=float, default=80.0, help="YouTube 대역 동영상 정보 조회 지연 (밀리초)")
+    parser.add_argument("--url", help="이미 실행 중인 서버의 WebSocket 주소 (예: ws://127.0.0.1:8000/ws)")
+    parser.add_argument("--server-pid", type=int, help="--url 서버의 프로세스 ID (RSS 측정용)")
+    parser.add_argument("--budget-p99", type=float, help="허용하는 브로드캐스트 지연 p99 (밀리초, 넘으면 종료 코드 1)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로도 출력")
+    args = parser.parse_args()
+
+    # 서버 프로세스가 읽을 설정 - 청취자가 붙기 전에 방이 휴면되지 않도록
+    os.environ.setdefault("YOUTUBE_API_KEY", "load-test")
+    os.environ.setdefault("MAX_LIVE_ROOMS", str(max(args.rooms, 1000)))
+    raise_fd_limit()
+
+    result = asyncio.run(run(args))
+    report(result)
+    if args.json:
+        print(json.dumps(result))
+
+    p99 = result["fanout_ms"]["p99"]
+    if args.budget_p99 is not None and (p99 is None or p99 > args.budget_p99):
+        print(f"실패: 브로드캐스트 지연 p99가 허용치({args.budget_p99:.0f}ms)를 넘었습니다")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+10,000곡 플레이리스트에서 추가/제거/이동/다음에 추가 성능 측정
+
+마스터 클라이언트의 핸들러를 직접 호출하며, 무작위 작업마다
+현재 트랙이 같은 video ID를 가리키는지와 위치 색인이 정확한지도 확인합니다.
+비교용으로 이전 방식(리스트 선형 탐색 `track not in playlist`)의 중복 확인 시간도 측정합니다.
+제거/이동/다음에 추가 시간에는 바로 뒤따르는 ID -> 위치 조회 한 번이 포함됩니다
+(색인을 뒤로 미루는 구현이면 그 비용이 여기서 드러나도록).
+
+사용법 (저장소 루트에서):
+    python backend/benchmarks/playlist_ops.py --tracks 10000 --ops 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.services.master_client import MasterClient
+
+
+class NullConnectionManager:
+    """브로드캐스트를 버리는 연결 관리자"""
+
+    async def broadcast_to_room(self, message, room_id, coalesce_key=None):
+        pass
+
+
+def make_track(i: int) -> dict:
+    return {
+        "id": f"video{i:06d}",
+        "title": f"Track {i}",
+        "thumbnail": f"https://i.ytimg.com/vi/video{i:06d}/default.jpg",
+        "channel": "Channel",
+        "duration": "PT3M30S",
+        "publishedAt": "2024-01-01T00:00:00Z",
+    }
+
+
+def check_consistency(master_client: MasterClient, expected_current_id):
+    playlist = master_client.playback_state.playlist
+    current = master_client.playback_state.current_track_index
+    if expected_current_id is not None and expected_current_id in playlist:
+        assert playlist[current]["id"] == expected_current_id, "현재 트랙이 다른 트랙을 가리킵니다"
+    for _ in range(5):
+        i = random.randrange(len(playlist))
+        assert playlist.index_of(playlist[i]["id"]) == i, "위치 색인이 맞지 않습니다"
+
+
+async def run(num_tracks: int, num_ops: int):
+    random.seed(42)
+    master_client = MasterClient("bench", NullConnectionManager())
+    tracks = [make_track(i) for i in range(num_tracks)]
+
+    # 추가 (중복 확인 포함)
+    start = time.perf_counter()
+    for track in tracks:
+        await master_client.handle_add_track(track)
+    add_seconds = time.perf_counter() - start
+
+    # 중복 추가 시도
+    start = time.perf_counter()
+    for track in random.sample(tracks, min(num_ops, num_tracks)):
+        assert not await master_client.handle_add_track(track)
+    dup_seconds = time.perf_counter() - start
+
+    # 이전 방식의 선형 탐색 중복 확인 비교
+    legacy_playlist = list(tracks)
+    start = time.perf_counter()
+    for track in random.sample(tracks, min(num_ops, num_tracks)):
+        _ = track not in legacy_playlist
+    legacy_dup_seconds = time.perf_counter() - start
+
+    await master_client.handle_track_change(num_tracks // 2)
+    playlist = master_client.playback_state.playlist
+    next_id = num_tracks
+
+    timings = {"remove": 0.0, "move": 0.0, "insert_next": 0.0}
+    counts = {"remove": 0, "move": 0, "insert_next": 0}
+    for _ in range(num_ops):
+        current = master_client.playback_state.current_track_index
+        current_id = playlist[current]["id"]
+        op = random.choice(("remove", "move", "insert_next"))
+
+        start = time.perf_counter()
+        if op == "remove":
+            victim = playlist[random.randrange(len(playlist))]["id"]
+            await master_client.handle_remove_track(victim)
+            if victim == current_id:
+                current_id = None
+        elif op == "move":
+            track_id = playlist[random.randrange(len(playlist))]["id"]
+            await master_client.handle_move_track(track_id, random.randrange(len(playlist)))
+        else:
+            await master_client.handle_insert_next(make_track(next_id))
+            next_id += 1
+        playlist.index_of(playlist[-1]["id"])
+        timings[op] += time.perf_counter() - start
+        counts[op] += 1
+
+        check_consistency(master_client, current_id)
+
+    print(f"tracks={num_tracks} ops={num_ops} revision={master_client.playback_state.revision}")
+    print(f"add:           {add_seconds / num_tracks * 1e6:8.2f} us/op")
+    print(f"duplicate add: {dup_seconds / num_ops * 1e6:8.2f} us/op (이전 선형 탐색: {legacy_dup_seconds / num_ops * 1e6:.2f} us/op)")
+    for op in timings:
+        if counts[op]:
+            print(f"{op + ':':15}{timings[op] / counts[op] * 1e6:8.2f} us/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="플레이리스트 작업 성능 측정")
+    parser.add_argument("--tracks", type=int, default=10000, help="플레이리스트 트랙 수")
+    parser.add_argument("--ops", type=int, default=2000, help="무작위 제거/이동/다음에 추가 작업 수")
+    args = parser.parse_args()
+    asyncio.run(run(args.tracks, args.ops))
+
+
+if __name__ == "__main__":
+    main()
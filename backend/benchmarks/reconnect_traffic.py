@@ -0,0 +1,138 @@
+"""
+재접속 시 송신량 측정 (놓친 이벤트 재전송 vs 매번 전체 스냅샷)
+
+플레이리스트가 있는 방에서 청취자가 끊긴 동안 이벤트가 몇 개씩 일어났다고 보고,
+`?revision=n`으로 다시 접속한 청취자가 받은 바이트를 처음 접속한 청취자(스냅샷)와 비교합니다.
+실제 연결 관리자와 연결별 송신 큐(ClientConnection)를 거치므로, 재전송이 송신 큐를 넘쳐
+느린 연결로 종료되는 경우도 함께 드러납니다. DB 없이 실행됩니다 (방 상태 불러오기 오류는 무시).
+
+사용법 (저장소 루트에서):
+    python backend/benchmarks/reconnect_traffic.py --tracks 200 --missed 0 1 5 20 100
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class RecordingWebSocket:
+    """받은 메시지 수와 바이트만 세는 WebSocket"""
+
+    def __init__(self):
+        self.bytes = 0
+        self.messages = 0
+        self.close_code = None
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        self.bytes += len(data)
+        self.messages += 1
+
+    async def send_bytes(self, data):
+        self.bytes += len(data)
+        self.messages += 1
+
+    async def close(self, code=1000, reason=None):
+        self.close_code = code
+
+
+def make_track(i: int) -> dict:
+    return {
+        "id": f"video{i:06d}",
+        "title": f"Track {i} - 아주 긴 제목이 붙은 공식 뮤직비디오",
+        "thumbnail": f"https://i.ytimg.com/vi/video{i:06d}/hqdefault.jpg",
+        "channel": "Channel",
+        "duration": "PT3M30S",
+        "publishedAt": "2024-01-01T00:00:00Z",
+    }
+
+
+async def settle(connection):
+    """명령 병합기와 송신 큐가 비워질 때까지 대기"""
+    for _ in range(200):
+        await asyncio.sleep(0.005)
+        if connection.closed or (connection.queue_depth == 0 and connection.websocket.messages):
+            await asyncio.sleep(0.02)
+            if connection.queue_depth == 0:
+                return
+
+
+async def receive_on_connect(manager, room_id: str, revision=None):
+    """새로 접속한 청취자가 받은 (바이트, 메시지 수, 종료 코드)"""
+    websocket = RecordingWebSocket()
+    connection = await manager.connect(websocket, room_id, revision=revision)
+    await settle(connection)
+    manager.disconnect(connection)
+    return websocket.bytes, websocket.messages, websocket.close_code
+
+
+async def run(tracks: int, missed_counts):
+    from backend.app.bus import InMemoryRoomBus
+    from backend.app.services.master_client import MasterClientManager
+    from backend.app.websockets.connection_manager import ConnectionManager
+    from backend.config import settings
+
+    manager = ConnectionManager()
+    master_client_manager = MasterClientManager(manager)
+    manager.set_master_client_manager(master_client_manager)
+    manager.set_room_bus(InMemoryRoomBus())
+
+    room_id = "bench"
+    # 방을 살려 두는 청취자 (이벤트 브로드캐스트도 받음)
+    keeper = await manager.connect(RecordingWebSocket(), room_id)
+    await settle(keeper)
+    master_client = master_client_manager.master_clients[room_id]
+    for i in range(tracks):
+        await master_client.handle_add_track(make_track(i))
+        await asyncio.sleep(0)
+    await master_client.handle_play()
+    await settle(keeper)
+
+    print(
+        f"tracks={tracks} buffer={settings.ROOM_EVENT_LOG_SIZE} "
+        f"max_replay={master_client.events.max_replay} send_queue={settings.WS_SEND_QUEUE_SIZE}"
+    )
+    print(f"{'missed':>7} | {'resume':>12} | {'snapshot':>12} | 절감   | 종료")
+    for missed in missed_counts:
+        last_seen = master_client.playback_state.revision
+        # 끊긴 동안 일어난 이벤트 (탐색과 트랙 추가를 번갈아)
+        for i in range(missed):
+            if i % 2:
+                await master_client.handle_seek(float(i * 10))
+            else:
+                await master_client.handle_add_track(make_track(tracks + i))
+            await asyncio.sleep(0)
+        tracks += missed
+        await settle(keeper)
+
+        resume_bytes, resume_messages, close_code = await receive_on_connect(manager, room_id, last_seen)
+        snapshot_bytes, _, _ = await receive_on_connect(manager, room_id)
+
+        saving = f"{(1 - resume_bytes / snapshot_bytes) * 100:5.1f}%" if snapshot_bytes else "    -"
+        print(
+            f"{missed:>7} | {resume_bytes:>8d} B/{resume_messages:<3d}| {snapshot_bytes:>10d} B | "
+            f"{saving} | {close_code if close_code is not None else '-'}"
+        )
+    await master_client_manager.shutdown_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재접속 송신량 측정")
+    parser.add_argument("--tracks", type=int, default=200, help="플레이리스트 길이")
+    parser.add_argument("--missed", type=int, nargs="+", default=[0, 1, 5, 20, 100], help="끊긴 동안 일어난 이벤트 수")
+    parser.add_argument("--buffer", type=int, help="이벤트 버퍼 크기 (ROOM_EVENT_LOG_SIZE, 기본은 설정값)")
+    args = parser.parse_args()
+
+    if args.buffer is not None:
+        os.environ["ROOM_EVENT_LOG_SIZE"] = str(args.buffer)
+    os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+    sys.stdout.reconfigure(line_buffering=True)
+    asyncio.run(run(args.tracks, args.missed))
+
+
+if __name__ == "__main__":
+    main()
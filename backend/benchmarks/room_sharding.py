@@ -0,0 +1,221 @@
+"""
+워커 수에 따른 방 처리량 측정 (일관 해싱으로 방을 워커에 나눠 실행)
+
+한 머신에서 로컬 브로커와 워커 프로세스 N개를 띄우고, 방 R개를 재생시킨 뒤
+방 소유 워커에 가짜 청취자를 붙여 동기화 틱과 탐색 명령을 처리하게 합니다.
+워커 하나가 감당하지 못할 만큼 방을 많이 주고, 실제로 처리한 초당 동기화 수와 전달한 프레임 수를
+워커 1개일 때와 비교합니다. 코어 수까지는 워커 수에 거의 비례해 늘어나야 합니다
+(코어보다 워커가 많으면 늘지 않음).
+
+DB 없이 실행되며 (방 상태 불러오기/저장 오류는 무시), 워커 출력은 버립니다.
+
+사용법 (저장소 루트에서):
+    python backend/benchmarks/room_sharding.py --workers 1 2 4 --rooms 400 --listeners 20
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class CountingWebSocket:
+    """전송한 프레임 수만 세는 WebSocket"""
+
+    sent = 0
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        CountingWebSocket.sent += 1
+
+    async def send_bytes(self, data):
+        CountingWebSocket.sent += 1
+
+    async def close(self, code=1000, reason=None):
+        pass
+
+
+def make_track(room_id: str) -> dict:
+    return {
+        "id": f"{room_id}-track",
+        "title": "Benchmark",
+        "thumbnail": "",
+        "channel": "",
+        "duration": "PT1H",
+        "publishedAt": "",
+    }
+
+
+async def _worker(index: int, socket_path: str, pipe, listeners: int, duration: float, seek_every: float):
+    from backend.app.bus.local_broker import LocalBrokerRoomBus
+    from backend.app.services.master_client import MasterClientManager
+    from backend.app.websockets.connection_manager import ConnectionManager
+
+    loop = asyncio.get_running_loop()
+
+    async def receive():
+        return await loop.run_in_executor(None, pipe.recv)
+
+    manager = ConnectionManager()
+    master_client_manager = MasterClientManager(manager)
+    manager.set_master_client_manager(master_client_manager)
+    bus = LocalBrokerRoomBus(socket_path)
+    manager.set_room_bus(bus)
+    await bus.start()
+    pipe.send(bus.worker_id)
+
+    # 방 재생 시작 - 명령은 브로커가 링에서 정한 소유 워커로 전달
+    for room_id in await receive():
+        await bus.send_command(room_id, {"type": "add_track", "track": make_track(room_id)})
+        await bus.send_command(room_id, {"type": "play"})
+    pipe.send("seeded")
+
+    # 이 워커가 소유한 방에 청취자 연결 (프레임이 다른 워커로 건너가지 않는 이상적인 고정 라우팅)
+    # 브로커가 배정한 방이 모두 만들어질 때까지 기다림
+    expected = await receive()
+    while len(master_client_manager.master_clients) < expected:
+        await asyncio.sleep(0.1)
+    owned = sorted(bus.owned_rooms)
+    for room_id in owned:
+        for _ in range(listeners):
+            await manager.connect(CountingWebSocket(), room_id)
+    pipe.send(len(owned))
+
+    await receive()
+    scheduler = master_client_manager.scheduler
+    scheduler.max_tick_lag = 0.0
+    ticks_before = scheduler.ticks
+    synced_before = scheduler.rooms_synced
+    CountingWebSocket.sent = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    async def seek_load():
+        # 방마다 seek_every초에 한 번 정도 탐색 명령
+        while True:
+            await asyncio.sleep(seek_every / max(len(owned), 1))
+            if owned:
+                await bus.send_command(random.choice(owned), {"type": "seek", "position": random.uniform(0, 3000)})
+
+    seeker = asyncio.create_task(seek_load())
+    await asyncio.sleep(duration)
+    seeker.cancel()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    pipe.send({
+        "owned": len(owned),
+        "cpu": cpu / wall,
+        "frames": CountingWebSocket.sent / wall,
+        "syncs": (scheduler.rooms_synced - synced_before) / wall,
+        "ticks": scheduler.ticks - ticks_before,
+        "max_lag": scheduler.max_tick_lag,
+    })
+    await receive()
+    await bus.stop()
+
+
+def worker_main(index: int, socket_path: str, pipe, listeners: int, duration: float, seek_every: float):
+    sys.stdout = open(os.devnull, "w")
+    asyncio.run(_worker(index, socket_path, pipe, listeners, duration, seek_every))
+
+
+async def run(workers: int, rooms: int, listeners: int, duration: float, seek_every: float, socket_dir: str):
+    from backend.app.bus.local_broker import RoomBusBroker
+
+    loop = asyncio.get_running_loop()
+    socket_path = os.path.join(socket_dir, f"bus-{workers}.sock")
+    broker = RoomBusBroker(socket_path)
+    await broker.start()
+
+    context = multiprocessing.get_context("spawn")
+    pipes, processes = [], []
+    for index in range(workers):
+        parent, child = context.Pipe()
+        process = context.Process(
+            target=worker_main, args=(index, socket_path, child, listeners, duration, seek_every)
+        )
+        process.start()
+        pipes.append(parent)
+        processes.append(process)
+
+    async def gather():
+        return await asyncio.gather(*(loop.run_in_executor(None, pipe.recv) for pipe in pipes))
+
+    def broadcast(message):
+        for pipe in pipes:
+            pipe.send(message)
+
+    worker_ids = await gather()
+    room_ids = [f"room{i}" for i in range(rooms)]
+    for index, pipe in enumerate(pipes):
+        pipe.send(room_ids[index::workers])
+    await gather()
+    # 모든 방의 소유자가 정해지면 워커마다 배정된 방 수를 알려줌
+    while len(broker.owners) < rooms:
+        await asyncio.sleep(0.1)
+    owners = list(broker.owners.values())
+    for worker_id, pipe in zip(worker_ids, pipes):
+        pipe.send(owners.count(worker_id))
+    await gather()
+    broadcast("go")
+    results = await gather()
+    broadcast("stop")
+    for process in processes:
+        process.join(10)
+    await broker.stop()
+
+    owned = [result["owned"] for result in results]
+    return {
+        "workers": workers,
+        "owned_min": min(owned),
+        "owned_max": max(owned),
+        "cpu": statistics.mean(result["cpu"] for result in results),
+        "frames": sum(result["frames"] for result in results),
+        "syncs": sum(result["syncs"] for result in results),
+        "max_lag": max(result["max_lag"] for result in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 수에 따른 방 처리량 측정")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="워커 프로세스 수")
+    parser.add_argument("--rooms", type=int, default=2000, help="재생 중인 방 수 (워커 하나가 감당하지 못할 만큼)")
+    parser.add_argument("--listeners", type=int, default=20, help="방마다 붙일 청취자 수")
+    parser.add_argument("--sync-interval", type=float, default=0.5, help="동기화 주기 (초, 고정)")
+    parser.add_argument("--seek-every", type=float, default=5.0, help="방마다 탐색 명령 주기 (초)")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초)")
+    args = parser.parse_args()
+
+    # 워커 프로세스가 읽을 설정 (주기를 고정해서 방마다 부하가 같도록)
+    os.environ["SYNC_MIN_INTERVAL"] = os.environ["SYNC_MAX_INTERVAL"] = str(args.sync_interval)
+    # 청취자를 붙이기 전에 방이 휴면되지 않도록
+    os.environ["MAX_LIVE_ROOMS"] = str(args.rooms)
+    os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+
+    print(f"rooms={args.rooms} listeners={args.listeners} sync_interval={args.sync_interval}s cpus={os.cpu_count()}")
+    print(f"{'workers':>7} | {'owned min/max':>13} | {'cpu':>5} | {'frames/s':>9} | {'syncs/s':>8} | {'max lag':>8} | scaling")
+    baseline = None
+    with tempfile.TemporaryDirectory() as socket_dir:
+        for workers in args.workers:
+            result = asyncio.run(run(
+                workers, args.rooms, args.listeners, args.duration, args.seek_every, socket_dir
+            ))
+            baseline = baseline or result["syncs"]
+            print(
+                f"{result['workers']:>7} | {result['owned_min']:>6}/{result['owned_max']:<6} | "
+                f"{result['cpu'] * 100:4.0f}% | {result['frames']:>9.0f} | {result['syncs']:>8.0f} | "
+                f"{result['max_lag'] * 1000:6.0f}ms | {result['syncs'] / baseline:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
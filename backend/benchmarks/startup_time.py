@@ -0,0 +1,82 @@
+"""
+백엔드 콜드 import 시간 측정
+
+새 파이썬 프로세스에서 `backend.main`을 import하는 시간을 여러 번 측정합니다.
+측정 중에는 소켓 연결을 막아 시작 과정이 네트워크에 접근하지 않는 것도 함께 확인합니다.
+
+사용법 (저장소 루트에서):
+    python backend/benchmarks/startup_time.py --runs 5 --budget 1.5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 자식 프로세스에서 실행할 코드: 네트워크 연결을 막고 import 시간을 잼
+CHILD_CODE = r"""
+import json, socket, sys, time
+
+def _blocked(*args, **kwargs):
+    raise OSError("시작 중 네트워크 접근이 감지되었습니다")
+
+socket.socket.connect = _blocked
+socket.socket.connect_ex = _blocked
+socket.create_connection = _blocked
+
+start = time.perf_counter()
+import backend.main
+elapsed = time.perf_counter() - start
+
+from backend.app.services.youtube import youtube_service
+print(json.dumps({
+    "import_seconds": elapsed,
+    "youtube_client_created": youtube_service._client is not None,
+    "httpx_imported": "httpx" in sys.modules,
+}))
+"""
+
+
+def measure_once() -> dict:
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import 실패:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백엔드 콜드 import 시간 측정")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수")
+    parser.add_argument("--budget", type=float, default=1.5, help="허용하는 import 시간 중앙값 (초)")
+    args = parser.parse_args()
+
+    # 첫 실행은 바이트코드 컴파일이 포함되므로 버림
+    measure_once()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    times = [sample["import_seconds"] for sample in samples]
+    median = statistics.median(times)
+
+    print(f"runs={args.runs} min={min(times):.3f}s median={median:.3f}s max={max(times):.3f}s budget={args.budget:.3f}s")
+    print(f"youtube_client_created={samples[-1]['youtube_client_created']} httpx_imported={samples[-1]['httpx_imported']}")
+
+    if samples[-1]["youtube_client_created"]:
+        print("실패: import 시점에 YouTube HTTP 클라이언트가 생성되었습니다")
+        sys.exit(1)
+    if median > args.budget:
+        print("실패: import 시간이 허용치를 넘었습니다")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
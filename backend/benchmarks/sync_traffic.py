@@ -0,0 +1,92 @@
+"""
+재생 중인 방의 동기화 메시지 수 측정 (적응형 주기 vs 이전 1초 고정 주기)
+
+가상 시간으로 한 방을 재생하면서 트랙이 끝날 때마다 다음 트랙으로 넘기고,
+마스터 클라이언트가 보내는 sync_tick/state_update 수와 바이트를 셉니다.
+청취자 수를 곱한 값이 실제 송신 메시지 수입니다.
+
+사용법 (저장소 루트에서):
+    python backend/benchmarks/sync_traffic.py --minutes 60 --track-seconds 210 --listeners 100
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.services.master_client import MasterClient
+
+
+class CountingConnectionManager:
+    """브로드캐스트를 종류별로 세는 연결 관리자"""
+
+    def __init__(self):
+        self.messages = {}
+        self.bytes = 0
+
+    async def broadcast_to_room(self, message, room_id, coalesce_key=None):
+        kind = coalesce_key or "state_update"
+        self.messages[kind] = self.messages.get(kind, 0) + 1
+        self.bytes += len(message)
+
+
+def make_track(i: int, seconds: int) -> dict:
+    return {
+        "id": f"video{i:06d}",
+        "title": f"Track {i}",
+        "thumbnail": f"https://i.ytimg.com/vi/video{i:06d}/default.jpg",
+        "channel": "Channel",
+        "duration": f"PT{seconds}S",
+        "publishedAt": "2024-01-01T00:00:00Z",
+    }
+
+
+async def run(minutes: float, track_seconds: int, listeners: int):
+    connection_manager = CountingConnectionManager()
+    master_client = MasterClient("bench", connection_manager)
+    for i in range(50):
+        await master_client.handle_add_track(make_track(i, track_seconds))
+    await master_client.handle_play()
+    connection_manager.messages.clear()
+    connection_manager.bytes = 0
+
+    # 가상 시간: 다음 틱과 다음 트랙 종료 중 빠른 쪽으로 진행
+    duration = minutes * 60
+    now = 0.0
+    next_track_end = float(track_seconds)
+    max_interval = 0.0
+    while now < duration:
+        next_tick = now + master_client.sync_interval
+        max_interval = max(max_interval, master_client.sync_interval)
+        if next_track_end <= next_tick:
+            now = next_track_end
+            next_track_end += track_seconds
+            await master_client.handle_next_track()
+        else:
+            now = next_tick
+            await master_client.sync_tick()
+    await master_client.stop()
+
+    ticks = connection_manager.messages.get("sync_tick", 0)
+    updates = connection_manager.messages.get("state_update", 0)
+    baseline_ticks = int(duration)  # 이전 방식: 재생 중 1초마다
+    print(f"minutes={minutes} track_seconds={track_seconds} listeners={listeners}")
+    print(f"sync_tick:    {ticks:8d} (이전 1초 주기: {baseline_ticks}, {baseline_ticks / max(ticks, 1):.1f}배 감소)")
+    print(f"state_update: {updates:8d}")
+    print(f"최대 주기:    {max_interval:8.1f} s")
+    print(f"방 송신량:    {(ticks + updates) * listeners / minutes:10.1f} msgs/min "
+          f"(이전: {(baseline_ticks + updates) * listeners / minutes:.1f} msgs/min)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기화 메시지 수 측정")
+    parser.add_argument("--minutes", type=float, default=60, help="재생 시간 (분, 가상 시간)")
+    parser.add_argument("--track-seconds", type=int, default=210, help="트랙 길이 (초)")
+    parser.add_argument("--listeners", type=int, default=100, help="방 청취자 수")
+    args = parser.parse_args()
+    asyncio.run(run(args.minutes, args.track_seconds, args.listeners))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+master_sync 스냅샷의 JSON / MessagePack 인코딩 시간과 크기 비교
+
+플레이리스트 크기별로 마스터 클라이언트의 스냅샷을 만들고 다음을 측정합니다.
+  - json:      브로드캐스트 프레임(JSON 문자열) 생성 - 직렬화 캐시를 쓰지 않은 경우
+  - msgpack:   같은 객체를 MessagePack으로 직접 인코딩
+  - transcode: 서버가 msgpack 연결에 보내는 방식 (JSON 프레임 -> 객체 -> MessagePack, 브로드캐스트당 한 번)
+
+사용법 (저장소 루트에서):
+    python backend/benchmarks/wire_format.py --sizes 10 100 1000 10000 --repeat 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.services import json_codec, wire_format as wire
+from backend.app.services.master_client import MasterClient
+
+
+class NullConnectionManager:
+    """브로드캐스트를 버리는 연결 관리자"""
+
+    async def broadcast_to_room(self, message, room_id, coalesce_key=None):
+        pass
+
+
+def make_track(i: int) -> dict:
+    return {
+        "id": f"video{i:06d}",
+        "title": f"Track {i} - 아티스트 {i % 97}",
+        "thumbnail": f"https://i.ytimg.com/vi/video{i:06d}/default.jpg",
+        "channel": f"Channel {i % 31}",
+        "duration": "PT3M30S",
+        "publishedAt": "2024-01-01T00:00:00Z",
+    }
+
+
+def measure(fn, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+async def build_master_client(size: int) -> MasterClient:
+    master_client = MasterClient("bench", NullConnectionManager())
+    for i in range(size):
+        await master_client.handle_add_track(make_track(i))
+    return master_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="master_sync 전송 형식 비교")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000], help="플레이리스트 크기")
+    parser.add_argument("--repeat", type=int, default=200, help="크기별 반복 횟수")
+    args = parser.parse_args()
+
+    if not wire.available(wire.MSGPACK):
+        print("msgpack이 설치되어 있지 않습니다 (pip install msgpack)")
+        return
+
+    print(f"JSON 백엔드: {json_codec.BACKEND}")
+    print(f"{'tracks':>7} | {'json us':>10} {'json B':>9} | {'msgpack us':>10} {'msgpack B':>9} | {'transcode us':>12} | {'크기 비율':>8}")
+    for size in args.sizes:
+        master_client = asyncio.run(build_master_client(size))
+        repeat = max(5, args.repeat * 100 // max(size, 100))
+        message = {
+            "type": "master_sync",
+            "master_client_id": master_client.client_id,
+            "data": master_client.get_current_state(),
+            "timestamp": time.time(),
+        }
+
+        json_seconds, json_frame = measure(lambda: wire.encode(message, wire.JSON), repeat)
+        msgpack_seconds, msgpack_frame = measure(lambda: wire.encode(message, wire.MSGPACK), repeat)
+        transcode_seconds, transcoded = measure(lambda: wire.transcode(json_frame, wire.MSGPACK), repeat)
+        assert wire.decode_binary(transcoded) == wire.decode_binary(msgpack_frame), "변환 결과가 다릅니다"
+
+        json_bytes = len(json_frame.encode())
+        print(
+            f"{size:>7} | {json_seconds * 1e6:>10.1f} {json_bytes:>9} | "
+            f"{msgpack_seconds * 1e6:>10.1f} {len(msgpack_frame):>9} | "
+            f"{transcode_seconds * 1e6:>12.1f} | {len(msgpack_frame) / json_bytes:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,14 @@ load_dotenv()
 class Settings(BaseSettings):    
     # YouTube Data API 설정
     YOUTUBE_API_KEY: str = Field(default="", env="YOUTUBE_API_KEY")
+    YOUTUBE_API_TIMEOUT: float = Field(default=5.0, env="YOUTUBE_API_TIMEOUT")  # 요청 타임아웃 (초)
+    YOUTUBE_MAX_CONCURRENCY: int = Field(default=10, env="YOUTUBE_MAX_CONCURRENCY")  # 동시 요청 및 연결 수 제한
+
+    # YouTube 결과 캐시 설정 (TTL: 초)
+    SEARCH_CACHE_TTL: float = Field(default=300.0, env="SEARCH_CACHE_TTL")
+    SEARCH_CACHE_SIZE: int = Field(default=1024, env="SEARCH_CACHE_SIZE")
+    VIDEO_CACHE_TTL: float = Field(default=21600.0, env="VIDEO_CACHE_TTL")
+    VIDEO_CACHE_SIZE: int = Field(default=4096, env="VIDEO_CACHE_SIZE")
 
     # 클라이언트 URL (CORS)
     FRONTEND_URL: str = Field(default="http://localhost:3000", env="FRONTEND_URL")
@@ -20,6 +28,61 @@ class Settings(BaseSettings):
     DB_USER: str = Field(default="postgres", env="DB_USER")
     DB_PASSWORD: str = Field(default="", env="DB_PASSWORD")
 
+    # 비동기 커넥션 풀 설정 (asyncpg)
+    DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")  # 항상 유지하는 연결 수
+    DB_POOL_MAX_OVERFLOW: int = Field(default=10, env="DB_POOL_MAX_OVERFLOW")  # 부하 시 추가로 여는 연결 수
+    DB_POOL_RECYCLE: float = Field(default=300.0, env="DB_POOL_RECYCLE")  # 이 시간(초) 이상 놀고 있는 연결은 닫음 (서버나 방화벽이 끊은 오래된 연결을 재사용하지 않도록)
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100, env="DB_STATEMENT_CACHE_SIZE")  # 연결별 prepared statement 캐시 (pgbouncer 트랜잭션 모드에서는 0)
+    DB_COMMAND_TIMEOUT: float = Field(default=10.0, env="DB_COMMAND_TIMEOUT")  # 쿼리 타임아웃 (초)
+
+    # 방 참여자 수를 DB에 모아서 기록하는 주기 (초)
+    PARTICIPANTS_FLUSH_INTERVAL: float = Field(default=5.0, env="PARTICIPANTS_FLUSH_INTERVAL")
+
+    # 방 재생 상태를 DB에 모아서 저장하는 주기 (초)
+    ROOM_STATE_SAVE_INTERVAL: float = Field(default=1.0, env="ROOM_STATE_SAVE_INTERVAL")
+
+    # 방 휴면 설정 - 청취자가 없는 방은 ROOM_IDLE_TIMEOUT초 후 상태를 저장하고 메모리에서 내림
+    ROOM_IDLE_TIMEOUT: float = Field(default=10.0, env="ROOM_IDLE_TIMEOUT")
+    MAX_LIVE_ROOMS: int = Field(default=1000, env="MAX_LIVE_ROOMS")  # 워커당 메모리에 올려둘 최대 방 수 (LRU)
+
+    # WebSocket 설정
+    WS_SEND_QUEUE_SIZE: int = Field(default=64, env="WS_SEND_QUEUE_SIZE")  # 연결별 송신 큐 최대 길이 (넘으면 느린 클라이언트로 보고 연결 종료)
+    WS_COMMAND_RATE: float = Field(default=10.0, env="WS_COMMAND_RATE")  # 연결별 초당 수신 메시지 수 (토큰 버킷 충전 속도)
+    WS_COMMAND_BURST: int = Field(default=20, env="WS_COMMAND_BURST")  # 연결별 순간 최대 메시지 수 (토큰 버킷 크기)
+    # 하트비트 응답(pong), 시계 동기화(time_sync), 동기화 요청(sync_request)은 명령과 따로 제한 (명령을 연타해도 동기화는 계속되도록)
+    WS_CONTROL_RATE: float = Field(default=2.0, env="WS_CONTROL_RATE")
+    WS_CONTROL_BURST: int = Field(default=10, env="WS_CONTROL_BURST")
+    WS_MAX_MESSAGE_SIZE: int = Field(default=8192, env="WS_MAX_MESSAGE_SIZE")  # 수신 메시지 최대 길이 (글자 수, 넘으면 검증 전에 거부)
+
+    # 방마다 재전송용으로 보관할 최근 이벤트 수 (다시 접속한 클라이언트에 놓친 이벤트만 전송, 넘으면 스냅샷)
+    # 재전송은 송신 큐에 한 번에 들어가므로 WS_SEND_QUEUE_SIZE의 절반까지만 재전송하고, 그보다 많이 놓쳤으면 스냅샷
+    ROOM_EVENT_LOG_SIZE: int = Field(default=32, env="ROOM_EVENT_LOG_SIZE")
+
+    # 하트비트 - 이 시간(초) 동안 받은 메시지가 없는 연결에 ping을 보내고, WS_IDLE_TIMEOUT초 동안 응답이 없으면 종료
+    WS_HEARTBEAT_INTERVAL: float = Field(default=15.0, env="WS_HEARTBEAT_INTERVAL")
+    WS_IDLE_TIMEOUT: float = Field(default=45.0, env="WS_IDLE_TIMEOUT")
+    WS_SEND_TIMEOUT: float = Field(default=10.0, env="WS_SEND_TIMEOUT")  # 메시지 하나의 전송이 이보다 오래 걸리면 연결 종료 (초)
+
+    # 방 명령 병합 - 이 시간(초) 안에 연달아 들어온 탐색/재생/일시정지/트랙 이동은 마지막 것만 적용
+    COMMAND_COALESCE_WINDOW: float = Field(default=0.1, env="COMMAND_COALESCE_WINDOW")
+
+    # 동기화 스케줄러 설정
+    SYNC_TICK_INTERVAL: float = Field(default=0.1, env="SYNC_TICK_INTERVAL")  # 같은 틱으로 묶는 시간 단위 (초)
+
+    # 적응형 동기화 주기 - 상태가 바뀌면 최소 주기로 돌아가고, 변화가 없으면 배수로 늘려 최대 주기까지
+    SYNC_MIN_INTERVAL: float = Field(default=1.0, env="SYNC_MIN_INTERVAL")
+    SYNC_MAX_INTERVAL: float = Field(default=30.0, env="SYNC_MAX_INTERVAL")
+    SYNC_BACKOFF: float = Field(default=2.0, env="SYNC_BACKOFF")
+    SYNC_DRIFT_TOLERANCE: float = Field(default=1.0, env="SYNC_DRIFT_TOLERANCE")  # 클라이언트가 보고한 오차가 이보다 크면 최소 주기로 복귀 (초)
+
+    # 룸 버스 설정 (memory: 단일 워커, local: 로컬 브로커를 통한 멀티 워커)
+    ROOM_BUS_BACKEND: str = Field(default="memory", env="ROOM_BUS_BACKEND")
+    ROOM_BUS_SOCKET: str = Field(default="/tmp/openjukebox-bus.sock", env="ROOM_BUS_SOCKET")
+    ROOM_RING_VNODES: int = Field(default=128, env="ROOM_RING_VNODES")  # 방 소유자 일관 해싱 링의 워커당 가상 노드 수
+
+    # JSON 직렬화 백엔드 (auto: orjson이 있으면 사용, orjson, json)
+    JSON_BACKEND: str = Field(default="auto", env="JSON_BACKEND")
+
     @property
     def database_url(self) -> str:
         pwd = quote_plus(self.DB_PASSWORD)
@@ -3,8 +3,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.app.api import router as api_router
-from backend.app.websockets import router as ws_router, master_client_manager
+from backend.app.websockets import router as ws_router, manager, master_client_manager, room_bus
 from backend.app.init_db import init_db, close_db
+from backend.app.services.youtube import youtube_service
 
 app = FastAPI(title="OpenJukebox API")
 
@@ -29,12 +30,28 @@ async def root():
 @app.on_event("startup")
 async def startup_db_client():
     await init_db()
+    # 룸 버스 연결 (멀티 워커 실행 시 로컬 브로커에 연결)
+    await room_bus.start()
+    # 방 참여자 수 주기적 기록 시작 (첫 기록 때 DB 값을 실제 연결 수에 맞춤)
+    manager.participant_writer.start()
+    # 연결 하트비트 시작 (응답 없는 연결 정리)
+    manager.heartbeat.start()
 
 # 종료 이벤트 - 데이터베이스 연결 종료 및 마스터 클라이언트 정리
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    # 다른 워커가 있으면 소유한 방의 재생 상태를 인계
+    await room_bus.leave()
     # 마스터 클라이언트들 모두 종료
     await master_client_manager.shutdown_all()
+    # 하트비트 중지
+    await manager.heartbeat.stop()
+    # 남은 참여자 수 기록
+    await manager.participant_writer.stop()
+    # 룸 버스 종료
+    await room_bus.stop()
+    # YouTube API 연결 풀 종료
+    await youtube_service.close()
     # 데이터베이스 연결 종료
     await close_db()
 
@@ -0,0 +1,209 @@
+"""
+video ID 색인 플레이리스트와 PlaybackState 테스트 (10,000곡)
+
+실행 (저장소 루트에서):
+    python -m pytest backend/tests
+"""
+import asyncio
+import random
+
+import pytest
+from pydantic import ValidationError
+
+from backend.app.schemas.ws import parse_client_message
+from backend.app.services.master_client import MasterClient, PlaybackState
+from backend.app.services.playlist import Playlist
+
+NUM_TRACKS = 10000
+
+
+class NullConnectionManager:
+    """브로드캐스트를 버리는 연결 관리자"""
+
+    async def broadcast_to_room(self, message, room_id, coalesce_key=None):
+        pass
+
+
+def make_track(i: int) -> dict:
+    return {"id": f"video{i:06d}", "title": f"Track {i}"}
+
+
+def make_master_client(current: int = NUM_TRACKS // 2) -> MasterClient:
+    """10,000곡이 들어 있고 current 위치의 트랙이 선택된 마스터 클라이언트"""
+    tracks = [make_track(i) for i in range(NUM_TRACKS)]
+    return MasterClient("test", NullConnectionManager(), saved_state={
+        "playlist": tracks,
+        "current_track": current,
+        "position": 0.0,
+        "playing": False,
+        "last_update_time": 0.0,
+        "volume": 1.0,
+        "revision": 0,
+    })
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def current_id(master_client: MasterClient):
+    track = master_client.playback_state.current_track()
+    return track["id"] if track else None
+
+
+def assert_indexed(playlist: Playlist, expected_ids):
+    """트랙 순서와 ID -> 위치 색인이 기대한 목록과 같은지 확인"""
+    assert [track["id"] for track in playlist] == expected_ids
+    for index, video_id in enumerate(expected_ids):
+        assert playlist.index_of(video_id) == index
+
+
+def test_random_operations_keep_index_consistent():
+    random.seed(7)
+    playlist = Playlist(make_track(i) for i in range(NUM_TRACKS))
+    expected = [f"video{i:06d}" for i in range(NUM_TRACKS)]
+    next_id = NUM_TRACKS
+
+    for _ in range(500):
+        op = random.choice(("pop", "move", "insert"))
+        if op == "pop":
+            index = random.randrange(len(expected))
+            assert playlist.pop(index)["id"] == expected.pop(index)
+        elif op == "move":
+            from_index = random.randrange(len(expected))
+            to_index = random.randrange(len(expected))
+            playlist.move(from_index, to_index)
+            expected.insert(to_index, expected.pop(from_index))
+        else:
+            index = random.randrange(len(expected) + 1)
+            track = make_track(next_id)
+            next_id += 1
+            assert playlist.insert(index, track) == index
+            expected.insert(index, track["id"])
+
+    assert_indexed(playlist, expected)
+    assert playlist.index_of("missing") is None
+
+
+def test_duplicate_add_is_rejected():
+    master_client = make_master_client()
+    revision = master_client.playback_state.revision
+
+    assert not run(master_client.handle_add_track(make_track(123)))
+    assert len(master_client.playback_state.playlist) == NUM_TRACKS
+    assert master_client.playback_state.revision == revision
+    assert master_client.playback_state.playlist.insert(0, make_track(123)) is None
+
+
+def test_remove_before_and_after_current_keeps_current_track():
+    master_client = make_master_client(current=5000)
+    playing = current_id(master_client)
+
+    assert run(master_client.handle_remove_track("video000010"))
+    assert master_client.playback_state.current_track_index == 4999
+    assert current_id(master_client) == playing
+
+    assert run(master_client.handle_remove_track("video009000"))
+    assert master_client.playback_state.current_track_index == 4999
+    assert current_id(master_client) == playing
+    assert not run(master_client.handle_remove_track("video009000"))
+
+
+def test_remove_current_plays_next_track_at_same_position():
+    master_client = make_master_client(current=5000)
+    master_client.playback_state.position = 42.0
+
+    assert run(master_client.handle_remove_track("video005000"))
+    assert master_client.playback_state.current_track_index == 5000
+    assert current_id(master_client) == "video005001"
+    assert master_client.playback_state.position == 0.0
+
+
+def test_remove_last_track_while_current_wraps_to_first():
+    master_client = make_master_client(current=NUM_TRACKS - 1)
+
+    assert run(master_client.handle_remove_track(f"video{NUM_TRACKS - 1:06d}"))
+    assert master_client.playback_state.current_track_index == 0
+    assert current_id(master_client) == "video000000"
+
+
+def test_remove_only_track_stops_playback():
+    master_client = MasterClient("test", NullConnectionManager())
+    run(master_client.handle_add_track(make_track(0)))
+    master_client.playback_state.is_playing = True
+
+    assert run(master_client.handle_remove_track("video000000"))
+    assert master_client.playback_state.current_track_index is None
+    assert not master_client.playback_state.is_playing
+    run(master_client.stop())
+
+
+@pytest.mark.parametrize("track_id, to_index", [
+    ("video000010", 9000),  # 현재 트랙 앞에서 뒤로
+    ("video009000", 10),    # 현재 트랙 뒤에서 앞으로
+    ("video000010", 20),    # 현재 트랙 앞에서만 이동
+    ("video009000", 9500),  # 현재 트랙 뒤에서만 이동
+    ("video005000", 0),     # 현재 트랙을 맨 앞으로
+    ("video005000", 9999),  # 현재 트랙을 맨 뒤로
+])
+def test_move_keeps_current_track(track_id, to_index):
+    master_client = make_master_client(current=5000)
+    playing = current_id(master_client)
+    expected = [track["id"] for track in master_client.playback_state.playlist]
+    expected.insert(to_index, expected.pop(expected.index(track_id)))
+
+    assert run(master_client.handle_move_track(track_id, to_index))
+    assert current_id(master_client) == playing
+    assert_indexed(master_client.playback_state.playlist, expected)
+
+
+def test_move_out_of_range_is_rejected_or_clamped():
+    master_client = make_master_client(current=5000)
+    revision = master_client.playback_state.revision
+
+    # 음수 위치는 메시지 검증에서 거절
+    with pytest.raises(ValidationError):
+        parse_client_message('{"type":"move_track","track_id":"video000010","to":-1}')
+    # 없는 트랙과 제자리 이동은 거절 (리비전도 그대로)
+    assert not run(master_client.handle_move_track("missing", 0))
+    assert not run(master_client.handle_move_track("video000010", 10))
+    assert master_client.playback_state.revision == revision
+
+    # 끝을 넘는 위치는 마지막 자리로 보정
+    assert run(master_client.handle_move_track("video000010", NUM_TRACKS * 2))
+    assert master_client.playback_state.playlist.index_of("video000010") == NUM_TRACKS - 1
+    assert current_id(master_client) == "video005000"
+
+
+def test_insert_next_places_track_after_current():
+    master_client = make_master_client(current=5000)
+
+    assert run(master_client.handle_insert_next(make_track(NUM_TRACKS)))
+    playlist = master_client.playback_state.playlist
+    assert current_id(master_client) == "video005000"
+    assert playlist.index_of(f"video{NUM_TRACKS:06d}") == 5001
+    assert len(playlist) == NUM_TRACKS + 1
+
+
+@pytest.mark.parametrize("track_id", ["video000010", "video009000"])
+def test_insert_next_existing_track_moves_it_after_current(track_id):
+    master_client = make_master_client(current=5000)
+
+    assert run(master_client.handle_insert_next(make_track(int(track_id[5:]))))
+    playlist = master_client.playback_state.playlist
+    assert len(playlist) == NUM_TRACKS
+    assert playlist.index_of(track_id) == master_client.playback_state.current_track_index + 1
+    assert current_id(master_client) == "video005000"
+
+
+def test_playback_state_round_trip_keeps_index():
+    master_client = make_master_client(current=5000)
+    run(master_client.handle_remove_track("video000010"))
+    run(master_client.handle_move_track("video009000", 3))
+
+    state = master_client.playback_state
+    restored = PlaybackState.from_dict(state.to_dict())
+    assert restored.current_track_index == state.current_track_index
+    assert restored.current_track()["id"] == "video005000"
+    assert restored.revision == state.revision
+    assert_indexed(restored.playlist, [track["id"] for track in state.playlist])
@@ -16,6 +16,8 @@ export default function Home() {
     rooms,
     loading,
     error,
+    hasMoreRooms,
+    loadMoreRooms,
     createRoom,
   } = useRooms();
 
@@ -93,6 +95,16 @@ export default function Home() {
             loading={loading} 
             onCreateRoom={() => setCreateModalOpen(true)} 
           />
+          {hasMoreRooms && (
+            <div className="text-center mt-6">
+              <button
+                onClick={loadMoreRooms}
+                className="px-6 py-2 rounded-xl text-sm text-gray-300 bg-white/5 hover:bg-white/10 border border-white/10 transition-all"
+              >
+                더 보기
+              </button>
+            </div>
+          )}
         </div>
 
         {/* 푸터 */}
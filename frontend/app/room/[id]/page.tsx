@@ -27,13 +27,16 @@ export default function RoomPage({ params }: RoomPageProps) {
     isConnected,
     lastSyncTime,
     addTrack,
+    removeTrack,
     playTrack,
     pauseTrack,
     seekTrack,
     nextTrack,
     prevTrack,
     setOnSyncUpdate,
-    getCurrentPosition
+    getCurrentPosition,
+    getServerTime,
+    reportDrift
   } = useWebSocket(roomId);
 
   // 연결 상태 확인
@@ -130,6 +133,8 @@ export default function RoomPage({ params }: RoomPageProps) {
               onNext={nextTrack}
               onPrev={prevTrack}
               setOnSyncUpdate={setOnSyncUpdate}
+              getServerTime={getServerTime}
+              onDriftMeasured={reportDrift}
             />
           </div>
           
@@ -140,6 +145,7 @@ export default function RoomPage({ params }: RoomPageProps) {
               tracks={state.playlist} 
               currentTrack={state.current_track}
               onSelectTrack={(index) => seekTrack(0, index)}
+              onRemoveTrack={removeTrack}
             />
           </div>
         </div>
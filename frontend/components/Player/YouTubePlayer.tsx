@@ -34,6 +34,8 @@ interface YouTubePlayerProps {
   onNext: () => void;
   onPrev: () => void;
   setOnSyncUpdate: (callback: (state: AppState) => void) => void;
+  getServerTime?: () => number;  // time_sync로 추정한 서버 시각 (초)
+  onDriftMeasured?: (drift: number) => void;  // 서버 기준 위치와 실제 재생 위치의 차이 (초)
 }
 
 export default function YouTubePlayer({
@@ -48,6 +50,8 @@ export default function YouTubePlayer({
   onNext,
   onPrev,
   setOnSyncUpdate,
+  getServerTime,
+  onDriftMeasured,
 }: YouTubePlayerProps) {
   
   // ===== 상태 관리 =====
@@ -81,6 +85,12 @@ export default function YouTubePlayer({
     ? playlist[currentTrack] 
     : null;
 
+  // 서버가 보낸 재생 위치와 그 시각 (동기화 틱 사이에 위치 오차를 직접 확인하는 기준)
+  const syncAnchorRef = useRef({ position, lastUpdateTime });
+  useEffect(() => {
+    syncAnchorRef.current = { position, lastUpdateTime };
+  }, [position, lastUpdateTime]);
+  
   // 재생바 상태 관리
   const [progressBarTime, setProgressBarTime] = useState(0);
   const [totalDuration, setTotalDuration] = useState(0);
@@ -437,6 +447,27 @@ export default function YouTubePlayer({
     });
   }, [isPlayerReady, setOnSyncUpdate]);
 
+  // 서버 시계로 계산한 위치와 실제 재생 위치 비교 (동기화 틱이 드물어도 스스로 맞춤)
+  const checkDrift = (currentTime: number, duration: number) => {
+    const { position: anchorPosition, lastUpdateTime: anchorTime } = syncAnchorRef.current;
+    if (!getServerTime || anchorPosition === undefined || !anchorTime) return;
+    if (initializationStateRef.current !== 'ready' || isSeekingRef.current) return;
+    
+    const expected = anchorPosition + (getServerTime() - anchorTime);
+    if (duration <= 0 || expected > duration) return;
+    
+    const drift = currentTime - expected;
+    onDriftMeasured?.(drift);
+    
+    // 2초 이상 차이나면 서버 기준 위치로 이동
+    if (Math.abs(drift) >= 2 && playerRef.current) {
+      masterSyncTimeRef.current = Date.now();
+      lastPositionRef.current = expected;
+      playerRef.current.seekTo(expected, true);
+      console.log(`🔄 위치 오차 보정: ${drift.toFixed(1)}초`);
+    }
+  };
+
   // 재생바 업데이트 시작
   const startProgressUpdater = () => {
     stopProgressUpdater(); // 기존 인터벌 정리
@@ -458,6 +489,8 @@ export default function YouTubePlayer({
         if (currentTime >= 0) {
           setProgressBarTime(currentTime);
         }
+        
+        checkDrift(currentTime, duration);
       } catch (error) {
         console.error('재생 시간 업데이트 오류:', error);
       }
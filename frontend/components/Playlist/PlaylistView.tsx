@@ -1,7 +1,7 @@
 'use client';
 
 import { useMemo } from 'react';
-import { Music, Play } from 'lucide-react';
+import { Music, Play, X } from 'lucide-react';
 
 interface Track {
   id: string;
@@ -16,12 +16,14 @@ interface PlaylistProps {
   tracks: Track[];
   currentTrack: number | null;
   onSelectTrack: (index: number) => void;
+  onRemoveTrack?: (trackId: string) => void;
 }
 
 export default function PlaylistView({
   tracks,
   currentTrack,
-  onSelectTrack
+  onSelectTrack,
+  onRemoveTrack
 }: PlaylistProps) {
   
   const isEmpty = useMemo(() => tracks.length === 0, [tracks]);
@@ -46,7 +48,7 @@ export default function PlaylistView({
             
             return (
               <div
-                key={`${track.id}-${index}`}
+                key={track.id}
                 className={`group flex items-center gap-4 p-4 rounded-xl cursor-pointer transition-all duration-200 hover-lift ${
                   isActive 
                     ? 'bg-gradient-to-r from-purple-500/20 to-pink-500/20 border border-purple-500/30' 
@@ -124,6 +126,20 @@ export default function PlaylistView({
                     </div>
                   </div>
                 )}
+
+                {/* 제거 버튼 */}
+                {onRemoveTrack && (
+                  <button
+                    className="flex-shrink-0 p-1 rounded-full text-gray-500 opacity-0 group-hover:opacity-100 hover:text-white hover:bg-white/10 transition-all"
+                    onClick={(e) => {
+                      e.stopPropagation();
+                      onRemoveTrack(track.id);
+                    }}
+                    aria-label="트랙 제거"
+                  >
+                    <X className="w-4 h-4" />
+                  </button>
+                )}
               </div>
             );
           })}
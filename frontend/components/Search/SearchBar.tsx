@@ -39,7 +39,7 @@ export default function SearchBar({ onAddTrack }: SearchProps) {
     
     try {
       const response = await axios.get(`${API_BASE_URL}/api/search`, {
-        params: { q: query }
+        params: { q: query, details: true }  // 재생 시간 포함
       });
       
       setSearchResults(response.data);
@@ -1,4 +1,5 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
+import { decode as decodeMsgpack } from '@msgpack/msgpack';
 import { Room } from '@/types/room';
 
 // 상태와 트랙 타입 정의
@@ -26,9 +27,50 @@ interface AppState {
   position?: number;  // 마스터 클라이언트로부터 받는 정확한 위치
   last_update_time?: number;  // 마지막 업데이트 시간
   volume?: number;
+  revision?: number;  // 서버 상태 리비전 (변경마다 1씩 증가)
   room_info?: RoomInfo;  // 방 정보 추가
 }
 
+// 플레이리스트 변경분 (서버의 playlist_delta 메시지)
+interface PlaylistDelta {
+  op: 'add' | 'remove' | 'move' | 'update';
+  index?: number;
+  track?: Track;
+  id?: string;
+  from?: number;
+  to?: number;
+  current_track: number | null;
+  revision: number;
+}
+
+// 플레이리스트 변경분 적용
+const applyPlaylistDelta = (playlist: Track[], delta: PlaylistDelta): Track[] => {
+  const next = [...playlist];
+  if (delta.op === 'add' && delta.track && delta.index !== undefined) {
+    next.splice(delta.index, 0, delta.track);
+  } else if (delta.op === 'remove' && delta.index !== undefined) {
+    next.splice(delta.index, 1);
+  } else if (delta.op === 'move' && delta.from !== undefined && delta.to !== undefined) {
+    const [moved] = next.splice(delta.from, 1);
+    next.splice(delta.to, 0, moved);
+  } else if (delta.op === 'update' && delta.track && delta.index !== undefined) {
+    // 서버가 나중에 채운 트랙 정보 (재생 시간 등)
+    next[delta.index] = delta.track;
+  }
+  return next;
+};
+
+// 시계 동기화 (NTP 방식) - 접속 직후 몇 번 빠르게 측정하고 이후에는 천천히 반복
+const TIME_SYNC_BURST = 4;
+const TIME_SYNC_BURST_GAP_MS = 250;
+const TIME_SYNC_INTERVAL_MS = 15000;
+const TIME_SYNC_SAMPLES = 8;  // 최근 측정값 중 왕복 시간이 가장 짧은 것을 사용
+
+interface ClockSample {
+  offset: number;  // 서버 시각 - 로컬 시각 (초)
+  rtt: number;  // 왕복 시간 (초)
+}
+
 // 초기 상태
 const initialState: AppState = {
   playlist: [],
@@ -42,13 +84,16 @@ const initialState: AppState = {
 // Next.js 클라이언트 사이드에서 사용하려면 NEXT_PUBLIC_ 접두사가 필요합니다
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || 'https://localhost:8000';
 const WS_BASE_URL = process.env.NEXT_PUBLIC_WS_BASE_URL || 'wss://localhost:8000';
+// 서버 -> 클라이언트 전송 형식 (msgpack이면 바이너리 프레임, 기본은 JSON)
+const WS_FORMAT = process.env.NEXT_PUBLIC_WS_FORMAT === 'msgpack' ? 'msgpack' : 'json';
 
 export const useRooms = () => {
   const [rooms, setRooms] = useState<Room[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
-  // 룸 목록 가져오기
+  // 룸 목록 가져오기 (최신순 첫 페이지)
   const fetchRooms = useCallback(async () => {
     try {
       setLoading(true);
@@ -59,7 +104,8 @@ export const useRooms = () => {
       }
       
       const data = await response.json();
-      setRooms(data);
+      setRooms(data.rooms);
+      setNextCursor(data.nextCursor);
       setError(null);
     } catch (err) {
       console.error('룸 목록 조회 에러:', err);
@@ -69,6 +115,25 @@ export const useRooms = () => {
     }
   }, []);
 
+  // 다음 페이지 가져오기 (커서 기반)
+  const loadMoreRooms = useCallback(async () => {
+    if (!nextCursor) return;
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/rooms/?cursor=${encodeURIComponent(nextCursor)}`);
+      
+      if (!response.ok) {
+        throw new Error('룸 목록을 가져오는데 실패했습니다.');
+      }
+      
+      const data = await response.json();
+      setRooms(prev => [...prev, ...data.rooms]);
+      setNextCursor(data.nextCursor);
+    } catch (err) {
+      console.error('룸 목록 조회 에러:', err);
+      setError('룸 목록을 가져오는데 실패했습니다.');
+    }
+  }, [nextCursor]);
+
   // 룸 생성하기
   const createRoom = useCallback(async (roomData: { name: string; description?: string }) => {
     try {
@@ -85,7 +150,7 @@ export const useRooms = () => {
       }
       
       const newRoom = await response.json();
-      setRooms(prev => [...prev, newRoom]);
+      setRooms(prev => [newRoom, ...prev]);
       return newRoom;
     } catch (err) {
       console.error('룸 생성 에러:', err);
@@ -102,7 +167,9 @@ export const useRooms = () => {
     rooms,
     loading,
     error,
+    hasMoreRooms: nextCursor !== null,
     fetchRooms,
+    loadMoreRooms,
     createRoom
   };
 };
@@ -156,6 +223,20 @@ export const useWebSocket = (roomId?: string) => {
   // 콜백 참조 (무한루프 방지)
   const onSyncUpdateCallbackRef = useRef<((state: AppState) => void) | null>(null);
   
+  // 마지막으로 적용한 서버 상태 (리비전 공백 감지용)
+  const stateRef = useRef<AppState>(initialState);
+  
+  // 서버 시계 추정값 (서버 시각 - 로컬 시각, 초)과 최근 측정값
+  const clockOffsetRef = useRef(0);
+  const clockSamplesRef = useRef<ClockSample[]>([]);
+  const timeSyncTimerRef = useRef<NodeJS.Timeout | null>(null);
+  
+  // 플레이어가 측정한 재생 위치 오차 중 가장 큰 값 (다음 time_sync에 실어 보냄)
+  const driftRef = useRef<number | null>(null);
+  
+  // 추정한 현재 서버 시각 (초)
+  const getServerTime = useCallback(() => Date.now() / 1000 + clockOffsetRef.current, []);
+  
   // 재연결 관련 상태
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
   const reconnectAttemptsRef = useRef(0);
@@ -168,19 +249,58 @@ export const useWebSocket = (roomId?: string) => {
     console.log(`웹소켓 연결 시도... (방: ${roomId})`);
     
     // 룸 ID를 포함한 WebSocket URL
-    const socketInstance = new WebSocket(`${WS_BASE_URL}/ws${roomId ? `?room_id=${roomId}` : ''}`);
+    // 다시 접속할 때는 마지막으로 받은 리비전을 보내 스냅샷 대신 놓친 이벤트만 받음
+    const params = new URLSearchParams({ room_id: roomId });
+    const lastRevision = stateRef.current.revision;
+    if (reconnectAttemptsRef.current > 0 && lastRevision !== undefined) {
+      params.set('revision', String(lastRevision));
+    }
+    // msgpack을 쓰면 JSON 서브프로토콜도 함께 제안 (서버에 msgpack이 없으면 JSON으로 수락됨)
+    const socketInstance = new WebSocket(
+      `${WS_BASE_URL}/ws?${params.toString()}`,
+      WS_FORMAT === 'msgpack' ? ['openjukebox.msgpack', 'openjukebox.json'] : undefined
+    );
+    socketInstance.binaryType = 'arraybuffer';
+
+    // 시계 동기화 핑 전송 (측정한 재생 위치 오차가 있으면 함께 보냄)
+    const sendTimeSync = () => {
+      if (socketInstance.readyState !== WebSocket.OPEN) return;
+      const ping: Record<string, number> = { t0: Date.now() / 1000 };
+      if (driftRef.current !== null) {
+        ping.drift = driftRef.current;
+        driftRef.current = null;
+      }
+      socketInstance.send(JSON.stringify({ type: 'time_sync', ...ping }));
+    };
+    
+    const scheduleTimeSync = (sent: number) => {
+      const delay = sent < TIME_SYNC_BURST ? TIME_SYNC_BURST_GAP_MS : TIME_SYNC_INTERVAL_MS;
+      timeSyncTimerRef.current = setTimeout(() => {
+        sendTimeSync();
+        scheduleTimeSync(sent + 1);
+      }, delay);
+    };
 
     // 연결 이벤트
     socketInstance.onopen = () => {
       console.log(`웹소켓 연결됨 (방: ${roomId})`);
       setIsConnected(true);
       reconnectAttemptsRef.current = 0; // 재연결 시도 횟수 리셋
+      
+      // 서버 시계와의 차이 측정 시작
+      clockSamplesRef.current = [];
+      sendTimeSync();
+      scheduleTimeSync(1);
     };
 
     // 연결 종료 이벤트
     socketInstance.onclose = (event) => {
       console.log('웹소켓 연결 종료', event.code, event.reason);
       setIsConnected(false);
+      if (timeSyncTimerRef.current) {
+        clearTimeout(timeSyncTimerRef.current);
+        timeSyncTimerRef.current = null;
+      }
       
       // 자동 재연결 시도 (정상 종료가 아닌 경우)
       if (event.code !== 1000 && reconnectAttemptsRef.current < maxReconnectAttempts) {
@@ -199,32 +319,89 @@ export const useWebSocket = (roomId?: string) => {
       console.error('웹소켓 오류:', error);
     };
 
+    // 서버 상태 적용
+    const applyState = (nextState: AppState, timestamp?: number) => {
+      stateRef.current = nextState;
+      setState(nextState);
+      setLastSyncTime(timestamp || Date.now());
+      
+      // 동기화 콜백 호출 (위치 업데이트 등을 위해)
+      if (onSyncUpdateCallbackRef.current) {
+        onSyncUpdateCallbackRef.current(nextState);
+      }
+    };
+    
+    // 리비전 공백 발생 시 전체 스냅샷 요청
+    const requestSnapshot = () => {
+      if (socketInstance.readyState === WebSocket.OPEN) {
+        socketInstance.send(JSON.stringify({ type: 'sync_request', revision: stateRef.current.revision }));
+      }
+    };
+    
+    // 다음 리비전인지 확인 (아니면 스냅샷 요청)
+    const isNextRevision = (revision: number) => {
+      if (revision === (stateRef.current.revision ?? -1) + 1) {
+        return true;
+      }
+      requestSnapshot();
+      return false;
+    };
+
     // 메시지 수신 이벤트
     socketInstance.onmessage = (event) => {
       try {
-        const data = JSON.parse(event.data);
+        // 서버가 msgpack을 지원하지 않으면 JSON 텍스트 프레임으로 옴
+        const data: any = typeof event.data === 'string'
+          ? JSON.parse(event.data)
+          : decodeMsgpack(new Uint8Array(event.data));
         
-        if (data.type === 'master_sync' && data.data) {
-          // 마스터 클라이언트로부터의 동기화 업데이트 (유일한 동기화 방식)
-          const masterState = data.data;
-          
-          // // 디버깅: 받은 상태 로깅
-          // console.log('🔄 마스터 동기화 받음:', {
-          //   playing: masterState.playing,
-          //   position: masterState.position,
-          //   current_track: masterState.current_track,
-          //   timestamp: data.timestamp
-          // });
-          
-          setState(masterState);
-          setLastSyncTime(data.timestamp || Date.now());
-          
-          // 동기화 콜백 호출 (위치 업데이트 등을 위해)
-          if (onSyncUpdateCallbackRef.current) {
-            onSyncUpdateCallbackRef.current(masterState);
+        if (data.type === 'time_sync') {
+          // 시계 동기화 응답 - t0: 보낸 시각, t1/t2: 서버 수신/송신 시각, t3: 받은 시각
+          const t3 = Date.now() / 1000;
+          const rtt = (t3 - data.t0) - (data.t2 - data.t1);
+          const offset = ((data.t1 - data.t0) + (data.t2 - t3)) / 2;
+          const samples = [...clockSamplesRef.current, { offset, rtt }].slice(-TIME_SYNC_SAMPLES);
+          clockSamplesRef.current = samples;
+          // 왕복 시간이 짧을수록 비대칭 지연에 의한 오차가 작음
+          clockOffsetRef.current = samples.reduce((best, sample) => (sample.rtt < best.rtt ? sample : best)).offset;
+        } else if (data.type === 'ping') {
+          // 서버 하트비트 - 응답이 없으면 서버가 연결을 정리함 (종료 코드 4000, 이후 자동 재연결)
+          socketInstance.send(JSON.stringify({ type: 'pong' }));
+        } else if (data.type === 'error') {
+          // 서버가 거부한 메시지 (연결은 유지됨)
+          console.warn('서버가 메시지를 거부했습니다:', data.detail);
+        } else if (data.type === 'master_sync' && data.data) {
+          // 전체 스냅샷 (접속 시 또는 리비전 공백 발생 시) - 위치는 서버 전송 시각 기준
+          applyState({ ...data.data, last_update_time: data.timestamp }, data.timestamp);
+        } else if (data.type === 'state_update' && data.data) {
+          // 재생 상태 변경 (플레이리스트 제외)
+          if (isNextRevision(data.data.revision)) {
+            applyState({ ...stateRef.current, ...data.data, last_update_time: data.timestamp }, data.timestamp);
+          }
+        } else if (data.type === 'playlist_delta' && data.data) {
+          // 플레이리스트 변경분
+          const delta: PlaylistDelta = data.data;
+          if (isNextRevision(delta.revision)) {
+            applyState({
+              ...stateRef.current,
+              playlist: applyPlaylistDelta(stateRef.current.playlist, delta),
+              current_track: delta.current_track,
+              revision: delta.revision
+            }, data.timestamp);
           }
+        } else if (data.type === 'sync_tick' && data.data) {
+          // 주기적 동기화 (위치, 재생 여부, 리비전만 포함)
+          if (data.data.revision !== stateRef.current.revision) {
+            requestSnapshot();
+            return;
+          }
+          applyState({
+            ...stateRef.current,
+            position: data.data.position,
+            playing: data.data.playing,
+            last_update_time: data.timestamp
+          }, data.timestamp);
         }
-        // 이전 방식들은 모두 제거 - 마스터 클라이언트만 사용
       } catch (e) {
         console.error('메시지 파싱 오류:', e);
       }
@@ -243,6 +420,9 @@ export const useWebSocket = (roomId?: string) => {
       if (reconnectTimeoutRef.current) {
         clearTimeout(reconnectTimeoutRef.current);
       }
+      if (timeSyncTimerRef.current) {
+        clearTimeout(timeSyncTimerRef.current);
+      }
       if (socket) {
         socket.close(1000); // 정상 종료
       }
@@ -262,6 +442,21 @@ export const useWebSocket = (roomId?: string) => {
     sendMessage('add_track', { track });
   }, [sendMessage]);
 
+  // 현재 트랙 바로 다음에 추가 (이미 있는 트랙이면 그 자리로 이동)
+  const insertNext = useCallback((track: Track) => {
+    sendMessage('insert_next', { track });
+  }, [sendMessage]);
+
+  // 트랙 제거 (인덱스 대신 video ID로 지정해 동시 편집에도 안전)
+  const removeTrack = useCallback((trackId: string) => {
+    sendMessage('remove_track', { track_id: trackId });
+  }, [sendMessage]);
+
+  // 트랙 순서 변경
+  const moveTrack = useCallback((trackId: string, to: number) => {
+    sendMessage('move_track', { track_id: trackId, to });
+  }, [sendMessage]);
+
   // 재생 시작
   const playTrack = useCallback(() => {
     console.log('▶️ 사용자가 재생 버튼 클릭');
@@ -304,15 +499,17 @@ export const useWebSocket = (roomId?: string) => {
 
   // 다음 트랙
   const nextTrack = useCallback(() => {
-    sendMessage('next_track');
+    // 보고 있던 리비전을 함께 보내서 서버가 이미 넘어간 트랙을 다시 넘기지 않도록 함
+    sendMessage('next_track', { revision: stateRef.current.revision });
   }, [sendMessage]);
 
   // 이전 트랙
   const prevTrack = useCallback(() => {
-    sendMessage('prev_track');
+    // 보고 있던 리비전을 함께 보내서 서버가 이미 넘어간 트랙을 다시 넘기지 않도록 함
+    sendMessage('prev_track', { revision: stateRef.current.revision });
   }, [sendMessage]);
 
-  // 동기화 요청 (필요시)
+  // 동기화 요청 (필요시) - 리비전을 보내지 않으면 항상 전체 스냅샷을 받음
   const requestSync = useCallback(() => {
     sendMessage('sync_request');
   }, [sendMessage]);
@@ -322,22 +519,31 @@ export const useWebSocket = (roomId?: string) => {
     onSyncUpdateCallbackRef.current = callback;
   }, []);
 
-  // 현재 위치 계산 (클라이언트 사이드에서 실시간 계산)
+  // 플레이어가 측정한 재생 위치 오차 기록 (서버가 허용 범위를 넘으면 동기화 주기를 줄임)
+  const reportDrift = useCallback((drift: number) => {
+    if (driftRef.current === null || Math.abs(drift) > Math.abs(driftRef.current)) {
+      driftRef.current = drift;
+    }
+  }, []);
+
+  // 현재 위치 계산 (서버 시계 기준으로 클라이언트 사이드에서 실시간 계산)
   const getCurrentPosition = useCallback(() => {
     if (!state.playing || !state.position || !state.last_update_time) {
       return state.position || 0;
     }
     
-    const now = Date.now() / 1000; // 초 단위로 변환
-    const elapsed = now - state.last_update_time;
+    const elapsed = getServerTime() - state.last_update_time;
     return (state.position || 0) + elapsed;
-  }, [state.playing, state.position, state.last_update_time]);
+  }, [state.playing, state.position, state.last_update_time, getServerTime]);
 
   return {
     state,
     isConnected,
     lastSyncTime,
     addTrack,
+    insertNext,
+    removeTrack,
+    moveTrack,
     playTrack,
     pauseTrack,
     seekTrack,
@@ -345,6 +551,8 @@ export const useWebSocket = (roomId?: string) => {
     prevTrack,
     requestSync,
     setOnSyncUpdate,
-    getCurrentPosition
+    getCurrentPosition,
+    getServerTime,
+    reportDrift
   };
 };
\ No newline at end of file